@@ -0,0 +1,54 @@
+import argparse
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import time
+
+import numpy as np
+
+from object_detector.gallery.FeatureGallery import FeatureGallery
+from object_detector.gallery.IVFIndex import IVFIndex
+
+parser = argparse.ArgumentParser(description='IVF index benchmark: recall@1 against brute force and queries per second')
+parser.add_argument('--sizes', default='1000,10000,100000', type=str, help='Comma separated gallery sizes (templates).')
+parser.add_argument('--nprobes', default='1,4,8,16,32', type=str, help='Comma separated nprobe values.')
+parser.add_argument('--templates_per_person', default=5, type=int, help='Templates enrolled per identity.')
+parser.add_argument('--queries', default=1000, type=int, help='Queries per measurement.')
+parser.add_argument('--dim', default=256, type=int, help='Embedding size.')
+parser.add_argument('--noise', default=0.5, type=float, help='Spread of templates and queries around an identity.')
+
+
+def make_gallery(size, templates_per_person, dim, noise, rng):
+    """Identities as random directions with their templates and probe faces scattered around them."""
+    identities = rng.standard_normal((max(1, size // templates_per_person), dim)).astype(np.float32)
+    labels = np.arange(size) % len(identities)
+    embeddings = identities[labels] + noise * rng.standard_normal((size, dim)).astype(np.float32)
+    return identities, FeatureGallery(embeddings, labels, [f"person_{i}" for i in range(len(identities))])
+
+
+def main():
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    print(f"{'templates':>10} {'nlist':>6} {'build s':>8} {'nprobe':>7} {'recall@1':>9} {'qps':>10} {'exact qps':>10}")
+    for size in [int(s) for s in args.sizes.split(',')]:
+        identities, gallery = make_gallery(size, args.templates_per_person, args.dim, args.noise, rng)
+        picked = rng.integers(len(identities), size=args.queries)
+        queries = FeatureGallery.normalize(identities[picked] + args.noise * rng.standard_normal((args.queries, args.dim)))
+
+        start = time.perf_counter()
+        exact = np.argmax(queries @ gallery.embeddings.T, axis=1)
+        exact_qps = args.queries / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        index = IVFIndex.build(gallery.embeddings)
+        build_time = time.perf_counter() - start
+
+        for nprobe in [int(n) for n in args.nprobes.split(',')]:
+            start = time.perf_counter()
+            rows, _ = index.search(gallery.embeddings, queries, nprobe)
+            qps = args.queries / (time.perf_counter() - start)
+            recall = np.mean(rows == exact)
+            print(f"{size:>10} {index.nlist:>6} {build_time:>8.2f} {nprobe:>7} {recall:>9.3f} {qps:>10.0f} {exact_qps:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import torch
+
+from object_detector.models.light_cnn import LightCNN_29Layers
+from object_detector.models.FaceEmbedder import FaceEmbedder
+from object_detector.gallery.FeatureGallery import FeatureGallery
+from common import best_time
+
+parser = argparse.ArgumentParser(description='Per-frame embedding latency: one forward pass per face vs batched')
+parser.add_argument('--resume', default='', type=str, metavar='PATH', help='Optional LightCNN-29 checkpoint (random weights otherwise).')
+parser.add_argument('--max_faces', default=16, type=int, help='Largest number of faces per frame.')
+parser.add_argument('--batch_size', default=16, type=int, help='Micro-batch size of the batched path.')
+parser.add_argument('--repeats', default=5, type=int, help='Timed repetitions per face count.')
+parser.add_argument('--threads', default=0, type=int, help='torch intra-op threads (0: torch default).')
+
+
+def load_model(path):
+    model = LightCNN_29Layers(num_classes=79077)
+    if path:
+        checkpoint = torch.load(path, map_location=torch.device('cpu'))
+        model.load_state_dict({k.replace('module.', ''): v for k, v in checkpoint['state_dict'].items()})
+    model.eval()
+    return model
+
+
+def main():
+    args = parser.parse_args()
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    model = load_model(args.resume)
+    sequential = FaceEmbedder(model, batch_size=1)
+    batched = FaceEmbedder(model, batch_size=args.batch_size)
+
+    rng = np.random.default_rng(0)
+    crops = [rng.integers(0, 256, (int(s), int(s), 3), dtype=np.uint8) for s in rng.integers(60, 200, args.max_faces)]
+    gallery = FeatureGallery.from_feature_db({f"person_{i}": [f] for i, f in enumerate(sequential.embed(crops))})
+
+    print(f"{'faces':>5} {'per-face ms':>12} {'batched ms':>11} {'speedup':>8} {'max |diff|':>11} {'labels':>7}")
+    for n in range(1, args.max_faces + 1):
+        faces = crops[:n]
+        sequential_time, sequential_features = best_time(lambda: sequential.embed(faces), args.repeats)
+        batched_time, batched_features = best_time(lambda: batched.embed(faces), args.repeats)
+
+        same_labels = [m[0] for m in gallery.match(sequential_features, 0.7)] == [m[0] for m in gallery.match(batched_features, 0.7)]
+        diff = np.abs(sequential_features - batched_features).max()
+        print(f"{n:>5} {sequential_time * 1000:>12.2f} {batched_time * 1000:>11.2f} {sequential_time / batched_time:>7.2f}x "
+              f"{diff:>11.2e} {'same' if same_labels else 'DIFF':>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+import argparse
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import time
+
+import numpy as np
+
+from core.Frame import Frame
+from object_detector.input.CameraManager import CameraManager
+
+parser = argparse.ArgumentParser(description='Frames lost when the drone camera drops and the loop falls back to a '
+                                             'webcam: the old 5 s poll with a cold open against CameraManager')
+parser.add_argument('--fps', default=30.0, type=float, help='Frame rate of both simulated cameras.')
+parser.add_argument('--drop_at', default=2.0, type=float, help='Seconds into the run the drone stream stops.')
+parser.add_argument('--flag_delay', default=0.0, type=float,
+                    help='Seconds after the drop until the drone camera reports is_connected=False.')
+parser.add_argument('--open_s', default=1.0, type=float, help='Time a cold webcam open takes.')
+parser.add_argument('--stale_after', default=0.5, type=float, help='CameraManager staleness threshold.')
+parser.add_argument('--duration', default=9.0, type=float, help='Length of every run.')
+
+
+class FakeDroneCam:
+    """Frames at `fps` until `drop_at`, black frames after; is_connected drops `flag_delay` later."""
+
+    def __init__(self, clock, fps, drop_at, flag_delay):
+        self.clock, self.fps, self.drop_at, self.flag_delay = clock, fps, drop_at, flag_delay
+        self.sequence, self.timestamp = 0, None
+        self.start = clock()
+
+    @property
+    def is_connected(self):
+        return self.clock() - self.start < self.drop_at + self.flag_delay
+
+    def frame(self):
+        elapsed = self.clock() - self.start
+        if elapsed >= self.drop_at:
+            return np.zeros((720, 960, 3), dtype=np.uint8)
+        sequence = int(elapsed * self.fps) + 1
+        if sequence != self.sequence:
+            self.sequence, self.timestamp = sequence, time.monotonic()
+        return Frame(np.zeros((720, 960, 3), dtype=np.uint8), self.sequence, self.timestamp, 'drone')
+
+
+class FakeWebCam:
+    """Takes `open_s` to open, then streams at `fps`."""
+
+    def __init__(self, clock, fps, open_s):
+        time.sleep(open_s)
+        self.clock, self.fps, self.start = clock, fps, clock()
+
+    def grab(self):
+        return True
+
+    def frame(self):
+        sequence = int((self.clock() - self.start) * self.fps) + 1
+        return Frame(np.zeros((480, 640, 3), dtype=np.uint8), sequence, self.clock(), 'webcam')
+
+
+class FakeInterface:
+    def __init__(self):
+        self.camera = None
+
+    def set_camera(self, camera):
+        self.camera = camera
+
+    def loop(self):
+        return self.camera.frame()
+
+
+def frames_lost(displayed, drop_at, fps):
+    """Source frames that should have been shown between the drop and the first webcam frame."""
+    first_webcam = next((t for t, source in displayed if source == 'webcam'), None)
+    if first_webcam is None:
+        return None, None
+    gap = first_webcam - drop_at
+    return int(round(gap * fps)), gap
+
+
+def run_legacy(args, clock):
+    """The loop run.py had: look at is_connected every 5 s, then open a new WebCam."""
+    interface = FakeInterface()
+    camera = FakeDroneCam(clock, args.fps, args.drop_at, args.flag_delay)
+    interface.set_camera(camera)
+    last_check_time = clock()
+    displayed = []
+    while clock() < args.duration:
+        if clock() - last_check_time >= 5.0:
+            last_check_time = clock()
+            if isinstance(camera, FakeDroneCam) and not camera.is_connected:
+                camera = FakeWebCam(clock, args.fps, args.open_s)
+                interface.set_camera(camera)
+        frame = interface.loop()
+        displayed.append((clock(), getattr(frame, 'source', None)))
+        time.sleep(0.01)
+    return displayed
+
+
+def run_manager(args, clock):
+    interface = FakeInterface()
+    camera = FakeDroneCam(clock, args.fps, args.drop_at, args.flag_delay)
+    interface.set_camera(camera)
+    manager = CameraManager(camera, interface, lambda: FakeWebCam(clock, args.fps, args.open_s), args.stale_after)
+    displayed = []
+    while clock() < args.duration:
+        manager.check()
+        frame = interface.loop()
+        displayed.append((clock(), getattr(frame, 'source', None)))
+        time.sleep(0.01)
+    manager.stop()
+    return displayed
+
+
+def main():
+    args = parser.parse_args()
+    print(f"drone drops at {args.drop_at:g} s, webcam cold open {args.open_s:g} s, {args.fps:g} fps")
+    print(f"{'policy':>14} {'gap':>7} {'frames lost':>12}")
+    for name, run in [('5 s poll', run_legacy), ('CameraManager', run_manager)]:
+        start = time.monotonic()
+        clock = lambda: time.monotonic() - start
+        lost, gap = frames_lost(run(args, clock), args.drop_at, args.fps)
+        if lost is None:
+            print(f"{name:>14} {'never switched':>20}")
+        else:
+            print(f"{name:>14} {gap:>6.2f}s {lost:>12}")
+
+
+if __name__ == '__main__':
+    main()
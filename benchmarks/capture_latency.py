@@ -0,0 +1,107 @@
+import argparse
+import collections
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import threading
+import time
+
+import numpy as np
+
+from core.Camera import Camera
+
+parser = argparse.ArgumentParser(description='Frame age (capture to processing) of synchronous and threaded Camera '
+                                             'capture behind a processing loop slower than the camera')
+parser.add_argument('--fps', default=30.0, type=float, help='Camera frame rate.')
+parser.add_argument('--driver_buffers', default=4, type=int, help='Frames the simulated driver queues (V4L2 keeps ~4).')
+parser.add_argument('--processing_ms', default='10,40,80', type=str, help='Comma separated per-frame processing times.')
+parser.add_argument('--frames', default=150, type=int, help='Frames processed per run.')
+parser.add_argument('--source', default='', type=str,
+                    help='Optional real camera index or stream URL to compare on instead (ages are then read-to-use only).')
+
+
+class SimulatedCapture:
+    """
+    A camera producing frames at `fps` into a FIFO of `buffers` frames, like a capture driver:
+    read() returns the oldest queued frame. Each frame carries its exposure time in its first pixels.
+    """
+
+    def __init__(self, fps, buffers, shape=(720, 960, 3)):
+        self.queue = collections.deque(maxlen=buffers)
+        self.ready = threading.Condition()
+        self.shape = shape
+        self.opened = True
+        threading.Thread(target=self._produce, args=(1.0 / fps,), daemon=True).start()
+
+    def _produce(self, period):
+        next_time = time.monotonic()
+        while self.opened:
+            next_time += period
+            time.sleep(max(0.0, next_time - time.monotonic()))
+            frame = np.zeros(self.shape, dtype=np.uint8)
+            frame.reshape(-1)[:8] = np.frombuffer(np.float64(time.monotonic()).tobytes(), dtype=np.uint8)
+            with self.ready:
+                self.queue.append(frame)
+                self.ready.notify()
+
+    def isOpened(self):
+        return self.opened
+
+    def read(self, image=None):
+        with self.ready:
+            self.ready.wait_for(lambda: self.queue or not self.opened)
+            if not self.queue:
+                return False, None
+            frame = self.queue.popleft()
+        if image is not None and image.shape == frame.shape:
+            image[...] = frame
+            return True, image
+        return True, frame
+
+    def release(self):
+        self.opened = False
+
+
+class SimulatedCamera(Camera):
+    def __init__(self, fps, buffers, threaded):
+        self.fps, self.buffers = fps, buffers
+        super().__init__(None, True, threaded)
+
+    def open_capture(self):
+        return SimulatedCapture(self.fps, self.buffers)
+
+
+def exposure_time(frame):
+    return float(np.frombuffer(frame.reshape(-1)[:8].tobytes(), dtype=np.float64)[0])
+
+
+def run(camera, frames, processing, simulated):
+    ages, seen = [], set()
+    start = time.monotonic()
+    for _ in range(frames):
+        frame, sequence, timestamp = camera.read()
+        now = time.monotonic()
+        ages.append(now - (exposure_time(frame) if simulated else timestamp))
+        seen.add(sequence)
+        time.sleep(processing)
+    elapsed = time.monotonic() - start
+    camera.stop()
+    ages = np.array(ages[10:]) * 1000  # skip the start-up transient
+    return np.median(ages), np.percentile(ages, 95), len(seen) / elapsed
+
+
+def main():
+    args = parser.parse_args()
+    print(f"{'processing':>10} {'mode':>9} {'age p50':>9} {'age p95':>9} {'unique fps':>11}")
+    for processing_ms in [float(p) for p in args.processing_ms.split(',')]:
+        for threaded in (False, True):
+            if args.source:
+                source = int(args.source) if args.source.isdigit() else args.source
+                camera = Camera(source, True, threaded)
+            else:
+                camera = SimulatedCamera(args.fps, args.driver_buffers, threaded)
+            p50, p95, fps = run(camera, args.frames, processing_ms / 1000, not args.source)
+            mode = 'threaded' if threaded else 'sync'
+            print(f"{processing_ms:>8.0f}ms {mode:>9} {p50:>7.1f}ms {p95:>7.1f}ms {fps:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+import argparse
+import collections
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from core.Frame import Frame
+from core.HeadlessInterface import HeadlessInterface
+from core.Metrics import metrics
+from navigation_plan.navigators.GridNavigator import GridNavigator
+from flight_guide.guide.GridGuide import GridGuide
+
+parser = argparse.ArgumentParser(description='Glass-to-command latency: age of the camera frame behind every '
+                                             'controller.move, through a fake camera, model and controller. '
+                                             'Exits with 1 when the p95 is over --max_p95_ms.')
+parser.add_argument('--fps', default=30.0, type=float, help='Fake camera frame rate.')
+parser.add_argument('--transport_ms', default=20.0, type=float,
+                    help='Delay between a frame\'s capture stamp and it reaching the host (e.g. the drone link).')
+parser.add_argument('--model_ms', default=15.0, type=float, help='Processing time of the fake model per frame.')
+parser.add_argument('--lag_frames', default=0, type=int,
+                    help='Frames the fake model\'s center lags the newest frame (like a pipelined model).')
+parser.add_argument('--duration', default=5.0, type=float, help='Seconds to run.')
+parser.add_argument('--max_p95_ms', default=None, type=float, help='Fail when the p95 command age is above this.')
+
+
+class FakeCamera:
+    """A bright square circling the frame; frames are stamped at capture and delivered `transport` seconds later."""
+
+    threaded = True
+
+    def __init__(self, fps, transport, size=(720, 960)):
+        self.fps, self.transport, self.size = fps, transport, size
+        self.captured = 0
+        self.latest = None
+        self.ready = threading.Condition()
+        self.running = True
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def render(self, sequence):
+        h, w = self.size
+        angle = sequence / self.fps * 2 * np.pi / 4  # a lap every 4 s
+        x, y = int(w / 2 + w / 3 * np.cos(angle)), int(h / 2 + h / 3 * np.sin(angle))
+        frame = np.zeros((h, w, 3), dtype=np.uint8)
+        cv2.rectangle(frame, (x - 40, y - 40), (x + 40, y + 40), (255, 255, 255), -1)
+        return frame
+
+    def _run(self):
+        in_transit = collections.deque()
+        next_frame = time.monotonic()
+        while self.running:
+            now = time.monotonic()
+            if now >= next_frame:
+                self.captured += 1
+                in_transit.append(Frame(self.render(self.captured), self.captured, now, 'fake'))
+                next_frame += 1.0 / self.fps
+            while in_transit and in_transit[0].timestamp + self.transport <= now:
+                with self.ready:
+                    self.latest = in_transit.popleft()
+                    self.ready.notify_all()
+            time.sleep(0.001)
+
+    def read(self, wait_new=False, timeout=None):
+        with self.ready:
+            seen = self.latest.sequence if (wait_new and self.latest is not None) else 0
+            wait = 1.0 if timeout is None or self.latest is None else timeout
+            self.ready.wait_for(lambda: self.latest is not None and self.latest.sequence > seen, wait)
+            frame = self.latest
+        return frame.copy(), frame.sequence, frame.timestamp
+
+    def frame(self):
+        return self.read()[0]
+
+
+class FakeModel:
+    """Finds the square; takes `work` seconds per frame and reports the center of `lag` frames ago."""
+
+    def __init__(self, work, lag):
+        self.work = work
+        self.found = collections.deque(maxlen=lag + 1)
+        self.boundary = self.center = self.center_timestamp = None
+
+    def on_frame(self, frame):
+        time.sleep(self.work)
+        points = cv2.findNonZero(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+        x, y, w, h = cv2.boundingRect(points)
+        self.found.append(((x, y, w, h), frame.timestamp))
+        self.boundary, self.center_timestamp = self.found[0]
+        x, y, w, h = self.boundary
+        self.center = (x + w // 2, y + h // 2)
+
+
+class FakeController:
+    def __init__(self):
+        self.moves = 0
+
+    def move(self, **direction):
+        self.moves += 1
+
+    def stop(self, *args):
+        pass
+
+    def loop(self):
+        pass
+
+
+def main():
+    args = parser.parse_args()
+    camera = FakeCamera(args.fps, args.transport_ms / 1000)
+    model = FakeModel(args.model_ms / 1000, args.lag_frames)
+    navigator = GridNavigator(model)
+    controller = FakeController()
+    guide = GridGuide(navigator, controller, show=False)
+
+    interface = HeadlessInterface()
+    interface.set_camera(camera)
+    interface.add_frame_listener(model.on_frame)
+    interface.add_frame_listener(navigator.navigate)
+    interface.add_frame_listener(guide.update_grid)
+
+    end = time.monotonic() + args.duration
+    while time.monotonic() < end:
+        interface.loop()
+        guide.loop()
+        controller.loop()
+    camera.running = False
+
+    ages = metrics.snapshot()["timers"].get("command.age")
+    if not ages or not ages["count"]:
+        print("No command carried a capture timestamp")
+        sys.exit(1)
+
+    floor = args.transport_ms + args.model_ms + args.lag_frames * 1000 / args.fps
+    print(f"{interface.frames} frames, {controller.moves} move commands")
+    print(f"command age  p50 {ages['p50_ms']:.1f} ms  p95 {ages['p95_ms']:.1f} ms  p99 {ages['p99_ms']:.1f} ms  "
+          f"max {ages['max_ms']:.1f} ms  (transport + model + lag = {floor:.1f} ms)")
+    if ages['p50_ms'] < floor * 0.95:
+        print("FAIL: commands look younger than their frames can be, the capture stamp is not carried through")
+        sys.exit(1)
+    if args.max_p95_ms is not None and ages['p95_ms'] > args.max_p95_ms:
+        print(f"FAIL: p95 command age {ages['p95_ms']:.1f} ms is over {args.max_p95_ms:g} ms")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Helpers shared by the benchmark scripts: reading a video into memory, box IoU and timing."""
+
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import time
+
+import cv2
+
+from object_detector.tracking.TrackManager import iou_matrix
+
+
+def read_frames(path, limit=None):
+    """The first `limit` frames of a video (all of them when None), decoded into a list."""
+    capture = cv2.VideoCapture(path)
+    frames = []
+    while limit is None or len(frames) < limit:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        frames.append(frame)
+    capture.release()
+    if not frames:
+        raise ValueError(f"No frames in {path}")
+    return frames
+
+
+def iou(a, b):
+    """IoU of two (x, y, w, h) boxes."""
+    return float(iou_matrix([a], [b])[0, 0])
+
+
+def best_time(fn, repeats=1, warmup=False):
+    """Fastest of `repeats` calls of fn, in seconds, after one untimed call with warmup. Returns (seconds, result)."""
+    if warmup:
+        fn()
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
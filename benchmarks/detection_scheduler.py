@@ -0,0 +1,73 @@
+import argparse
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import time
+
+import cv2
+import numpy as np
+
+from object_detector.tracking.DetectionScheduler import DetectionScheduler
+from common import iou, read_frames
+
+parser = argparse.ArgumentParser(description='Detect-every-N-frames benchmark on a recorded video: FPS and box accuracy '
+                                             'against running the Haar detector on every frame')
+parser.add_argument('--video', required=True, type=str, metavar='PATH', help='Recorded video file.')
+parser.add_argument('--intervals', default='1,2,3,5,10', type=str, help='Comma separated detection intervals (frames).')
+parser.add_argument('--propagation', default='flow,csrt', type=str, help='Comma separated propagation methods.')
+parser.add_argument('--min_confidence', default=0.5, type=float, help='Propagation confidence that forces a re-detect.')
+parser.add_argument('--max_frames', default=600, type=int, help='Frames read from the video.')
+parser.add_argument('--resume', default='', type=str, metavar='PATH',
+                    help='Optional LightCNN checkpoint/artifact: embed faces on detection frames like LightCNNTracker.')
+
+
+def mean_iou(reference, boxes):
+    """Mean over reference boxes of the best IoU with any scheduled box (0 when missed)."""
+    scores = [max((iou(ref, box) for box in boxes), default=0.0) for ref in reference]
+    return float(np.mean(scores)) if scores else None
+
+
+def run(frames, detect, interval, propagation, min_confidence, embed):
+    scheduler = DetectionScheduler(detect, interval, None, propagation, min_confidence)
+    results, detections = [], 0
+    start = time.perf_counter()
+    for frame in frames:
+        boxes, detected = scheduler.update(frame)
+        if detected:
+            detections += 1
+            if embed and len(boxes):
+                embed([frame[y:y+h, x:x+w] for (x, y, w, h) in boxes])
+        results.append(boxes)
+    return results, detections, time.perf_counter() - start
+
+
+def main():
+    args = parser.parse_args()
+    frames = read_frames(args.video, args.max_frames)
+    if not frames:
+        raise ValueError(f"No frames could be read from {args.video}")
+
+    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+    detect = lambda frame: face_cascade.detectMultiScale(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY),
+                                                         scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
+    embed = None
+    if args.resume:
+        from object_detector.models.FaceEmbedder import FaceEmbedder
+        from object_detector.models.model_loader import load_embedding_model, resolve_model_path
+        embed = FaceEmbedder(load_embedding_model(resolve_model_path(args.resume))).embed
+
+    reference = [[tuple(int(v) for v in box) for box in detect(frame)] for frame in frames]
+    print(f"{len(frames)} frames, {sum(len(r) for r in reference)} reference faces")
+    print(f"{'method':>6} {'interval':>8} {'fps':>8} {'speedup':>8} {'detections':>10} {'mean IoU':>9}")
+
+    baseline = None
+    for propagation in args.propagation.split(','):
+        for interval in [int(i) for i in args.intervals.split(',')]:
+            results, detections, elapsed = run(frames, detect, interval, propagation, args.min_confidence, embed)
+            fps = len(frames) / elapsed
+            baseline = baseline or fps
+            scores = [s for s in (mean_iou(ref, boxes) for ref, boxes in zip(reference, results)) if s is not None]
+            accuracy = f"{np.mean(scores):>9.3f}" if scores else f"{'-':>9}"
+            print(f"{propagation:>6} {interval:>8} {fps:>8.1f} {fps / baseline:>7.2f}x {detections:>10} {accuracy}")
+
+
+if __name__ == '__main__':
+    main()
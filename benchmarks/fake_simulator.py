@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+import cv2
+import numpy as np
+import websockets
+
+from object_detector.input.SimCam import pack_header, unpack_header, HELLO, REQUEST, FRAME
+
+
+class FakeSimulator:
+    """
+    Benchmark stand-in for the simulator: connects to a SimCam and answers its frame
+    requests with pre-encoded synthetic frames, taking `render_time` seconds per frame.
+    `latency` delays every frame on its way to the camera like a network link would,
+    without holding up the next render.
+    binary=False speaks the legacy protocol (trigger with '1', answer the JSON request).
+    drop_every=N loses every Nth frame request, like a simulator that misses one.
+    """
+
+    def __init__(self, uri="ws://127.0.0.1:8091", binary=True, render_time=0.0, latency=0.0,
+                 size=(640, 480), encoding='.jpg', distinct_frames=8, drop_every=0):
+        self.uri = uri
+        self.binary = binary
+        self.render_time = render_time
+        self.latency = latency
+        self.frames = self.encode_frames(size, encoding, distinct_frames)
+        self.sent = 0
+        self.drop_every = drop_every
+        self.requests = 0
+
+    @staticmethod
+    def encode_frames(size, encoding, count):
+        """A few distinct noisy gradients, so the encoder cannot cheat and decoding costs what a render would."""
+        width, height = size
+        rng = np.random.default_rng(0)
+        gradient = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+        frames = []
+        for i in range(count):
+            image = np.clip(gradient + rng.normal(0, 20, (height, width, 3)) + i * 8, 0, 255).astype(np.uint8)
+            ok, data = cv2.imencode(encoding, image)
+            if not ok:
+                raise ValueError(f"Cannot encode {encoding} frames.")
+            frames.append(data.tobytes())
+        return frames
+
+    async def render(self):
+        if self.render_time:
+            await asyncio.sleep(self.render_time)
+        frame = self.frames[self.sent % len(self.frames)]
+        self.sent += 1
+        return frame
+
+    async def deliver(self, websocket, outbox):
+        """Send queued messages in order, each no earlier than its due time."""
+        while True:
+            due, message = await outbox.get()
+            await asyncio.sleep(max(0.0, due - time.monotonic()))
+            await websocket.send(message)
+
+    async def run(self, duration):
+        """Serve frames for `duration` seconds, then disconnect. Returns the number of frames sent."""
+        async with websockets.connect(self.uri, max_size=None) as websocket:
+            await websocket.recv()  # {"status": "connected"}
+            outbox = asyncio.Queue()
+            sender = asyncio.create_task(self.deliver(websocket, outbox))
+            send = lambda message: outbox.put_nowait((time.monotonic() + self.latency, message))
+
+            deadline = time.monotonic() + duration
+            try:
+                if self.binary:
+                    await websocket.send(pack_header(HELLO))
+                    while time.monotonic() < deadline:
+                        header = unpack_header(await websocket.recv())
+                        if header is not None and header[0] == REQUEST:
+                            self.requests += 1
+                            if self.drop_every and self.requests % self.drop_every == 0:
+                                continue
+                            send(pack_header(FRAME, header[1], time.time_ns()) + await self.render())
+                else:
+                    # The legacy protocol is strictly one frame at a time: nothing overlaps the link delay.
+                    while time.monotonic() < deadline:
+                        await websocket.send('1')
+                        await websocket.recv()  # the JSON encoded request
+                        frame = await self.render()
+                        await asyncio.sleep(self.latency)
+                        await websocket.send(frame)
+            finally:
+                sender.cancel()
+        return self.sent
+
+    def run_blocking(self, duration):
+        return asyncio.run(self.run(duration))
@@ -0,0 +1,60 @@
+import argparse
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import time
+
+import numpy as np
+
+from core.Frame import Frame
+from object_detector.models.LightCNNTracker import LightCNNTracker
+from object_detector.models.RemoteRecognizer import RemoteRecognizer
+from object_detector.models.tracker_options import GalleryOptions
+from common import read_frames
+
+parser = argparse.ArgumentParser(description='Main-loop cost of face recognition in-process against RemoteRecognizer '
+                                             'worker processes fed through the shared-memory frame bus')
+parser.add_argument('--video', required=True, help='Video file to feed as camera frames.')
+parser.add_argument('--model_path', required=True, help='LightCNN checkpoint.')
+parser.add_argument('--feature_dir', required=True, help='Feature directory (or its packed gallery).')
+parser.add_argument('--workers', default=[1, 2], type=int, nargs='+', help='Worker process counts to run.')
+parser.add_argument('--fps', default=30.0, type=float, help='Rate frames are handed to the model.')
+parser.add_argument('--warmup', default=5.0, type=float, help='Seconds to let the workers load the model.')
+
+
+def run(model, frames, fps):
+    """Per-frame on_frame times, paced like a camera."""
+    times = []
+    next_frame = time.perf_counter()
+    for i, frame in enumerate(frames):
+        start = time.perf_counter()
+        model.on_frame(Frame(frame.copy(), i + 1, time.monotonic(), 'video'))
+        times.append(time.perf_counter() - start)
+        next_frame += 1.0 / fps
+        time.sleep(max(0.0, next_frame - time.perf_counter()))
+    return np.array(times) * 1000
+
+
+def report(name, times, extra=''):
+    print(f"{name:>14} mean {times.mean():>7.2f} ms  p95 {np.percentile(times, 95):>7.2f} ms  max {times.max():>7.2f} ms {extra}")
+
+
+def main():
+    args = parser.parse_args()
+    frames = read_frames(args.video)
+    kwargs = dict(model_path=args.model_path, gallery_options=GalleryOptions(feature_dir=args.feature_dir))
+    print(f"{len(frames)} frames of {frames[0].shape}, {os.cpu_count()} cpus")
+
+    report('in-process', run(LightCNNTracker(**kwargs), frames, args.fps))
+
+    for workers in args.workers:
+        model = RemoteRecognizer(workers=workers, frame_shape=frames[0].shape, **kwargs)
+        time.sleep(args.warmup)
+        times = run(model, frames, args.fps)
+        time.sleep(1.0)
+        model.recognize_face(Frame(frames[-1].copy(), len(frames) + 1, time.monotonic(), 'video'))
+        report(f'{workers} worker(s)', times,
+               f"({model.applied} of {model.published} published frames applied, {model.bus.dropped} dropped)")
+        model.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+from scipy.spatial.distance import cosine
+
+from object_detector.gallery.FeatureGallery import FeatureGallery
+from common import best_time
+
+parser = argparse.ArgumentParser(description='Gallery matching benchmark: per-pair loop vs vectorized FeatureGallery')
+parser.add_argument('--sizes', default='10,100,1000,10000,100000', type=str, help='Comma separated gallery sizes (templates).')
+parser.add_argument('--templates_per_person', default=5, type=int, help='Templates enrolled per identity.')
+parser.add_argument('--faces', default=4, type=int, help='Faces matched per frame.')
+parser.add_argument('--dim', default=256, type=int, help='Embedding size.')
+parser.add_argument('--repeats', default=5, type=int, help='Timed repetitions per gallery size.')
+parser.add_argument('--loop_limit', default=10000, type=int, help='Skip the Python loop above this gallery size.')
+parser.add_argument('--threshold', default=0.7, type=float, help='Similarity threshold passed to the matcher.')
+
+
+def make_feature_db(size, templates_per_person, dim, rng):
+    feature_db = {}
+    for i in range(size):
+        feature_db.setdefault(f"person_{i // templates_per_person}", []).append(rng.standard_normal(dim).astype(np.float32))
+    return feature_db
+
+
+def loop_match(feature_db, features, threshold):
+    """The matching loop LightCNNTracker.recognize_face used before FeatureGallery."""
+    matches = []
+    for feature in features:
+        best_match = "Unknown"
+        best_similarity = float('inf')
+        for person_name, db_features in feature_db.items():
+            for db_feat in db_features:
+                similarity = cosine(feature, db_feat)
+                if similarity < best_similarity:
+                    best_similarity = similarity
+                    best_match = person_name
+        if best_similarity >= threshold:
+            best_match = "Unknown"
+        matches.append((best_match, best_similarity))
+    return matches
+
+
+def main():
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    print(f"{'templates':>10} {'loop ms':>10} {'vector ms':>10} {'speedup':>9} {'agree':>6}")
+    for size in [int(s) for s in args.sizes.split(',')]:
+        feature_db = make_feature_db(size, args.templates_per_person, args.dim, rng)
+        gallery = FeatureGallery.from_feature_db(feature_db)
+        person_names = list(feature_db)
+        # Queries close to real templates so the threshold path is exercised on both sides.
+        features = np.stack([feature_db[person_names[rng.integers(len(person_names))]][0] + 0.3 * rng.standard_normal(args.dim)
+                             for _ in range(args.faces)]).astype(np.float32)
+
+        vector_time, vector_matches = best_time(lambda: gallery.match(features, args.threshold), args.repeats)
+
+        if size <= args.loop_limit:
+            loop_time, loop_matches = best_time(lambda: loop_match(feature_db, features, args.threshold), 1)
+            agree = all(a[0] == b[0] for a, b in zip(loop_matches, vector_matches))
+            print(f"{size:>10} {loop_time * 1000:>10.2f} {vector_time * 1000:>10.2f} {loop_time / vector_time:>8.1f}x {str(agree):>6}")
+        else:
+            print(f"{size:>10} {'skipped':>10} {vector_time * 1000:>10.2f} {'-':>9} {'-':>6}")
+
+
+if __name__ == '__main__':
+    main()
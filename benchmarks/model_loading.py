@@ -0,0 +1,125 @@
+import argparse
+import json
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import subprocess
+import tempfile
+import time
+
+import torch
+
+from object_detector.models.model_loader import ARCHITECTURES, build_model, load_embedding_model, save_artifact
+
+parser = argparse.ArgumentParser(description='LightCNN start-up cost: full classifier model vs inference-only model vs inference artifact')
+parser.add_argument('--resume', default='', type=str, metavar='PATH',
+                    help='LightCNN checkpoint (default: a random LightCNN-29 checkpoint written to a temp file).')
+parser.add_argument('--arch', default='LightCNN-29', choices=list(ARCHITECTURES), help='Architecture of the checkpoint.')
+parser.add_argument('--processes', default=4, type=int, help='Concurrent processes for the shared-memory (PSS) measurement.')
+parser.add_argument('--child', default='', type=str, help=argparse.SUPPRESS)
+parser.add_argument('--hold', default=0.0, type=float, help=argparse.SUPPRESS)
+
+NUM_CLASSES = 79077
+
+
+def rss_mb():
+    """Current resident set size of this process in MB (Linux)."""
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+
+
+def pss_mb():
+    """Proportional set size in MB: pages shared with other processes are split between them (Linux)."""
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            if line.startswith('Pss:'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+
+def load_full_model(path, arch):
+    """The loading path LightCNNTracker used before the inference-only model."""
+    model = build_model(arch, NUM_CLASSES)
+    checkpoint = torch.load(path, map_location=torch.device('cpu'))
+    model.load_state_dict({k.replace('module.', ''): v for k, v in checkpoint['state_dict'].items()})
+    model.eval()
+    return model
+
+
+LOADERS = {
+    'full': load_full_model,
+    'embedding': load_embedding_model,
+    'artifact': load_embedding_model,
+}
+
+
+def child(mode, path, arch, hold):
+    baseline_rss, baseline_pss = rss_mb(), pss_mb()
+    start = time.perf_counter()
+    model = LOADERS[mode](path, arch)
+    elapsed = time.perf_counter() - start
+    with torch.no_grad():
+        model(torch.rand(1, 1, 128, 128))  # touch every weight once
+    time.sleep(hold)  # let sibling processes map the same file before measuring
+    print(json.dumps({'load_s': elapsed, 'rss_mb': rss_mb() - baseline_rss, 'pss_mb': pss_mb() - baseline_pss,
+                      'params': sum(p.numel() for p in model.parameters())}))
+
+
+def command(mode, path, arch, hold=0.0):
+    return [sys.executable, __file__, '--child', mode, '--resume', path, '--arch', arch, '--hold', str(hold)]
+
+
+def parse(out):
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def measure(mode, path, arch):
+    return parse(subprocess.run(command(mode, path, arch), check=True, capture_output=True, text=True).stdout)
+
+
+def measure_concurrent(mode, path, arch, processes, hold=3.0):
+    children = [subprocess.Popen(command(mode, path, arch, hold), stdout=subprocess.PIPE, text=True) for _ in range(processes)]
+    results = [parse(c.communicate()[0]) for c in children]
+    return sum(r['pss_mb'] for r in results) / len(results)
+
+
+def write_random_checkpoint(arch):
+    model = build_model(arch, NUM_CLASSES)
+    fd, path = tempfile.mkstemp(suffix='.pth')
+    os.close(fd)
+    torch.save({'state_dict': {'module.' + k: v for k, v in model.state_dict().items()}}, path)
+    return path
+
+
+def check_identical(path, arch, artifact_path):
+    full, embedding, artifact = load_full_model(path, arch), load_embedding_model(path, arch), load_embedding_model(artifact_path)
+    batch = torch.rand(8, 1, 128, 128)
+    with torch.no_grad():
+        reference = full(batch)[1]
+        return torch.equal(reference, embedding(batch)) and torch.equal(reference, artifact(batch))
+
+
+def main():
+    args = parser.parse_args()
+    if args.child:
+        return child(args.child, args.resume, args.arch, args.hold)
+
+    path = args.resume or write_random_checkpoint(args.arch)
+    fd, artifact_path = tempfile.mkstemp(suffix='.embedding.pt')
+    os.close(fd)
+    try:
+        save_artifact(artifact_path, torch.load(path, map_location=torch.device('cpu'))['state_dict'], args.arch)
+        paths = {'full': path, 'embedding': path, 'artifact': artifact_path}
+
+        print(f"{'model':>10} {'load ms':>9} {'RSS MB':>8} {f'PSS MB x{args.processes}':>12} {'params':>10}")
+        for mode in LOADERS:
+            result = measure(mode, paths[mode], args.arch)
+            shared = measure_concurrent(mode, paths[mode], args.arch, args.processes)
+            print(f"{mode:>10} {result['load_s'] * 1000:>9.1f} {result['rss_mb']:>8.1f} {shared:>12.1f} {result['params']:>10}")
+        print(f"Embeddings bit-identical: {check_identical(path, args.arch, artifact_path)}")
+    finally:
+        os.remove(artifact_path)
+        if not args.resume:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import threading
+import time
+
+import numpy as np
+
+from object_detector.models.RecognitionService import RecognitionService
+from object_detector.models.tracker_options import GalleryOptions
+from common import read_frames
+
+parser = argparse.ArgumentParser(description='Throughput and tail latency of one RecognitionService shared by N '
+                                             'streams replaying recorded videos, with and without cross-stream batching')
+parser.add_argument('--videos', required=True, nargs='+', help='Video files; streams cycle through them.')
+parser.add_argument('--model_path', required=True, help='LightCNN checkpoint.')
+parser.add_argument('--feature_dir', required=True, help='Feature directory (or its packed gallery).')
+parser.add_argument('--streams', default=[1, 2, 4, 8], type=int, nargs='+', help='Stream counts to run.')
+parser.add_argument('--max_batch', default=[1, 32], type=int, nargs='+',
+                    help='Batch limits to compare; 1 embeds every face on its own.')
+parser.add_argument('--max_wait_ms', default=10.0, type=float, help='Longest a face waits for its batch to fill.')
+parser.add_argument('--fps', default=30.0, type=float, help='Frame rate of every stream.')
+parser.add_argument('--duration', default=10.0, type=float, help='Seconds per run.')
+parser.add_argument('--fixed_faces', default=0, type=int,
+                    help='Use this many fixed face boxes per frame instead of Haar detection '
+                         '(for footage without enough faces).')
+
+
+def fixed_boxes(shape, count):
+    h, w = shape[:2]
+    size = min(h, w) // 4
+    return [((i * size) % (w - size), (i * size // (w - size)) * size % (h - size), size, size) for i in range(count)]
+
+
+def replay(service, stream_id, frames, args, stop, latencies, counts):
+    """One camera: a frame every 1/fps, skipped while the previous one is still being recognized."""
+    boxes = fixed_boxes(frames[0].shape, args.fixed_faces) if args.fixed_faces else None
+    in_flight = threading.Event()
+    next_frame = time.perf_counter()
+    i = 0
+    while not stop.is_set():
+        if in_flight.is_set():
+            counts['skipped'] += 1
+        else:
+            in_flight.set()
+            start = time.perf_counter()
+
+            def done(future, start=start):
+                latencies.append(time.perf_counter() - start)
+                in_flight.clear()
+
+            service.submit(stream_id, frames[i % len(frames)], boxes).add_done_callback(done)
+            counts['submitted'] += 1
+        i += 1
+        next_frame += 1.0 / args.fps
+        time.sleep(max(0.0, next_frame - time.perf_counter()))
+
+
+def run(args, videos, streams, max_batch):
+    service = RecognitionService(max_batch, args.max_wait_ms / 1000, model_path=args.model_path,
+                                 gallery_options=GalleryOptions(feature_dir=args.feature_dir))
+    stop = threading.Event()
+    latencies = []
+    counts = [{'submitted': 0, 'skipped': 0} for _ in range(streams)]
+    threads = [threading.Thread(target=replay, args=(service, f"stream-{i}", videos[i % len(videos)], args, stop,
+                                                     latencies, counts[i]), daemon=True)
+               for i in range(streams)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    service.stop(timeout=10)
+    elapsed = time.perf_counter() - start
+
+    stats = service.stats()
+    offered = sum(c['submitted'] + c['skipped'] for c in counts)
+    latency = np.array(latencies or [0.0]) * 1000
+    print(f"{streams:>7} {max_batch:>5} {stats['frames'] / elapsed:>8.1f} {stats['faces'] / elapsed:>8.1f} "
+          f"{sum(c['skipped'] for c in counts) / max(offered, 1):>7.1%} {stats['mean_batch']:>11.1f} "
+          f"{np.percentile(latency, 50):>7.1f} {np.percentile(latency, 95):>7.1f} {np.percentile(latency, 99):>7.1f}")
+
+
+def main():
+    args = parser.parse_args()
+    videos = [read_frames(path, 300) for path in args.videos]
+    print(f"{len(videos)} video(s), {args.fps:g} fps per stream, max wait {args.max_wait_ms:g} ms, {os.cpu_count()} cpus")
+    print(f"{'streams':>7} {'batch':>5} {'frames/s':>8} {'faces/s':>8} {'skipped':>7} {'faces/batch':>11} "
+          f"{'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7}")
+    for streams in args.streams:
+        for max_batch in args.max_batch:
+            run(args, videos, streams, max_batch)
+
+
+if __name__ == '__main__':
+    main()
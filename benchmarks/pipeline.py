@@ -0,0 +1,77 @@
+import argparse
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import time
+
+import cv2
+import numpy as np
+
+from core.Pipeline import Pipeline
+
+parser = argparse.ArgumentParser(description='Serial against pipelined frame processing with GIL-releasing OpenCV '
+                                             'stages standing in for detection, embedding and navigation')
+parser.add_argument('--frames', default=200, type=int, help='Frames pushed through each mode.')
+parser.add_argument('--detect_passes', default=6, type=int, help='Blur passes of the detection stand-in.')
+parser.add_argument('--embed_passes', default=4, type=int, help='Blur passes of the embedding stand-in.')
+parser.add_argument('--navigate_passes', default=1, type=int, help='Blur passes of the navigation stand-in.')
+parser.add_argument('--queue_size', default=2, type=int, help='Pipeline queue size.')
+
+
+def work(passes):
+    def stage(item):
+        sequence, frame = item
+        for _ in range(passes):
+            frame = cv2.GaussianBlur(frame, (31, 31), 0)
+        return sequence, frame
+    return stage
+
+
+def main():
+    args = parser.parse_args()
+    cv2.setNumThreads(1)  # one core per stage, like the workers get
+    frames = [(i, np.random.default_rng(i).integers(0, 256, (720, 960, 3), dtype=np.uint8)) for i in range(8)]
+    stages = [('detect', work(args.detect_passes)), ('embed', work(args.embed_passes)), ('navigate', work(args.navigate_passes))]
+
+    print(f"{os.cpu_count()} cpus")
+    for name, fn in stages:
+        start = time.perf_counter()
+        for item in frames:
+            fn(item)
+        print(f"{name:>9} stage {(time.perf_counter() - start) / len(frames) * 1000:>7.2f} ms/frame")
+
+    start = time.perf_counter()
+    for i in range(args.frames):
+        item = frames[i % len(frames)]
+        for _, fn in stages:
+            item = fn(item)
+    serial = args.frames / (time.perf_counter() - start)
+
+    # Feed the pipeline as fast as the first stage takes frames, like a camera outrunning it.
+    outputs = []
+    navigate = stages[-1][1]
+
+    def record(item):
+        item = navigate(item)
+        outputs.append(item[0])
+        return item
+
+    pipeline = Pipeline(stages[:-1] + [('navigate', record)], args.queue_size)
+    max_depths = {name: 0 for name, _ in stages}
+    start = time.perf_counter()
+    for i in range(args.frames):
+        while len(pipeline.queues[0]) >= args.queue_size:
+            time.sleep(0.0005)
+        pipeline.submit((i, frames[i % len(frames)][1]))
+        for name, stat in pipeline.stats().items():
+            max_depths[name] = max(max_depths[name], stat['depth'])
+    pipeline.stop(timeout=60)
+    pipelined = len(outputs) / (time.perf_counter() - start)
+
+    assert outputs == sorted(outputs), "pipeline reordered frames"
+    print(f"serial    {serial:>7.1f} fps")
+    print(f"pipelined {pipelined:>7.1f} fps ({len(outputs)} of {args.frames} frames through, in order)")
+    for name, stat in pipeline.stats().items():
+        print(f"{name:>9} processed {stat['processed']:>4}, dropped {stat['dropped']:>4}, max depth {max_depths[name]}")
+
+
+if __name__ == '__main__':
+    main()
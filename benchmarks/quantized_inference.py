@@ -0,0 +1,55 @@
+import argparse
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import torch
+
+from object_detector.models.FaceEmbedder import FaceEmbedder
+from object_detector.models.model_loader import ARCHITECTURES, build_model, load_embedding_model, resolve_model_path
+from object_detector.models.quantization import quantize_dynamic_model, quantize_static_model, load_quantized
+from common import best_time
+
+parser = argparse.ArgumentParser(description='LightCNN embedding latency: float vs INT8 dynamic vs INT8 static, batch sizes 1 to 16')
+parser.add_argument('--resume', default='', type=str, metavar='PATH', help='Checkpoint or artifact (default: random LightCNN-29 weights).')
+parser.add_argument('--model', default='LightCNN-29', choices=list(ARCHITECTURES), help='Architecture of a training checkpoint.')
+parser.add_argument('--quantized', default='', type=str, metavar='PATH',
+                    help='Static INT8 model from models/quantize.py (default: calibrated here on random crops, latency only).')
+parser.add_argument('--batch_sizes', default='1,2,4,8,16', type=str, help='Comma separated batch sizes.')
+parser.add_argument('--repeats', default=5, type=int, help='Timed repetitions per batch size.')
+parser.add_argument('--threads', default=0, type=int, help='torch intra-op threads (0: torch default).')
+
+
+def main():
+    args = parser.parse_args()
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    if args.resume:
+        float_model = load_embedding_model(resolve_model_path(args.resume), args.model)
+    else:
+        float_model = build_model(args.model).eval()
+
+    rng = np.random.default_rng(0)
+    crops = [rng.integers(0, 256, (int(s), int(s), 3), dtype=np.uint8) for s in rng.integers(60, 200, 16)]
+
+    if args.quantized:
+        static_model = load_quantized(args.quantized)
+    else:
+        static_model = quantize_static_model(float_model, [FaceEmbedder(float_model).to_tensor(crops)])
+
+    embedders = {
+        'float': FaceEmbedder(float_model),
+        'int8-dynamic': FaceEmbedder(quantize_dynamic_model(float_model)),
+        'int8': FaceEmbedder(static_model),
+    }
+
+    print(f"{'batch':>5} " + ' '.join(f"{name + ' ms':>15}" for name in embedders) + f" {'int8 speedup':>13}")
+    for batch_size in [int(b) for b in args.batch_sizes.split(',')]:
+        faces = (crops * (batch_size // len(crops) + 1))[:batch_size]
+        times = {name: best_time(lambda: embedder.embed(faces), args.repeats, warmup=True)[0] for name, embedder in embedders.items()}
+        print(f"{batch_size:>5} " + ' '.join(f"{t * 1000:>15.2f}" for t in times.values()) +
+              f" {times['float'] / times['int8']:>12.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import time
+
+import cv2
+import numpy as np
+
+from object_detector.tracking.MotionModel import MotionModel
+from common import iou, read_frames
+
+parser = argparse.ArgumentParser(description='Haar detection cost on a recorded video: full-frame scans against '
+                                             'scanning only the motion-predicted region around one tracked face')
+parser.add_argument('--video', required=True, type=str, metavar='PATH', help='Recorded video with one face to follow.')
+parser.add_argument('--padding', default='0.5,1.0,2.0', type=str, help='Comma separated ROI paddings (fraction of the box).')
+parser.add_argument('--max_frames', default=600, type=int, help='Frames read from the video.')
+
+face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+
+
+def detect(img):
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    return face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
+
+
+def largest(faces):
+    return tuple(int(v) for v in max(faces, key=lambda f: f[2] * f[3])) if len(faces) else None
+
+
+def run_full(frames):
+    boxes = []
+    start = time.perf_counter()
+    for frame in frames:
+        boxes.append(largest(detect(frame)))
+    return boxes, time.perf_counter() - start
+
+
+def run_roi(frames, padding):
+    """Returns (boxes, seconds, full-frame fallbacks, mean scanned fraction of the frame)."""
+    motion = MotionModel(padding)
+    boxes, fallbacks, scanned = [], 0, []
+    start = time.perf_counter()
+    for frame in frames:
+        motion.predict()
+        region = motion.search_region(frame.shape)
+        box = None
+        if region is not None:
+            x0, y0, w, h = region
+            box = largest(detect(frame[y0:y0+h, x0:x0+w]))
+            if box:
+                box = (box[0] + x0, box[1] + y0, box[2], box[3])
+                scanned.append(w * h / (frame.shape[0] * frame.shape[1]))
+        if box is None:
+            fallbacks += 1
+            scanned.append(1.0)
+            box = largest(detect(frame))
+        if box is None:
+            motion.reset()
+        else:
+            motion.correct(box)
+        boxes.append(box)
+    return boxes, time.perf_counter() - start, fallbacks, float(np.mean(scanned))
+
+
+def main():
+    args = parser.parse_args()
+    frames = read_frames(args.video, args.max_frames)
+    if not frames:
+        raise ValueError(f"No frames read from {args.video}")
+    print(f"{len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}")
+
+    reference, full_time = run_full(frames)
+    print(f"{'mode':>12} {'ms/frame':>9} {'scanned':>8} {'fallbacks':>10} {'found':>6} {'mean IoU':>9}")
+    found = sum(b is not None for b in reference)
+    print(f"{'full':>12} {full_time / len(frames) * 1000:>9.2f} {1.0:>8.2f} {'-':>10} {found:>6} {1.0:>9.3f}")
+
+    for padding in [float(p) for p in args.padding.split(',')]:
+        boxes, seconds, fallbacks, scanned = run_roi(frames, padding)
+        scores = [iou(ref, box) if box else 0.0 for ref, box in zip(reference, boxes) if ref]
+        print(f"{f'roi {padding:g}':>12} {seconds / len(frames) * 1000:>9.2f} {scanned:>8.2f} {fallbacks:>10} "
+              f"{sum(b is not None for b in boxes):>6} {np.mean(scores) if scores else 0.0:>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
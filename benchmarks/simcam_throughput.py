@@ -0,0 +1,83 @@
+import argparse
+import io
+import multiprocessing
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import time
+
+import cv2
+import numpy as np
+
+from object_detector.input.SimCam import SimCam, decode_image
+from fake_simulator import FakeSimulator
+
+parser = argparse.ArgumentParser(description='SimCam throughput against a local stand-in simulator: legacy protocol '
+                                             'against the binary protocol with 1..N frames in flight, plus decode cost')
+parser.add_argument('--port', default=8097, type=int, help='Port the benchmark SimCam listens on.')
+parser.add_argument('--seconds', default=3.0, type=float, help='Duration of every run.')
+parser.add_argument('--render_ms', default=5.0, type=float, help='Simulated render time per frame.')
+parser.add_argument('--latency_ms', default=10.0, type=float, help='Simulated one-way link latency of every frame.')
+parser.add_argument('--in_flight', default='1,2,4', type=str, help='Comma separated max_in_flight values.')
+parser.add_argument('--size', default='960x720', type=str, help='Frame size WxH.')
+parser.add_argument('--drop_every', default=0, type=int, help='The simulator loses every Nth binary frame request (0: none).')
+
+
+def legacy_decode(data):
+    """The decode path SimCam used before: PIL, np.array and an RGB->BGR conversion."""
+    from PIL import Image
+    image = Image.open(io.BytesIO(data))
+    return cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+
+
+def time_decode(decode, data, repeats=50):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        decode(data)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def simulate(port, binary, render_time, latency, size, seconds, drop_every):
+    FakeSimulator(f"ws://127.0.0.1:{port}", binary, render_time, latency, size, drop_every=drop_every).run_blocking(seconds)
+
+
+def run(camera, binary, in_flight, args, size):
+    camera.max_in_flight = in_flight
+    camera.sequence, camera.decode_seconds, camera.lost_requests = 0, 0.0, 0
+    # A separate process like the real simulator, so it does not compete with SimCam for the GIL.
+    simulator = multiprocessing.Process(target=simulate, args=(args.port, binary, args.render_ms / 1000, args.latency_ms / 1000, size,
+                                                               args.seconds, args.drop_every if binary else 0))
+    simulator.start()
+    while camera.sequence == 0 and simulator.is_alive():
+        time.sleep(0.001)
+    start, first = time.perf_counter(), camera.sequence
+    simulator.join()
+    elapsed = time.perf_counter() - start
+    time.sleep(0.2)  # let the server side close the connection
+    frames = camera.sequence - first
+    return frames / elapsed, camera.decode_seconds / max(1, camera.sequence) * 1000, camera.lost_requests
+
+
+def main():
+    args = parser.parse_args()
+    size = tuple(int(v) for v in args.size.split('x'))
+
+    data = FakeSimulator.encode_frames(size, '.jpg', 1)[0]
+    print(f"JPEG {size[0]}x{size[1]}, {len(data) / 1024:.0f} KiB")
+    try:
+        print(f"decode PIL+cvtColor {time_decode(legacy_decode, data):.2f} ms, cv2.imdecode {time_decode(decode_image, data):.2f} ms")
+    except ImportError:
+        print(f"decode cv2.imdecode {time_decode(decode_image, data):.2f} ms (PIL not installed)")
+
+    camera = SimCam(port=args.port)
+    time.sleep(0.5)
+
+    print(f"{'protocol':>10} {'in flight':>9} {'fps':>7} {'decode ms':>9} {'lost':>5}")
+    fps, decode_ms, lost = run(camera, False, 1, args, size)
+    print(f"{'legacy':>10} {1:>9} {fps:>7.1f} {decode_ms:>9.2f} {lost:>5}")
+    for in_flight in [int(v) for v in args.in_flight.split(',')]:
+        fps, decode_ms, lost = run(camera, True, in_flight, args, size)
+        print(f"{'binary':>10} {in_flight:>9} {fps:>7.1f} {decode_ms:>9.2f} {lost:>5}")
+    camera.exit()
+
+
+if __name__ == '__main__':
+    main()
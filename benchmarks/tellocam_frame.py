@@ -0,0 +1,89 @@
+import argparse
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from object_detector.input.TelloCam import TelloCam
+
+parser = argparse.ArgumentParser(description='TelloCam.frame() cost and allocation rate when polled faster than '
+                                             'the drone streams, against the previous allocate-per-call path')
+parser.add_argument('--loop_hz', default=100.0, type=float, help='Rate the interface loop polls frame().')
+parser.add_argument('--stream_fps', default=30.0, type=float, help='Rate djitellopy decodes new frames.')
+parser.add_argument('--seconds', default=3.0, type=float, help='Simulated run length.')
+
+
+class FakeFrameRead:
+    """Stands in for djitellopy's BackgroundFrameRead: a new array every 1/fps seconds of simulated time."""
+
+    def __init__(self, fps, shape=(720, 960, 3)):
+        self.period = 1.0 / fps
+        self.shape = shape
+        self.now = 0.0
+        self.published = -1
+        self.rng = np.random.default_rng(0)
+        self._frame = None
+
+    @property
+    def frame(self):
+        index = int(self.now / self.period)
+        if index != self.published:
+            self._frame = self.rng.integers(0, 256, self.shape, dtype=np.uint8)
+            self.published = index
+        return self._frame
+
+
+class FakeTello:
+    def __init__(self, frame_read):
+        self.frame_read = frame_read
+
+    def get_frame_read(self):
+        return self.frame_read
+
+
+def legacy_frame(frame_read):
+    """TelloCam.frame() before buffers were reused."""
+    frame = np.zeros((720, 960, 3), dtype=np.uint8)
+    source = frame_read.frame
+    if source is not None:
+        frame = cv2.cvtColor(source, cv2.COLOR_BGR2RGB)
+    return frame
+
+
+def run(name, read, frame_read, calls, loop_period):
+    tracemalloc.start()
+    read()  # warm up buffers
+    allocated, seconds = 0, 0.0
+    for _ in range(calls):
+        frame_read.now += loop_period
+        frame_read.frame  # publish the next source frame outside the measurement: that allocation is djitellopy's
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        read()
+        seconds += time.perf_counter() - start
+        allocated += tracemalloc.get_traced_memory()[1] - before  # peak bytes allocated inside this call
+    tracemalloc.stop()
+    duration = calls * loop_period
+    print(f"{name:>8} {seconds / calls * 1e6:>9.1f} {allocated / duration / 1e6:>10.1f}")
+
+
+def main():
+    args = parser.parse_args()
+    calls = int(args.seconds * args.loop_hz)
+    print(f"{calls} frame() calls at {args.loop_hz:g} Hz on a {args.stream_fps:g} fps stream")
+    print(f"{'path':>8} {'us/call':>9} {'MB/s alloc':>10}")
+
+    frame_read = FakeFrameRead(args.stream_fps)
+    run('legacy', lambda: legacy_frame(frame_read), frame_read, calls, 1.0 / args.loop_hz)
+
+    frame_read = FakeFrameRead(args.stream_fps)
+    camera = TelloCam(FakeTello(frame_read))
+    run('buffered', camera.frame, frame_read, calls, 1.0 / args.loop_hz)
+    print(f"{camera.sequence} distinct frames served")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+import argparse
+import json
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import platform
+import subprocess
+import time
+
+os.environ.setdefault("HEADLESS", "1")  # no Qt, no windows
+
+import cv2
+import numpy as np
+
+from core.Camera import FrameCaptureError
+from core.HeadlessInterface import HeadlessInterface
+from object_detector.input.FileCam import FileCam
+from common import iou
+
+TRACKERS = ['LightCNNTracker', 'CSRTTracker', 'DaSiamRPNTracker', 'DaSiamMultipleTracker']
+
+parser = argparse.ArgumentParser(description='Replay a video through every tracker headless and report FPS, latency '
+                                             'percentiles, CPU time, peak memory and, with ground truth, IoU and success rate')
+parser.add_argument('--video', required=True, help='Video file or image sequence (a directory or glob) to replay.')
+parser.add_argument('--trackers', default=TRACKERS, nargs='+', choices=TRACKERS, help='Trackers to run.')
+parser.add_argument('--ground_truth', default=None,
+                    help='One x,y,w,h box per frame (OTB groundtruth_rect.txt style; comma, tab or space separated, '
+                         'an empty or zero-size box where the target is absent).')
+parser.add_argument('--init_box', default=None, help='x,y,w,h to start box trackers on without ground truth.')
+parser.add_argument('--frames', default=0, type=int, help='Replay at most this many frames (0: all).')
+parser.add_argument('--iou_threshold', default=0.5, type=float, help='IoU counted as a success.')
+parser.add_argument('--model_path', default=None, help='LightCNN checkpoint (default: the tracker\'s).')
+parser.add_argument('--feature_dir', default=None, help='LightCNN feature directory (default: the tracker\'s).')
+parser.add_argument('--output', default=None, help='Write the JSON report here as well as to stdout.')
+parser.add_argument('--child', default='', help=argparse.SUPPRESS)
+
+
+def read_boxes(path):
+    """Ground truth boxes, None for frames without the target."""
+    boxes = []
+    with open(path) as f:
+        for line in f:
+            values = line.replace(',', ' ').replace('\t', ' ').split()
+            box = tuple(float(v) for v in values[:4]) if len(values) >= 4 else None
+            boxes.append(box if box and box[2] > 0 and box[3] > 0 and not np.isnan(box).any() else None)
+    return boxes
+
+
+def parse_box(text):
+    return tuple(int(float(v)) for v in text.split(','))
+
+
+def build(name, interface, args):
+    if name == 'LightCNNTracker':
+        from object_detector.models.LightCNNTracker import LightCNNTracker
+        from object_detector.models.tracker_options import GalleryOptions
+        kwargs = {'model_path': args.model_path} if args.model_path else {}
+        if args.feature_dir:
+            kwargs['gallery_options'] = GalleryOptions(feature_dir=args.feature_dir)
+        return LightCNNTracker(draw=False, **kwargs)
+    if name == 'CSRTTracker':
+        from object_detector.models.CSRTTracker import CSRTTracker
+        return CSRTTracker(interface, draw_point=False, draw_boundary=False)
+    if name == 'DaSiamRPNTracker':
+        from object_detector.models.DaSiamRPNTracker import DaSiamRPNTracker
+        return DaSiamRPNTracker(interface, draw_boundary=False, draw_point=False)
+    if name == 'DaSiamMultipleTracker':
+        from object_detector.models.DaSiamMultipleTracker import DaSiamMultipleTracker
+        return DaSiamMultipleTracker(interface, draw_point=False, draw_boundary=False)
+    raise ValueError(name)
+
+
+def peak_rss_mb():
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+    except ImportError:
+        return None
+
+
+def run_tracker(name, args):
+    """Runs in its own process, so peak memory and CPU time are this tracker's."""
+    ground_truth = read_boxes(args.ground_truth) if args.ground_truth else None
+    init_box = parse_box(args.init_box) if args.init_box else None
+    if init_box is None and ground_truth and ground_truth[0]:
+        init_box = tuple(int(v) for v in ground_truth[0])
+
+    camera = FileCam(args.video, pacing='unthrottled')  # every frame, decoded ahead off the clock
+    interface = HeadlessInterface()
+    interface.set_camera(camera)
+
+    start = time.perf_counter()
+    model = build(name, interface, args)
+    load_s = time.perf_counter() - start
+
+    latencies, boxes = [], []
+
+    def on_frame(frame):
+        if frame.sequence == 1 and init_box is not None and name != 'LightCNNTracker':
+            interface.set_boundary(init_box)  # what a mouse selection on the first frame does
+        begin = time.perf_counter()
+        model.on_frame(frame)
+        latencies.append(time.perf_counter() - begin)
+        boxes.append(tuple(model.boundary) if model.boundary else None)
+
+    interface.add_on_boundary(model.set_object)
+    interface.add_frame_listener(on_frame)
+
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    try:
+        while not args.frames or interface.frames < args.frames:
+            interface.loop()
+    except FrameCaptureError:  # end of the video
+        pass
+    camera.stop()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    latency = np.array(latencies or [0.0]) * 1000
+    result = {
+        "frames": len(latencies),
+        "load_s": load_s,
+        "fps": len(latencies) / latency.sum() * 1000 if latency.sum() else 0.0,
+        "wall_fps": len(latencies) / wall if wall else 0.0,
+        "latency_ms": {"mean": float(latency.mean()), "p50": float(np.percentile(latency, 50)),
+                       "p95": float(np.percentile(latency, 95)), "p99": float(np.percentile(latency, 99)),
+                       "max": float(latency.max())},
+        "cpu_s": cpu,
+        "cpu_per_frame_ms": cpu / max(len(latencies), 1) * 1000,
+        "peak_rss_mb": peak_rss_mb(),
+        "frames_with_box": sum(box is not None for box in boxes),
+    }
+
+    if ground_truth:
+        # Frames without the target are not scored; a frame without a tracked box scores 0.
+        scores = [iou(box, truth) if box else 0.0 for box, truth in zip(boxes, ground_truth) if truth]
+        if scores:
+            thresholds = np.linspace(0, 1, 21)
+            curve = [float(np.mean([s > t for s in scores])) for t in thresholds]
+            result["accuracy"] = {
+                "mean_iou": float(np.mean(scores)),
+                "success_rate": float(np.mean([s >= args.iou_threshold for s in scores])),
+                "iou_threshold": args.iou_threshold,
+                "success_auc": float(np.mean(curve)),
+                "scored_frames": len(scores),
+            }
+    return result
+
+
+def child_command(name):
+    return [sys.executable, os.path.abspath(__file__), *sys.argv[1:], '--child', name]
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(run_tracker(args.child, args)))
+        return
+
+    report = {
+        "video": os.path.abspath(args.video),
+        "ground_truth": os.path.abspath(args.ground_truth) if args.ground_truth else None,
+        "commit": git_commit(),
+        "machine": {"platform": platform.platform(), "python": platform.python_version(), "cpus": os.cpu_count(),
+                    "opencv": cv2.__version__},
+        "created": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "results": {},
+    }
+    for name in args.trackers:
+        child = subprocess.run(child_command(name), capture_output=True, text=True)
+        try:
+            result = json.loads(child.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError):
+            lines = (child.stderr or child.stdout).strip().splitlines()
+            result = {"error": lines[-1] if lines else f"exit code {child.returncode}"}
+        report["results"][name] = result
+
+        if "error" in result:
+            print(f"{name:>22}  failed: {result['error']}", file=sys.stderr)
+        else:
+            accuracy = result.get("accuracy")
+            print(f"{name:>22}  {result['fps']:>7.1f} fps  p50 {result['latency_ms']['p50']:>7.2f} ms  "
+                  f"p95 {result['latency_ms']['p95']:>7.2f} ms  cpu {result['cpu_per_frame_ms']:>7.2f} ms/frame  "
+                  f"peak {result['peak_rss_mb']:>6.0f} MB"
+                  + (f"  IoU {accuracy['mean_iou']:.3f}  success {accuracy['success_rate']:.1%}" if accuracy else ""),
+                  file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from core.util.functions.get_video_inputs import get_video_inputs
+from common import best_time
+
+parser = argparse.ArgumentParser(description='Time to camera inventory with fake capture backends: the old sequential '
+                                             'probe, concurrent probing, and a cached inventory')
+parser.add_argument('--cameras', default=3, type=int, help='Working fake cameras at indices 0..N-1.')
+parser.add_argument('--open_ms', default=400, type=float, help='Time a working camera takes to open.')
+parser.add_argument('--read_ms', default=150, type=float, help='Time to read the first frame.')
+parser.add_argument('--missing_ms', default=50, type=float, help='Time to fail opening a missing index.')
+parser.add_argument('--hung', default='', type=str, help='Comma separated indices whose open hangs for --hung_ms.')
+parser.add_argument('--hung_ms', default=5000, type=float, help='How long a hung device blocks.')
+parser.add_argument('--timeout', default=2.0, type=float, help='Probe timeout of get_video_inputs.')
+
+
+class FakeCapture:
+    """cv2.VideoCapture stand-in with configurable open and read delays."""
+
+    def __init__(self, index, args):
+        hung = {int(i) for i in args.hung.split(',') if i}
+        self.opened = index < args.cameras
+        delay = args.hung_ms if index in hung else args.open_ms if self.opened else args.missing_ms
+        time.sleep(delay / 1000)
+        self.read_delay = args.read_ms / 1000
+
+    def isOpened(self):
+        return self.opened
+
+    def read(self):
+        time.sleep(self.read_delay)
+        return True, np.zeros((480, 640, 3), dtype=np.uint8)
+
+    def get(self, prop):
+        return {cv2.CAP_PROP_FRAME_WIDTH: 640.0, cv2.CAP_PROP_FRAME_HEIGHT: 480.0}.get(prop, 0.0)
+
+    def release(self):
+        pass
+
+
+def sequential_inventory(factory):
+    """The probe loop get_video_inputs used before: one index after the other until one fails to open."""
+    video_inputs, index = {}, 0
+    while index < 10:
+        cap = factory(index)
+        if not cap.isOpened():
+            break
+        ret, frame = cap.read()
+        video_inputs[index] = {'readable': ret}
+        cap.release()
+        index += 1
+    return video_inputs
+
+
+def main():
+    args = parser.parse_args()
+    factory = lambda index: FakeCapture(index, args)
+    devices = {i: {'name': f"Fake {i}", 'type': 'WebCam', 'id': f"fake-{i}"} for i in range(args.cameras)}
+    cache_path = os.path.join(tempfile.mkdtemp(), 'video_inputs.json')
+
+    seconds, result = best_time(lambda: sequential_inventory(factory))
+    print(f"{'sequential':>12} {seconds * 1000:>8.0f} ms  {len(result)} cameras")
+
+    seconds, result = best_time(lambda: get_video_inputs(timeout=args.timeout, cache_path=cache_path,
+                                                     capture_factory=factory, devices=devices))
+    timed_out = sum(bool(info.get('timed_out')) for info in result.values())
+    print(f"{'concurrent':>12} {seconds * 1000:>8.0f} ms  {len(result)} cameras, {timed_out} timed out")
+
+    seconds, result = best_time(lambda: get_video_inputs(timeout=args.timeout, cache_path=cache_path,
+                                                     capture_factory=factory, devices=devices))
+    print(f"{'cached':>12} {seconds * 1000:>8.2f} ms  {len(result)} cameras"
+          + ("" if os.path.exists(cache_path) else " (not cached: a probe timed out)"))
+
+    devices[args.cameras] = {'name': "Plugged in", 'type': 'WebCam', 'id': "fake-new"}
+    seconds, result = best_time(lambda: get_video_inputs(timeout=args.timeout, cache_path=cache_path,
+                                                     capture_factory=factory, devices=devices))
+    print(f"{'new hardware':>12} {seconds * 1000:>8.0f} ms  re-probed")
+
+
+if __name__ == '__main__':
+    main()
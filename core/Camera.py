@@ -1,6 +1,12 @@
+import threading
+import time
+
 import cv2
 import numpy as np
 
+from core.Frame import Frame
+from core.Metrics import metrics
+
 class CameraError(Exception):
     """Base class for Camera-related exceptions."""
     pass
@@ -18,10 +24,32 @@ class CameraStopError(CameraError):
     pass
 
 class Camera:
-    def __init__(self, source, auto_start=True):
+    def __init__(self, source, auto_start=True, threaded=False, timeout=2.0):
+        """
+        threaded: grab frames continuously on a background thread into a double buffer,
+        so frame() never blocks on camera I/O and always returns the newest frame instead
+        of whatever the driver had buffered while the caller was busy.
+        timeout: seconds frame()/read() wait for the first (or a new) frame in threaded mode.
+        Every frame gets a sequence number and a time.monotonic() capture timestamp,
+        available from read() and as the sequence/timestamp attributes.
+        """
         self.source = source
         self.cap = None
         self.is_opened = False
+        self.threaded = threaded
+        self.timeout = timeout
+
+        self.sequence = 0        # number of the last frame returned, 0 before the first
+        self.timestamp = None    # capture time of that frame
+        self.dropped = 0         # frames captured but never returned (threaded mode)
+
+        self._thread = None
+        self._running = False
+        self._error = None
+        self._new_frame = threading.Condition()
+        self._buffers = [None, None]  # [front, back]
+        self._latest = (None, 0, None)  # (front buffer, sequence, timestamp)
+
         if auto_start:
             self.start()
 
@@ -29,26 +57,134 @@ class Camera:
         """Starts the camera and opens the video capture."""
         if not self.is_opened:
             try:
-                self.cap = cv2.VideoCapture(self.source)
+                self.cap = self.open_capture()
                 if not self.cap.isOpened():
                     raise CameraInitializationError(f"Unable to open video source {self.source}")
                 self.is_opened = True
             except Exception as e:
                 raise CameraInitializationError(f"Failed to initialize camera: {e}")
 
-    def frame(self):
-        """Captures a single frame from the camera."""
-        if self.cap is None or not self.cap.isOpened():
+            if self.threaded:
+                self._start_capture_thread()
+
+    def _start_capture_thread(self):
+        self._error = None
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._thread.start()
+
+    def start_threaded(self):
+        """Switch an open camera read synchronously (e.g. a kept-warm standby) to threaded capture."""
+        if self.threaded:
+            return
+        if not self.is_opened:
             raise FrameCaptureError("Camera not initialized or is already closed.")
-        
-        ret, frame = self.cap.read()
-        if not ret:
-            raise FrameCaptureError("Failed to capture frame.")
-        
-        return frame
+        self.threaded = True
+        self._start_capture_thread()
+
+    def stop_threaded(self):
+        """Stop threaded capture but keep the camera open, so grab() can keep it streaming cheaply."""
+        if not self.threaded:
+            return
+        self._running = False
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.timeout)
+        self._thread = None
+        self.threaded = False
+
+    def open_capture(self):
+        """Create the capture object; anything with isOpened/read/release will do."""
+        return cv2.VideoCapture(self.source)
+
+    def _capture_loop(self):
+        """Background thread: read into the back buffer, then swap it to the front."""
+        sequence = max(self.sequence, self._latest[1])  # continue numbering after a restart
+        while self._running:
+            ret, frame = self.cap.read(self._buffers[1])
+            if not ret:
+                with self._new_frame:
+                    self._error = "Failed to capture frame."
+                    self._running = False
+                    self._new_frame.notify_all()
+                return
+
+            sequence += 1
+            with self._new_frame:
+                self._buffers = [frame, self._buffers[0]]
+                self._latest = (frame, sequence, time.monotonic())
+                self._new_frame.notify_all()
+
+    @metrics.timed('capture')
+    def read(self, wait_new=False, timeout=None):
+        """
+        Returns (frame, sequence, timestamp); frame is a core.Frame carrying the same tags.
+        In threaded mode this is a copy of the newest captured frame; with wait_new it
+        first waits up to `timeout` (default: self.timeout) for a frame newer than the last
+        one returned, and returns the last one again when none came. The first frame is
+        always waited for up to self.timeout.
+        """
+        if not self.threaded:
+            if self.cap is None or not self.cap.isOpened():
+                raise FrameCaptureError("Camera not initialized or is already closed.")
+
+            ret, frame = self.cap.read()
+            if not ret:
+                raise FrameCaptureError("Failed to capture frame.")
+
+            self.sequence += 1
+            self.timestamp = time.monotonic()
+            return Frame(frame, self.sequence, self.timestamp, self.source), self.sequence, self.timestamp
+
+        if self._thread is None:
+            raise FrameCaptureError("Camera not initialized or is already closed.")
+
+        with self._new_frame:
+            newer = lambda: self._latest[1] > (self.sequence if wait_new else 0) or not self._running
+            self._new_frame.wait_for(newer, self.timeout if timeout is None or self._latest[0] is None else timeout)
+            frame, sequence, timestamp = self._latest
+            if self._error and sequence <= self.sequence:
+                raise FrameCaptureError(self._error)  # nothing newer is coming
+            if frame is None:
+                raise FrameCaptureError(f"No frame captured within {self.timeout} seconds.")
+            # Copy out while holding the lock: the capture thread reuses this buffer two frames later.
+            frame = frame.copy()
+
+        if self.sequence:
+            self.dropped += max(0, sequence - self.sequence - 1)
+        self.sequence, self.timestamp = sequence, timestamp
+        return Frame(frame, sequence, timestamp, self.source), sequence, timestamp
+
+    def grab(self):
+        """Grab a frame without decoding it, to keep an idle device streaming. No-op in threaded mode."""
+        if self.threaded or self.cap is None or not self.cap.isOpened():
+            return False
+        return self.cap.grab()
+
+    def flush(self, max_frames=10, min_wait=0.005):
+        """
+        Drop the frames the driver buffered while nobody read them: grab until a grab has to
+        wait at least `min_wait` seconds for a new frame, at most `max_frames` times.
+        No-op in threaded mode. Returns the number of frames dropped.
+        """
+        if self.threaded or self.cap is None or not self.cap.isOpened():
+            return 0
+        for dropped in range(max_frames):
+            start = time.perf_counter()
+            if not self.cap.grab() or time.perf_counter() - start >= min_wait:
+                return dropped
+        return max_frames
+
+    def frame(self):
+        """Captures a single frame from the camera (the newest one in threaded mode)."""
+        return self.read()[0]
 
     def stop(self):
         """Stops the camera and releases resources."""
+        if self._thread is not None:
+            self._running = False
+            if self._thread is not threading.current_thread():
+                self._thread.join(timeout=self.timeout)
+            self._thread = None
         if self.cap is not None:
             self.cap.release()
             self.is_opened = False
@@ -0,0 +1,54 @@
+import numpy as np
+
+
+class Frame(np.ndarray):
+    """
+    Camera pixels tagged with where and when they were captured.
+    A Frame is an ndarray view, so listeners, cv2 and numpy use it unchanged;
+    slices and views keep the tags.
+      sequence:  increases with every new frame of a source, 0 when unknown
+      timestamp: time.monotonic() at capture
+      source:    the camera it came from
+    """
+
+    def __new__(cls, pixels, sequence=0, timestamp=None, source=None):
+        frame = np.asarray(pixels).view(cls)
+        frame.sequence = sequence
+        frame.timestamp = timestamp
+        frame.source = source
+        return frame
+
+    def __array_finalize__(self, obj):
+        self.sequence = getattr(obj, 'sequence', 0)
+        self.timestamp = getattr(obj, 'timestamp', None)
+        self.source = getattr(obj, 'source', None)
+
+    def __reduce__(self):
+        # Pickle (e.g. across processes) as a plain array plus tags.
+        return Frame, (np.asarray(self), self.sequence, self.timestamp, self.source)
+
+
+def frame_id(frame):
+    """(source, sequence) of a tagged frame, None for untagged arrays."""
+    sequence = getattr(frame, 'sequence', 0)
+    return (getattr(frame, 'source', None), sequence) if sequence else None
+
+
+class FrameGate:
+    """
+    Remembers the last frame one listener processed. is_new() is False when the
+    interface loop hands the same camera frame in again; untagged frames are always new.
+    """
+
+    def __init__(self):
+        self.last = None
+        self.skipped = 0
+
+    def is_new(self, frame):
+        identity = frame_id(frame)
+        if identity is not None and identity == self.last:
+            self.skipped += 1
+            return False
+        self.last = identity
+        return True
+
@@ -0,0 +1,135 @@
+import atexit
+import collections
+import multiprocessing
+import queue
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class FrameBus:
+    """
+    Hands frames to worker processes through a ring of slots in one shared memory block.
+    publish() copies a frame into a free slot and queues only its slot number and metadata;
+    workers map the slot as an ndarray, so pixels are never pickled. A slot is reused once
+    its worker has replied. With no free slot (all workers busy) the frame is dropped.
+
+    worker(client, *args) runs in each of the `workers` spawned processes and loops over
+    client.tasks(), answering every task with client.reply().
+    """
+
+    def __init__(self, worker, args=(), workers=1, slots=None, frame_shape=(720, 960, 3), dtype=np.uint8):
+        self.slot_bytes = int(np.prod(frame_shape)) * np.dtype(dtype).itemsize
+        self.slots = slots or 2 * workers
+        self.shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes * self.slots)
+        self.free = collections.deque(range(self.slots))
+        self.dropped = 0
+        self.closed = False
+
+        context = multiprocessing.get_context('spawn')
+        self.tasks = context.Queue()
+        self.replies = context.Queue()
+        self.processes = [context.Process(target=_run_worker, daemon=True, name=f"framebus-{i}",
+                                          args=(worker, args, self.shm.name, self.slot_bytes, self.tasks, self.replies))
+                          for i in range(workers)]
+        for process in self.processes:
+            process.start()
+        atexit.register(self.close)
+
+    def publish(self, frame, **meta):
+        """Queue `frame` for the workers with extra picklable `meta`. Returns False when it was dropped."""
+        if self.closed:
+            return False
+        if frame.dtype.hasobject:
+            raise TypeError("Only plain numeric frames can be shared.")
+        if frame.nbytes > self.slot_bytes:
+            raise ValueError(f"Frame of {frame.shape} does not fit a {self.slot_bytes} byte slot.")
+        if not self.free:
+            self.dropped += 1
+            return False
+
+        slot = self.free.popleft()
+        view = np.ndarray(frame.shape, frame.dtype, buffer=self.shm.buf, offset=slot * self.slot_bytes)
+        np.copyto(view, frame)
+        del view
+        self.tasks.put(dict(meta, slot=slot, shape=frame.shape, dtype=frame.dtype.str))
+        return True
+
+    def results(self):
+        """Replies that have arrived, without waiting; their slots are free again."""
+        results = []
+        while True:
+            try:
+                task, result = self.replies.get_nowait()
+            except queue.Empty:
+                return results
+            self.free.append(task['slot'])
+            if result is not None:
+                results.append((task, result))
+
+    def close(self, timeout=2.0):
+        """Stop the workers and release the shared memory. Safe to call more than once."""
+        if self.closed:
+            return
+        self.closed = True
+        for _ in self.processes:
+            self.tasks.put(None)
+        for process in self.processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class FrameBusClient:
+    """The worker side of a FrameBus."""
+
+    def __init__(self, shm_name, slot_bytes, tasks, replies):
+        # Spawned workers share the bus's resource tracker, which unlinks the block if the bus dies.
+        self.shm = shared_memory.SharedMemory(name=shm_name)
+        self.slot_bytes = slot_bytes
+        self._tasks = tasks
+        self._replies = replies
+
+    def tasks(self):
+        """
+        Yields (task, frame) until the bus closes; frame is a view on the slot, valid until reply().
+        When tasks queued up, only the newest is processed and the older ones are released unanswered.
+        """
+        while True:
+            task = self._tasks.get()
+            backlog = []
+            while task is not None:
+                try:
+                    newer = self._tasks.get_nowait()
+                except queue.Empty:
+                    break
+                backlog.append(task)
+                task = newer
+            for skipped in backlog:
+                self.reply(skipped, None)
+            if task is None:
+                return
+
+            frame = np.ndarray(task['shape'], np.dtype(task['dtype']), buffer=self.shm.buf,
+                               offset=task['slot'] * self.slot_bytes)
+            yield task, frame
+
+    def reply(self, task, result):
+        """Send `result` (None for a skipped frame) back and give the slot back to the bus."""
+        self._replies.put((task, result))
+
+    def close(self):
+        self.shm.close()
+
+
+def _run_worker(worker, args, shm_name, slot_bytes, tasks, replies):
+    client = FrameBusClient(shm_name, slot_bytes, tasks, replies)
+    try:
+        worker(client, *args)
+    finally:
+        client.close()
@@ -0,0 +1,106 @@
+import time
+
+from core.Frame import FrameGate
+
+
+class HeadlessInterface:
+    """
+    Interface without a window, for running on boxes without a display.
+    Implements what run.py and the trackers use from CV2Interface / QT6Interface:
+    loop() reads the camera, waiting up to `frame_timeout` for its next frame, and hands every
+    new frame to the frame listeners; a stalled camera does not hold up the caller's loop.
+    Boundary and center updates are only stored, nothing is drawn.
+    A face can be selected from code with set_boundary() instead of with the mouse.
+    """
+
+    def __init__(self, poll_interval=0.002, frame_timeout=0.1):
+        """
+        poll_interval: sleep between reads of cameras that cannot block until a new frame.
+        frame_timeout: seconds loop() waits for a new frame before returning None.
+        """
+        self.camera = None
+        self.poll_interval = poll_interval
+        self.frame_timeout = frame_timeout
+        self.frame_listeners = []
+        self.boundary_listeners = []
+
+        self.frame = None
+        self.boundary = None
+        self.boundary_frame = None
+        self.center = None
+        self.boundary_visible = False
+        self.center_visible = False
+
+        self.frame_gate = FrameGate()
+        self.frames = 0
+        self.is_closed = False
+
+    def set_camera(self, camera):
+        self.camera = camera
+
+    def add_frame_listener(self, listener):
+        self.frame_listeners.append(listener)
+
+    def add_on_boundary(self, listener):
+        self.boundary_listeners.append(listener)
+
+    def set_boundary(self, boundary):
+        """Select (x, y, w, h) on the current frame, like a mouse drag does in the other interfaces."""
+        self.boundary = tuple(boundary)
+        self.boundary_frame = self.frame
+        for listener in self.boundary_listeners:
+            listener()
+
+    def update_boundary(self, x, y, w, h, color=None):
+        self.boundary = (x, y, w, h)
+
+    def update_center(self, x, y, color=None):
+        self.center = (x, y)
+
+    def show_boundary(self):
+        self.boundary_visible = True
+
+    def hide_boundary(self):
+        self.boundary_visible = False
+
+    def show_center(self):
+        self.center_visible = True
+
+    def hide_center(self):
+        self.center_visible = False
+
+    def read(self):
+        """
+        The camera's next frame: blocks on threaded cameras, otherwise polls until the frame
+        changes. None when no new frame came within frame_timeout.
+        """
+        deadline = time.monotonic() + self.frame_timeout
+        while not self.is_closed:
+            remaining = deadline - time.monotonic()
+            if getattr(self.camera, 'threaded', False):
+                frame = self.camera.read(wait_new=True, timeout=max(0.0, remaining))[0]
+            else:
+                frame = self.camera.frame()
+            if self.frame_gate.is_new(frame):
+                return frame
+            if remaining <= 0:
+                return None
+            time.sleep(min(self.poll_interval, remaining))
+        return None
+
+    def loop(self):
+        """Process the next camera frame with all frame listeners. Returns the frame, or None when the camera stalled."""
+        if self.camera is None or self.is_closed:
+            return None
+
+        frame = self.read()
+        if frame is None:
+            return None
+        self.frame = frame
+        self.frames += 1
+        for listener in self.frame_listeners:
+            listener(frame)
+        return frame
+
+    def close(self):
+        self.is_closed = True
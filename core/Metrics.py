@@ -0,0 +1,225 @@
+import functools
+import math
+import threading
+import time
+
+
+class Histogram:
+    """
+    Fixed-memory latency histogram: log-spaced buckets from `low` to `high` seconds,
+    `buckets_per_decade` per factor of ten (24 gives ~10% wide buckets). Percentiles are
+    read as the geometric middle of their bucket, so they are within ~5% of the exact value.
+    """
+
+    def __init__(self, low=1e-5, high=100.0, buckets_per_decade=24):
+        self.low = low
+        self.scale = buckets_per_decade / math.log(10)
+        self.size = int(math.ceil(math.log(high / low) * self.scale)) + 2  # + underflow and overflow
+        self.counts = [0] * self.size
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.lock = threading.Lock()
+
+    def bucket(self, value):
+        if value <= self.low:
+            return 0
+        return min(self.size - 1, int(math.log(value / self.low) * self.scale) + 1)
+
+    def middle(self, index):
+        return self.low * math.exp((index - 0.5) / self.scale) if index else self.low
+
+    def record(self, value):
+        index = self.bucket(value)
+        with self.lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+
+    def state(self):
+        """(bucket counts, count, total, max), copied together."""
+        with self.lock:
+            return list(self.counts), self.count, self.total, self.max
+
+    def percentile(self, q, state=None):
+        """The q-th percentile (q in 0..100) from the bucket holding it; 0.0 when empty."""
+        counts, count, _, largest = state or self.state()
+        if not count:
+            return 0.0
+        rank = q / 100 * count
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return min(self.middle(index), largest)
+        return largest
+
+    def snapshot(self, since=None):
+        """
+        count, mean, p50/p95/p99 and max, in milliseconds.
+        since: an earlier state(); only values recorded after it are counted (max stays all-time).
+        """
+        state = self.state()
+        if since is not None:
+            state = ([now - then for now, then in zip(state[0], since[0])],
+                     state[1] - since[1], state[2] - since[2], state[3])
+        _, count, total, largest = state
+        return {
+            "count": count,
+            "mean_ms": total / count * 1000 if count else 0.0,
+            "p50_ms": self.percentile(50, state) * 1000,
+            "p95_ms": self.percentile(95, state) * 1000,
+            "p99_ms": self.percentile(99, state) * 1000,
+            "max_ms": largest * 1000,
+        }
+
+    def reset(self):
+        with self.lock:
+            self.counts = [0] * self.size
+            self.count = 0
+            self.total = 0.0
+            self.max = 0.0
+
+
+class Counter:
+    """A running total with its own lock, so counters do not contend with each other."""
+
+    __slots__ = ("value", "lock")
+
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def add(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+
+class Timer:
+    """Context manager recording its duration into a histogram."""
+
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.record(time.perf_counter() - self.start)
+        return False
+
+
+class Metrics:
+    """
+    Named latency histograms and counters for the frame loop stages.
+        with metrics.timer('detect'): ...
+        @metrics.timed('navigate')
+        metrics.count('faces.verified')
+    snapshot() returns everything as a dict; start_reporting() prints a summary table
+    every `interval` seconds instead of per-frame prints.
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+        self.enabled = True
+        self._reporter = None
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault(name, Histogram())
+        return histogram
+
+    def record(self, name, seconds):
+        if self.enabled:
+            self.histogram(name).record(seconds)
+
+    def timer(self, name):
+        return Timer(self.histogram(name)) if self.enabled else _NULL_TIMER
+
+    def timed(self, name):
+        """Decorator timing every call of the function under `name`."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.histogram(name).record(time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def count(self, name, amount=1):
+        if not self.enabled:
+            return
+        counter = self.counters.get(name)
+        if counter is None:
+            with self.lock:
+                counter = self.counters.setdefault(name, Counter())
+        counter.add(amount)
+
+    def counter_values(self):
+        """{name: value} of all counters."""
+        with self.lock:
+            counters = dict(self.counters)
+        return {name: counter.value for name, counter in counters.items()}
+
+    def snapshot(self):
+        """{"timers": {name: histogram snapshot}, "counters": {name: value}}"""
+        with self.lock:
+            histograms = dict(self.histograms)
+        return {"timers": {name: histogram.snapshot() for name, histogram in sorted(histograms.items())},
+                "counters": self.counter_values()}
+
+    def summary(self):
+        """The snapshot as a text table."""
+        snapshot = self.snapshot()
+        lines = [f"{'stage':<22} {'count':>7} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  (ms)"]
+        for name, stats in snapshot["timers"].items():
+            lines.append(f"{name:<22} {stats['count']:>7} {stats['mean_ms']:>8.2f} {stats['p50_ms']:>8.2f} "
+                         f"{stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['max_ms']:>8.2f}")
+        if snapshot["counters"]:
+            lines.append("  ".join(f"{name}={value}" for name, value in sorted(snapshot["counters"].items())))
+        return "\n".join(lines)
+
+    def start_reporting(self, interval=10.0):
+        """Print summary() every `interval` seconds from a daemon thread."""
+        if self._reporter is not None:
+            return
+
+        def report():
+            while True:
+                time.sleep(interval)
+                print(f"[Metrics]\n{self.summary()}")
+
+        self._reporter = threading.Thread(target=report, daemon=True, name="metrics-reporter")
+        self._reporter.start()
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+metrics = Metrics()
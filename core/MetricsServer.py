@@ -0,0 +1,177 @@
+import collections
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.Metrics import metrics
+
+
+def memory_rss():
+    """Resident memory of this process in bytes (peak RSS where /proc is missing), None if unknown."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        return None
+
+
+def flatten(data, prefix=''):
+    """{'a': {'b': 1}} -> {'a_b': 1}"""
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '_'))
+        else:
+            flat[name] = value
+    return flat
+
+
+class MetricsServer:
+    """
+    Opt-in local HTTP endpoint with the live metrics, stdlib only, served from daemon threads:
+      /metrics       Prometheus text format
+      /metrics.json  the same as JSON
+      /health        200 while the camera delivers frames, 503 once its newest frame is
+                     older than `stale_after` seconds
+    status() returns the app's own gauges (camera type, tracking state, gallery size, queue
+    depths...); numbers become gauges, strings and booleans labels of an info metric.
+    FPS and the recent percentiles of every stage cover the last `window` to 2 * `window`
+    seconds: histogram states are sampled once per window and requests compare against the
+    older sample, so the frame loop only ever meets the histograms' own short locks.
+    """
+
+    PREFIX = 'face_detection_'
+
+    def __init__(self, port, status=None, host='127.0.0.1', window=10.0, stale_after=5.0, registry=metrics):
+        self.status = status or (lambda: {})
+        self.window = window
+        self.stale_after = stale_after
+        self.registry = registry
+        self.started = time.monotonic()
+        self.samples = collections.deque([self.sample()], maxlen=2)
+        self._running = True
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True, name="metrics-http").start()
+        threading.Thread(target=self._sample_loop, daemon=True, name="metrics-sampler").start()
+        print(f"[MetricsServer] Serving metrics on http://{host}:{self.httpd.server_address[1]}/metrics")
+
+    @property
+    def port(self):
+        return self.httpd.server_address[1]
+
+    def histograms(self):
+        with self.registry.lock:
+            return dict(self.registry.histograms)
+
+    def sample(self):
+        return time.monotonic(), {name: histogram.state() for name, histogram in self.histograms().items()}
+
+    def _sample_loop(self):
+        while self._running:
+            time.sleep(self.window)
+            self.samples.append(self.sample())
+
+    def collect(self):
+        """Everything the endpoint serves, as a dict."""
+        since, states = self.samples[0]
+        elapsed = max(time.monotonic() - since, 1e-9)
+        stages = {}
+        for name, histogram in sorted(self.histograms().items()):
+            before = states.get(name)
+            recent = histogram.snapshot(since=before) if before else histogram.snapshot()
+            stages[name] = {"fps": recent["count"] / elapsed, "recent": recent, "total": histogram.snapshot()}
+
+        try:
+            status = self.status()
+        except Exception as e:
+            status = {"status_error": str(e)}
+
+        counters = self.registry.counter_values()
+        return {
+            "uptime_s": time.monotonic() - self.started,
+            "window_s": elapsed,
+            "memory_rss_bytes": memory_rss(),
+            "stages": stages,
+            "counters": counters,
+            "status": status,
+        }
+
+    def healthy(self, data):
+        age = data["status"].get("camera_frame_age_s")
+        return age is None or age <= self.stale_after
+
+    def prometheus(self, data):
+        p = self.PREFIX
+        lines = [f"{p}uptime_seconds {data['uptime_s']:.3f}"]
+        if data["memory_rss_bytes"] is not None:
+            lines.append(f"{p}memory_rss_bytes {data['memory_rss_bytes']}")
+
+        for stage, stats in data["stages"].items():
+            label = f'stage="{stage}"'
+            lines.append(f"{p}stage_fps{{{label}}} {stats['fps']:.3f}")
+            lines.append(f"{p}stage_count_total{{{label}}} {stats['total']['count']}")
+            for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+                lines.append(f'{p}stage_latency_ms{{{label},quantile="{quantile}"}} {stats["recent"][key]:.3f}')
+
+        for name, value in sorted(data["counters"].items()):
+            lines.append(f'{p}events_total{{name="{name}"}} {value}')
+
+        info = []
+        for name, value in sorted(flatten(data["status"]).items()):
+            if value is None:
+                continue
+            key = ''.join(c if c.isalnum() else '_' for c in name)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                info.append(f'{key}="{str(value).replace(chr(34), chr(39))}"')
+            else:
+                lines.append(f"{p}{key} {value}")
+        if info:
+            lines.append(f"{p}info{{{','.join(info)}}} 1")
+        return "\n".join(lines) + "\n"
+
+    def handle(self, request):
+        path = request.path.split('?')[0]
+        if path not in ('/metrics', '/metrics.json', '/health'):
+            request.send_error(404)
+            return
+
+        data = self.collect()
+        code = 200
+        if path == '/metrics':
+            body, content_type = self.prometheus(data), 'text/plain; version=0.0.4'
+        else:
+            if path == '/health':
+                code = 200 if self.healthy(data) else 503
+                data = {"healthy": code == 200, "uptime_s": data["uptime_s"], "status": data["status"]}
+            body, content_type = json.dumps(data, default=str), 'application/json'
+
+        payload = body.encode()
+        request.send_response(code)
+        request.send_header('Content-Type', content_type)
+        request.send_header('Content-Length', str(len(payload)))
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def stop(self):
+        self._running = False
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,107 @@
+import atexit
+import collections
+import threading
+import time
+
+
+class DropOldestQueue:
+    """Bounded FIFO: put() on a full queue discards the oldest item instead of blocking."""
+
+    def __init__(self, maxsize=2):
+        self.items = collections.deque()
+        self.maxsize = max(1, maxsize)
+        self.dropped = 0
+        self.closed = False
+        self.ready = threading.Condition()
+
+    def __len__(self):
+        return len(self.items)
+
+    def put(self, item):
+        """Returns False when an older item had to be dropped to make room."""
+        with self.ready:
+            dropped = len(self.items) >= self.maxsize
+            if dropped:
+                self.items.popleft()
+                self.dropped += 1
+            self.items.append(item)
+            self.ready.notify()
+        return not dropped
+
+    def get(self):
+        """Block until an item is available; None once the queue is closed and empty."""
+        with self.ready:
+            self.ready.wait_for(lambda: self.items or self.closed)
+            return self.items.popleft() if self.items else None
+
+    def close(self):
+        with self.ready:
+            self.closed = True
+            self.ready.notify_all()
+
+
+class Pipeline:
+    """
+    Runs a chain of stages on their own worker threads, connected by bounded
+    drop-oldest queues: a slow stage makes the stages before it drop frames instead
+    of building up latency. Every stage has a single worker, so items leave the
+    pipeline in the order they were submitted (minus the dropped ones).
+    OpenCV and torch release the GIL, so stages built on them run in parallel.
+
+    stages: list of (name, fn); fn(item) returns the item for the next stage, or None
+    to stop it there. The last stage's return value is kept in `latest`.
+    """
+
+    def __init__(self, stages, queue_size=2):
+        self.names = [name for name, _ in stages]
+        self.queues = [DropOldestQueue(queue_size) for _ in stages]
+        self.processed = [0] * len(stages)
+        self.busy = [0.0] * len(stages)
+        self.latest = None
+        self.workers = [threading.Thread(target=self._work, args=(i, fn), daemon=True, name=f"pipeline-{name}")
+                        for i, (name, fn) in enumerate(stages)]
+        for worker in self.workers:
+            worker.start()
+        # Daemon workers killed inside torch/OpenCV calls at interpreter exit can abort the process.
+        atexit.register(self.stop)
+
+    def _work(self, index, fn):
+        inbox = self.queues[index]
+        outbox = self.queues[index + 1] if index + 1 < len(self.queues) else None
+        while True:
+            item = inbox.get()
+            if item is None:
+                break
+            start = time.perf_counter()
+            try:
+                result = fn(item)
+            except Exception as e:
+                print(f"[Pipeline] Stage {self.names[index]} failed: {e}")
+                result = None
+            self.busy[index] += time.perf_counter() - start
+            self.processed[index] += 1
+
+            if result is None:
+                continue
+            if outbox is not None:
+                outbox.put(result)
+            else:
+                self.latest = result
+        if outbox is not None:
+            outbox.close()
+
+    def submit(self, item):
+        """Queue an item for the first stage. Returns False when an older item was dropped for it."""
+        return self.queues[0].put(item)
+
+    def stats(self):
+        """Per stage: items waiting (depth), processed, dropped on the way in, seconds busy."""
+        return {name: {'depth': len(queue), 'processed': processed, 'dropped': queue.dropped, 'busy_seconds': busy}
+                for name, queue, processed, busy in zip(self.names, self.queues, self.processed, self.busy)}
+
+    def stop(self, timeout=1.0):
+        """Let the workers finish what is queued and exit."""
+        self.queues[0].close()
+        deadline = time.monotonic() + timeout
+        for worker in self.workers:
+            worker.join(max(0.0, deadline - time.monotonic()))
@@ -0,0 +1,54 @@
+import os
+
+
+class BoundSignal:
+    """The per-object side of a Signal: connect() slots and emit() to call them."""
+
+    def __init__(self):
+        self.slots = []
+
+    def connect(self, slot):
+        self.slots.append(slot)
+
+    def disconnect(self, slot=None):
+        if slot is None:
+            self.slots.clear()
+        else:
+            self.slots.remove(slot)
+
+    def emit(self, *args):
+        for slot in list(self.slots):
+            slot(*args)
+
+
+class Signal:
+    """Plain-Python stand-in for pyqtSignal: a class attribute giving every object its own BoundSignal."""
+
+    def __init__(self, *types):
+        self.types = types
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return instance.__dict__.setdefault(self.name, BoundSignal())
+
+
+class SignalObject:
+    """Stand-in for QObject."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+# Headless runs (HEADLESS set, or PyQt6 not installed) never import Qt.
+if os.getenv("HEADLESS"):
+    QObject, pyqtSignal = SignalObject, Signal
+else:
+    try:
+        from PyQt6.QtCore import QObject, pyqtSignal
+    except ImportError:
+        QObject, pyqtSignal = SignalObject, Signal
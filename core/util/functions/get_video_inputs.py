@@ -1,13 +1,20 @@
-
-
 import sys, os; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+import hashlib
+import json
+import threading
+import time
 import cv2
 from config.settings import platform
 
+DEFAULT_CACHE = os.getenv("VIDEO_INPUTS_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "eaglewings", "video_inputs.json"))
 
 
-def get_video_inputs():
-    video_inputs = {}
+def list_video_devices():
+    """
+    Ask the OS which video devices exist, without opening them.
+    Returns {index: {'name', 'type', 'id'}}; 'id' identifies the physical device.
+    """
+    devices = {}
     index = 0
 
     if platform == 'Linux':
@@ -18,7 +25,8 @@ def get_video_inputs():
             if 'ID_VIDEO' in device:
                 name = device.get('ID_MODEL', 'Unknown Camera')
                 device_type = 'WebCam' if 'usb' in device.device_type else 'Integrated Camera'
-                video_inputs[index] = {'name': name, 'type': device_type}
+                device_id = f"{device.sys_path}|{device.get('ID_SERIAL', '')}"
+                devices[index] = {'name': name, 'type': device_type, 'id': device_id}
                 index += 1
 
     elif platform == 'Windows':
@@ -27,32 +35,109 @@ def get_video_inputs():
         for device in c.Win32_PnPEntity():
             if "camera" in device.Caption.lower() or "video" in device.Caption.lower():
                 device_type = 'WebCam' if 'usb' in device.Caption.lower() else 'Integrated Camera'
-                video_inputs[index] = {'name': device.Caption, 'type': device_type}
+                devices[index] = {'name': device.Caption, 'type': device_type, 'id': device.DeviceID}
                 index += 1
 
-    else:
-        pass
+    return devices
 
 
-    while index < 10:
-        cap = cv2.VideoCapture(index)
-        
-        if not cap.isOpened():
-            break
+def device_set_key(devices):
+    """Hash of the attached device set; None when the OS cannot enumerate devices (nothing is cached then)."""
+    if not devices:
+        return None
+    ids = sorted(device['id'] for device in devices.values())
+    return hashlib.sha1("\n".join(ids).encode()).hexdigest()
+
 
+def probe_video_input(index, capture_factory=cv2.VideoCapture):
+    """Open capture `index` and read one frame. Returns None when it does not open."""
+    cap = capture_factory(index)
+    try:
+        if not cap.isOpened():
+            return None
         ret, frame = cap.read()
-        device = video_inputs.get(index, {'type':  f"Unknown", 'name': f"Camera {index}"})
+        if not ret:
+            return {'readable': False}
+        return {'width': cap.get(cv2.CAP_PROP_FRAME_WIDTH), 'height': cap.get(cv2.CAP_PROP_FRAME_HEIGHT), 'readable': True}
+    finally:
+        cap.release()
 
-        if ret:
-            width = cap.get(cv2.CAP_PROP_FRAME_WIDTH)
-            height = cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
 
+def probe_video_inputs(indices, timeout=2.0, capture_factory=cv2.VideoCapture):
+    """
+    Probe all `indices` at once, each on its own daemon thread, and wait at most `timeout`
+    seconds in total. A device that is still opening by then is reported as timed out
+    and its thread is left behind (a hung driver call cannot be cancelled).
+    Returns {index: probe result or None, 'timeout' for devices that did not answer}.
+    """
+    results = {}
+
+    def probe(index):
+        try:
+            results[index] = probe_video_input(index, capture_factory)
+        except Exception as e:
+            print(f"[get_video_inputs] Probing camera {index} failed: {e}")
+            results[index] = None
+
+    threads = [threading.Thread(target=probe, args=(index,), daemon=True) for index in indices]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + timeout
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+    return {index: results.get(index, 'timeout') for index in indices}
+
+
+def load_cache(cache_path, key):
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cache.get('key') != key:
+        return None
+    return {int(index): info for index, info in cache['inputs'].items()}
+
+
+def save_cache(cache_path, key, video_inputs):
+    try:
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'key': key, 'inputs': video_inputs}, f, indent=2)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"[get_video_inputs] Could not write camera cache {cache_path}: {e}")
+
+
+def get_video_inputs(max_index=10, timeout=2.0, cache_path=DEFAULT_CACHE, refresh=False,
+                     capture_factory=cv2.VideoCapture, devices=None):
+    """
+    Inventory of the video inputs: {index: {'name', 'type', 'readable'[, 'width', 'height'][, 'timed_out']}}.
+    Capture indices 0..max_index-1 are probed concurrently with an overall `timeout`.
+    The result is cached in `cache_path` under a hash of the OS device set and reused until
+    the attached hardware changes (or refresh=True). Inventories with timed out devices are
+    not cached. cache_path=None disables the cache.
+    """
+    devices = list_video_devices() if devices is None else devices
+    key = device_set_key(devices)
+
+    if cache_path and key and not refresh:
+        cached = load_cache(cache_path, key)
+        if cached is not None:
+            return cached
 
-            video_inputs[index] = {'name':  device['name'], 'width': width, 'height': height, 'readable': True, 'type': device['type']}
+    video_inputs = {}
+    for index, result in probe_video_inputs(range(max_index), timeout, capture_factory).items():
+        if result is None:
+            continue
+        device = devices.get(index, {'type': "Unknown", 'name': f"Camera {index}"})
+        video_inputs[index] = {'name': device['name'], 'type': device['type']}
+        if result == 'timeout':
+            video_inputs[index].update({'readable': False, 'timed_out': True})
         else:
-            video_inputs[index] = {'name':  device['name'], 'readable': False, 'type': device['type']}
-
-        cap.release()
-        index += 1
+            video_inputs[index].update(result)
 
+    if cache_path and key and not any(info.get('timed_out') for info in video_inputs.values()):
+        save_cache(cache_path, key, video_inputs)
     return video_inputs
@@ -1,7 +1,9 @@
 import cv2
+import time
 import sys, os; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 from navigation_plan.util.draw_grid_3x3 import draw_grid_3x3, highlight_cell
 from config.settings import GRID_CENTER, SAFE_DISTANCE
+from core.Metrics import metrics
 
 class GridGuide:
 
@@ -17,6 +19,8 @@ class GridGuide:
         self.is_static = True
 
         self.direction = {'x_axis': 0, 'y_axis': 0, 'z_axis': 0}
+        self.direction_timestamp = None  # capture time of the frame behind the direction
+        self.last_command_age = None     # seconds from that capture to the last move command
         self.cell = (1, 1)
 
 
@@ -24,11 +28,13 @@ class GridGuide:
         if not self.navigator.ready:
             return
 
+        self.direction_timestamp = getattr(self.navigator, 'location_timestamp', None)
         for axis, safe_limit in zip(['x_axis', 'y_axis', 'z_axis'], [GRID_CENTER[0] / 2, GRID_CENTER[1] / 2, SAFE_DISTANCE]):
             distance = self.navigator.location[axis]
             self.direction[axis] = 0 if abs(distance) < safe_limit else distance
 
 
+    @metrics.timed('guide.update_grid')
     def update_grid(self, frame):
 
         if not self.navigator.ready: return
@@ -47,6 +53,7 @@ class GridGuide:
             if self.show_direction and self.cell != (1, 1): highlight_cell(frame, self.cell, GRID_CENTER)
 
 
+    @metrics.timed('guide.loop')
     def loop(self):
         if not self.enabled:
             return
@@ -55,7 +62,12 @@ class GridGuide:
         
         if any(self.direction.values()):
             self.is_static = False
-            self.controller.move(**self.direction)
+            with metrics.timer('controller.move'):
+                self.controller.move(**self.direction)
+            if self.direction_timestamp is not None:
+                # Glass-to-command latency: camera capture until the move was issued.
+                self.last_command_age = time.monotonic() - self.direction_timestamp
+                metrics.record('command.age', self.last_command_age)
 
         else:
             if not self.is_static:
@@ -2,6 +2,8 @@
 import cv2
 import sys, os; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..//")))
 from config.settings import FRAME_SIZE, MAX_DISTANCE, GRID_CENTER, debug
+from core.Frame import FrameGate
+from core.Metrics import metrics
 
 
 class GridNavigatorError(Exception): pass
@@ -12,10 +14,11 @@ class InvalidCenterValue(GridNavigatorError): pass
 class GridNavigator:
 
 
-    def __init__(self, model, enabled=True):
+    def __init__(self, model, enabled=True, use_prediction=False):
         
         self.model = model
         self.enabled = enabled
+        self.use_prediction = use_prediction  # steer by model.predicted_center when the model has one
 
         self.x_limit = FRAME_SIZE[0] // 2
         self.y_limit = FRAME_SIZE[1] // 2
@@ -24,22 +27,36 @@ class GridNavigator:
         self.grid_center_area = GRID_CENTER[0] * GRID_CENTER[1]
         
         self.location = {'x_axis': 0, 'y_axis': 0, 'z_axis': 0}
+        self.location_timestamp = None  # capture time of the frame the location was computed from
         self.ready = False
+        self.frame_gate = FrameGate()  # the location only changes with a new camera frame
 
     
+    def target_center(self):
+
+        if self.use_prediction:
+            predicted = getattr(self.model, 'predicted_center', None)
+            if predicted is not None:
+                return predicted
+        return self.model.center
+
+
     def calculate_location(self, frame):
         
-        if self.model.center is None:
+        center = self.target_center()
+        # Models working behind the camera (pipelined, worker processes) say which frame their center is from.
+        self.location_timestamp = getattr(self.model, 'center_timestamp', None) or getattr(frame, 'timestamp', None)
+        if center is None:
             self.location = {'x_axis': 0, 'y_axis': 0, 'z_axis': 0}
             return
-        elif not isinstance(self.model.center, tuple) or len(self.model.center) != 2:
+        elif not isinstance(center, tuple) or len(center) != 2:
             self.location = {'x_axis': 0, 'y_axis': 0, 'z_axis': 0}
             return
 
         frame_height, frame_width = frame.shape[:2]
         frame_center = (frame_width // 2, frame_height // 2)
-        diff_x = self.model.center[0] - frame_center[0]
-        diff_y = self.model.center[1] - frame_center[1]
+        diff_x = center[0] - frame_center[0]
+        diff_y = center[1] - frame_center[1]
 
         self.location['x_axis'] = max(-self.x_limit, min(self.x_limit, diff_x))
         self.location['y_axis'] = -max(-self.y_limit, min(self.y_limit, diff_y))
@@ -53,8 +70,10 @@ class GridNavigator:
         self.ready = True
 
 
+    @metrics.timed('navigate')
     def navigate(self, frame):
 
         if not self.enabled: return
+        if not self.frame_gate.is_new(frame): return
         self.calculate_location(frame)
         
@@ -7,19 +7,25 @@ import torchvision.transforms as transforms
 import numpy as np
 import cv2
 import pickle
-from .light_cnn import LightCNN_9Layers, LightCNN_29Layers, LightCNN_29Layers_v2
+from .models.model_loader import load_embedding_model
+from .gallery.packed_gallery import pack_feature_db, DTYPES, EXTENSION
 
 parser = argparse.ArgumentParser(description='PyTorch LightCNN Feature Extraction')
 parser.add_argument('--arch', '-a', metavar='ARCH', default='LightCNN')
 parser.add_argument('--cuda', '-c', default=False, action='store_true', help='Use CUDA if available')
 parser.add_argument('--resume', default='F:\Python Project\LightCNN\LightCNN_29Layers_checkpoint.pth', type=str, metavar='PATH',
-                    help='Path to the pre-trained checkpoint model')
+                    help='Path to the pre-trained checkpoint model or its inference artifact')
 parser.add_argument('--model', default='LightCNN-29', type=str, metavar='Model', help='Model type: LightCNN-9, LightCNN-29')
 parser.add_argument('--root_path', default='F:\Python Project\eagle-wings-drone-project\tello\drone_project\data\dataset', type=str, metavar='PATH', 
                     help='Root path of face images.')
 parser.add_argument('--save_path', default='F:\Python Project\eagle-wings-drone-project\tello\drone_project\data\extracted_features', type=str, metavar='PATH', 
                     help='Save path for extracted features.')
-parser.add_argument('--num_classes', default=79077, type=int, metavar='N', help='Number of classes for the model.')  # FIXED
+parser.add_argument('--num_classes', default=79077, type=int, metavar='N', help='Unused: features come from the model without its classifier head.')
+parser.add_argument('--format', default='gallery', choices=['gallery', 'feat'],
+                    help='gallery: one packed gallery file, feat: legacy pickled .feat file per image.')
+parser.add_argument('--gallery_path', default='', type=str, metavar='PATH',
+                    help=f'Packed gallery file to write (default: <save_path>{EXTENSION}).')
+parser.add_argument('--gallery_dtype', default='float32', choices=DTYPES, help='Storage type of the packed embeddings.')
 
 def detect_faces(image):
     """Detect faces in the input image using OpenCV Haar Cascade."""
@@ -42,24 +48,13 @@ def save_feature(save_path, person_name, img_name, features):
 def main():
     args = parser.parse_args()
 
-    if args.model == 'LightCNN-9':
-        model = LightCNN_9Layers(num_classes=args.num_classes)
-    elif args.model == 'LightCNN-29':
-        model = LightCNN_29Layers(num_classes=args.num_classes)
-    elif args.model == 'LightCNN-29v2':
-        model = LightCNN_29Layers_v2(num_classes=args.num_classes)
-    else:
-        raise ValueError(f"Invalid model type: {args.model}")
-
     if os.path.isfile(args.resume):
         print(f"Loading checkpoint from '{args.resume}'")
-        checkpoint = torch.load(args.resume, map_location=torch.device('cpu'))
-        state_dict = {k.replace('module.', ''): v for k, v in checkpoint['state_dict'].items()}
-        model.load_state_dict(state_dict)
+        model = load_embedding_model(args.resume, args.model)
     else:
         raise FileNotFoundError(f"No checkpoint found at '{args.resume}'")
 
-    model.eval()
+    feature_db, sources = {}, {}
 
     for person_name in os.listdir(args.root_path):
         person_path = os.path.join(args.root_path, person_name)
@@ -98,11 +93,20 @@ def main():
 
                 start_time = time.time()
                 with torch.no_grad():
-                    _, features = model(input_tensor)
+                    features = model(input_tensor)
                 elapsed_time = time.time() - start_time
 
                 print(f"Processed {img_name} in {elapsed_time:.4f} seconds")
-                save_feature(args.save_path, person_name, img_name, features.cpu().numpy()[0])
+                if args.format == 'feat':
+                    save_feature(args.save_path, person_name, img_name, features.cpu().numpy()[0])
+                else:
+                    feature_db.setdefault(person_name, []).append(features.cpu().numpy()[0])
+                    sources.setdefault(person_name, []).append(f"{person_name}/{img_name}")
+
+    if args.format == 'gallery':
+        gallery_path = args.gallery_path or os.path.normpath(args.save_path) + EXTENSION
+        gallery = pack_feature_db(gallery_path, feature_db, sources, args.gallery_dtype)
+        print(f"Saved {len(gallery)} features of {len(gallery.names)} people to {gallery_path}")
 
 if __name__ == '__main__':
     main()
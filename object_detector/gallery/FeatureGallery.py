@@ -0,0 +1,109 @@
+import numpy as np
+
+
+class FeatureGallery:
+    """
+    Enrolled face templates stored as one contiguous, L2-normalised matrix
+    plus a label index per row, so a whole frame of faces can be matched
+    against the gallery with a single matrix product.
+    """
+
+    EPSILON = 1e-12
+    ANN_MIN_SIZE = 10000  # below this many templates an exact search is fast enough
+
+    def __init__(self, embeddings, labels, names, normalized=False):
+        """
+        embeddings: (T, D) array, one template per row.
+        labels:     (T,) integer array indexing into `names`.
+        names:      identity names, one per label index.
+        normalized: rows are already unit length; float32 C-contiguous input
+                    (e.g. a memory-mapped gallery) is then used without a copy.
+        """
+        self.names = list(names)
+        self.labels = np.ascontiguousarray(labels, dtype=np.int32)
+        if normalized:
+            self.embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        else:
+            self.embeddings = self.normalize(embeddings)
+
+        self.index = None
+        self.ann_min_size = self.ANN_MIN_SIZE
+
+        if len(self.labels) != len(self.embeddings):
+            raise ValueError(f"Got {len(self.embeddings)} embeddings but {len(self.labels)} labels.")
+
+    @classmethod
+    def from_feature_db(cls, feature_db):
+        """Build a gallery from a {person_name: [feature_vectors]} dictionary."""
+        names, labels, rows = [], [], []
+        for person_name, features in feature_db.items():
+            if not len(features):
+                continue
+            label = len(names)
+            names.append(person_name)
+            for feature in features:
+                rows.append(np.asarray(feature, dtype=np.float32).ravel())
+                labels.append(label)
+
+        embeddings = np.stack(rows) if rows else np.zeros((0, 0), dtype=np.float32)
+        return cls(embeddings, labels, names)
+
+    @classmethod
+    def normalize(cls, features):
+        """Return float32, row-wise L2-normalised, C-contiguous copy of `features`."""
+        features = np.atleast_2d(np.asarray(features, dtype=np.float32))
+        norms = np.linalg.norm(features, axis=1, keepdims=True)
+        return np.ascontiguousarray(features / np.maximum(norms, cls.EPSILON))
+
+    def __len__(self):
+        return len(self.embeddings)
+
+    def attach_index(self, index, min_size=None):
+        """
+        Answer searches with an approximate index (e.g. IVFIndex) built over this gallery.
+        Galleries smaller than `min_size` templates keep using the exact search.
+        Raises ValueError when the index was not built over these embeddings.
+        """
+        if len(index) != len(self):
+            raise ValueError(f"Index covers {len(index)} templates but the gallery has {len(self)}.")
+        if index.checksum is None:
+            raise ValueError("Index has no gallery checksum, rebuild it with gallery/build_index.py.")
+        if not index.matches(self.embeddings):
+            raise ValueError("Index was built over a different gallery, rebuild it with gallery/build_index.py.")
+        self.index = index
+        if min_size is not None:
+            self.ann_min_size = min_size
+
+    def search(self, features):
+        """
+        Find the closest template for every row of `features`.
+        Returns (label_indices, cosine_distances); label index is -1 when the gallery is empty.
+        """
+        queries = self.normalize(features)
+
+        if not len(self):
+            return np.full(len(queries), -1, dtype=np.int32), np.full(len(queries), np.inf)
+
+        if self.index is not None and len(self) >= self.ann_min_size:
+            rows, similarities = self.index.search(self.embeddings, queries)
+            labels = np.where(rows >= 0, self.labels[rows], -1)
+            return labels, (1.0 - similarities).astype(np.float64)
+
+        similarities = queries @ self.embeddings.T
+        best = np.argmax(similarities, axis=1)
+        distances = 1.0 - similarities[np.arange(len(queries)), best]
+        return self.labels[best], distances.astype(np.float64)
+
+    def match(self, features, threshold):
+        """
+        Match every row of `features` against the gallery.
+        Returns a list of (name, cosine_distance); the name is "Unknown" when the
+        closest template is `threshold` or further away.
+        """
+        labels, distances = self.search(features)
+
+        matches = []
+        for label, distance in zip(labels, distances):
+            name = self.names[label] if label >= 0 and distance < threshold else "Unknown"
+            matches.append((name, float(distance)))
+        return matches
@@ -0,0 +1,127 @@
+import hashlib
+
+import numpy as np
+
+
+class IVFIndex:
+    """
+    Inverted-file index over an L2-normalised gallery matrix.
+    Templates are grouped by their nearest k-means centroid; a query only scans
+    the `nprobe` groups whose centroids are closest to it. More probes give
+    higher recall at lower speed, nprobe == nlist is an exact search.
+    The index stores row numbers only, the embeddings stay in the gallery, and a checksum
+    of the embeddings it was built over so it cannot be used with a different gallery.
+    """
+
+    EXTENSION = '.ivf.npz'
+
+    def __init__(self, centroids, order, offsets, nprobe=8, checksum=None):
+        """
+        centroids: (nlist, D) unit-length cluster centres.
+        order:     (T,) gallery rows sorted by cluster.
+        offsets:   (nlist + 1,) start of every cluster in `order`.
+        checksum:  IVFIndex.checksum() of the indexed embeddings.
+        """
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.order = np.ascontiguousarray(order, dtype=np.int64)
+        self.offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+        self.nprobe = nprobe
+        self.checksum = checksum
+
+    @property
+    def nlist(self):
+        return len(self.centroids)
+
+    def __len__(self):
+        return len(self.order)
+
+    @staticmethod
+    def embeddings_checksum(embeddings):
+        """Hex digest of an embeddings matrix, as float32 rows."""
+        data = np.ascontiguousarray(embeddings, dtype=np.float32)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(data.shape).encode())
+        digest.update(memoryview(data).cast('B'))
+        return digest.hexdigest()
+
+    def matches(self, embeddings):
+        """True when the index was built over exactly these embeddings."""
+        return (self.checksum is not None and len(self) == len(embeddings)
+                and self.checksum == self.embeddings_checksum(embeddings))
+
+    @classmethod
+    def build(cls, embeddings, nlist=None, iterations=20, sample_size=None, nprobe=8, seed=0):
+        """
+        Cluster the rows of a normalised `embeddings` matrix with spherical k-means.
+        nlist defaults to 4 * sqrt(T); k-means runs on at most `sample_size`
+        rows (default 256 per list) and every row is assigned afterwards.
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        count = len(embeddings)
+        if count == 0:
+            raise ValueError("Cannot build an index over an empty gallery.")
+
+        nlist = min(count, nlist or max(1, int(4 * np.sqrt(count))))
+        rng = np.random.default_rng(seed)
+
+        sample_size = min(count, sample_size or 256 * nlist)
+        sample = embeddings[rng.choice(count, sample_size, replace=False)] if sample_size < count else embeddings
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            assignment = cls._assign(sample, centroids)
+            sizes = np.bincount(assignment, minlength=nlist)
+            sums = np.zeros_like(centroids)
+            filled = sizes > 0
+            sorted_rows = sample[np.argsort(assignment, kind='stable')]
+            sums[filled] = np.add.reduceat(sorted_rows, (np.cumsum(sizes) - sizes)[filled])
+
+            empty = ~filled
+            if empty.any():
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()), replace=False)]
+            centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+
+        assignment = cls._assign(embeddings, centroids)
+        order = np.argsort(assignment, kind='stable')
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=nlist))])
+        return cls(centroids, order, offsets, nprobe, cls.embeddings_checksum(embeddings))
+
+    @staticmethod
+    def _assign(embeddings, centroids, chunk=65536):
+        return np.concatenate([np.argmax(embeddings[i:i + chunk] @ centroids.T, axis=1)
+                               for i in range(0, len(embeddings), chunk)])
+
+    def search(self, embeddings, queries, nprobe=None):
+        """
+        Find the most similar gallery row for every (normalised) query.
+        Returns (row_indices, similarities).
+        """
+        nprobe = min(self.nlist, nprobe or self.nprobe)
+        queries = np.atleast_2d(queries)
+
+        probes = np.argpartition(-(queries @ self.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+
+        rows = np.empty(len(queries), dtype=np.int64)
+        similarities = np.empty(len(queries), dtype=np.float32)
+        for i, (query, lists) in enumerate(zip(queries, probes)):
+            candidates = np.concatenate([self.order[self.offsets[l]:self.offsets[l + 1]] for l in lists])
+            if not len(candidates):
+                rows[i], similarities[i] = -1, -np.inf
+                continue
+            scores = embeddings[candidates] @ query
+            best = np.argmax(scores)
+            rows[i], similarities[i] = candidates[best], scores[best]
+        return rows, similarities
+
+    def save(self, path):
+        """Write the index to a .npz file (no pickled objects); numpy appends .npz if missing."""
+        np.savez(path, centroids=self.centroids, order=self.order, offsets=self.offsets, nprobe=self.nprobe,
+                 checksum=self.checksum or '')
+
+    @classmethod
+    def load(cls, path, nprobe=None):
+        """Indexes written before checksums were stored load with checksum None."""
+        with np.load(path, allow_pickle=False) as data:
+            checksum = str(data['checksum']) if 'checksum' in data.files else ''
+            return cls(data['centroids'], data['order'], data['offsets'], nprobe or int(data['nprobe']),
+                       checksum or None)
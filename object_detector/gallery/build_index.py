@@ -0,0 +1,28 @@
+import argparse
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+import time
+
+from object_detector.gallery.packed_gallery import load_packed_gallery
+from object_detector.gallery.IVFIndex import IVFIndex
+
+parser = argparse.ArgumentParser(description='Build an IVF index for a packed gallery file')
+parser.add_argument('--gallery', required=True, type=str, metavar='PATH', help='Packed gallery file.')
+parser.add_argument('--output', default='', type=str, metavar='PATH', help=f'Index file to write (default: <gallery>{IVFIndex.EXTENSION}).')
+parser.add_argument('--nlist', default=0, type=int, help='Number of k-means lists (default: 4 * sqrt(templates)).')
+parser.add_argument('--nprobe', default=8, type=int, help='Default number of lists scanned per query.')
+parser.add_argument('--iterations', default=20, type=int, help='k-means iterations.')
+
+
+def main():
+    args = parser.parse_args()
+    output = args.output or args.gallery + IVFIndex.EXTENSION
+
+    gallery = load_packed_gallery(args.gallery)
+    start_time = time.time()
+    index = IVFIndex.build(gallery.embeddings, args.nlist or None, args.iterations, nprobe=args.nprobe)
+    index.save(output)
+    print(f"Indexed {len(index)} templates into {index.nlist} lists in {time.time() - start_time:.2f} seconds, saved to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+import argparse
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+import time
+
+from object_detector.gallery.packed_gallery import read_feature_dir, pack_feature_db, load_packed_gallery, DTYPES, EXTENSION
+
+parser = argparse.ArgumentParser(description='Convert a per-image .feat feature tree into a packed gallery file')
+parser.add_argument('--feature_dir', required=True, type=str, metavar='PATH', help='Directory of <person>/<image>.feat files.')
+parser.add_argument('--output', default='', type=str, metavar='PATH', help=f'Gallery file to write (default: <feature_dir>{EXTENSION}).')
+parser.add_argument('--dtype', default='float32', choices=DTYPES, help='Storage type of the embeddings.')
+
+
+def main():
+    args = parser.parse_args()
+    output = args.output or os.path.normpath(args.feature_dir) + EXTENSION
+
+    start_time = time.time()
+    feature_db, sources = read_feature_dir(args.feature_dir)
+    gallery = pack_feature_db(output, feature_db, sources, args.dtype)
+    print(f"Packed {len(gallery)} templates of {len(gallery.names)} people into {output} in {time.time() - start_time:.2f} seconds")
+
+    start_time = time.time()
+    load_packed_gallery(output)
+    print(f"Packed gallery loads in {(time.time() - start_time) * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Single-file gallery format.
+
+    [ header | manifest (JSON) | labels (int32) | embeddings (float32/float16) ]
+
+The header is MAGIC, format version and manifest length. Labels and embeddings
+start on ALIGNMENT byte boundaries so both can be memory-mapped in place.
+Embeddings are stored L2-normalised, one row per template.
+"""
+
+import json
+import os
+import struct
+
+import numpy as np
+
+from .FeatureGallery import FeatureGallery
+
+MAGIC = b'EWGALLRY'
+VERSION = 1
+ALIGNMENT = 64
+HEADER = struct.Struct('<8sII')  # magic, version, manifest length
+DTYPES = ('float32', 'float16')
+EXTENSION = '.gallery'
+
+
+class GalleryFormatError(Exception):
+    """Raised when a file is not a valid packed gallery."""
+    pass
+
+
+def _aligned(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_packed_gallery(path, embeddings, labels, names, dtype='float32', sources=None):
+    """
+    Write templates to a packed gallery file at `path`.
+    embeddings: (T, D) array, labels: (T,) indices into `names`,
+    sources: optional list of T strings recording where each template came from.
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"Unsupported gallery dtype {dtype}, expected one of {DTYPES}.")
+
+    embeddings = FeatureGallery.normalize(embeddings).astype(dtype) if len(embeddings) else np.zeros((0, 0), dtype=dtype)
+    labels = np.ascontiguousarray(labels, dtype=np.int32)
+    if len(labels) != len(embeddings):
+        raise ValueError(f"Got {len(embeddings)} embeddings but {len(labels)} labels.")
+
+    manifest = {
+        'version': VERSION,
+        'count': int(embeddings.shape[0]),
+        'dim': int(embeddings.shape[1]),
+        'dtype': dtype,
+        'normalized': True,
+        'names': list(names),
+        'sources': list(sources) if sources is not None else None,
+    }
+
+    # Offsets depend on the manifest length, which depends on the offsets: iterate until they settle.
+    labels_offset = embeddings_offset = 0
+    while True:
+        manifest.update(labels_offset=labels_offset, embeddings_offset=embeddings_offset)
+        manifest_bytes = json.dumps(manifest).encode('utf-8')
+        new_labels_offset = _aligned(HEADER.size + len(manifest_bytes))
+        new_embeddings_offset = _aligned(new_labels_offset + labels.nbytes)
+        if (new_labels_offset, new_embeddings_offset) == (labels_offset, embeddings_offset):
+            break
+        labels_offset, embeddings_offset = new_labels_offset, new_embeddings_offset
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(manifest_bytes)))
+        f.write(manifest_bytes)
+        f.write(b'\0' * (labels_offset - f.tell()))
+        f.write(labels.tobytes())
+        f.write(b'\0' * (embeddings_offset - f.tell()))
+        f.write(np.ascontiguousarray(embeddings).tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_manifest(path):
+    """Return the manifest dictionary of a packed gallery file."""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise GalleryFormatError(f"{path} is too short to be a packed gallery.")
+        magic, version, manifest_len = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise GalleryFormatError(f"{path} is not a packed gallery.")
+        if version != VERSION:
+            raise GalleryFormatError(f"{path} has gallery format version {version}, expected {VERSION}.")
+        return json.loads(f.read(manifest_len).decode('utf-8'))
+
+
+def load_packed_gallery(path, mmap=True):
+    """
+    Load a packed gallery file into a FeatureGallery.
+    With mmap=True float32 embeddings are used straight from the mapped file
+    without a copy; float16 embeddings are widened to float32 once at load.
+    """
+    manifest = read_manifest(path)
+    count, dim = manifest['count'], manifest['dim']
+
+    if count == 0:
+        return FeatureGallery(np.zeros((0, dim), dtype=np.float32), [], manifest['names'])
+
+    if mmap:
+        labels = np.memmap(path, dtype=np.int32, mode='r', offset=manifest['labels_offset'], shape=(count,))
+        embeddings = np.memmap(path, dtype=manifest['dtype'], mode='r', offset=manifest['embeddings_offset'], shape=(count, dim))
+    else:
+        with open(path, 'rb') as f:
+            f.seek(manifest['labels_offset'])
+            labels = np.fromfile(f, dtype=np.int32, count=count)
+            f.seek(manifest['embeddings_offset'])
+            embeddings = np.fromfile(f, dtype=manifest['dtype'], count=count * dim).reshape(count, dim)
+
+    return FeatureGallery(embeddings, labels, manifest['names'], normalized=manifest['normalized'])
+
+
+def read_feature_dir(feature_dir):
+    """
+    Read the legacy per-image pickled .feat tree (feature_dir/<person>/<image>.feat).
+    Returns ({person_name: [feature_vectors]}, {person_name: [file_names]}).
+    Only meant for converting old galleries: pickle files can execute code on load.
+    """
+    import pickle
+
+    feature_db, sources = {}, {}
+    for folder in sorted(os.listdir(feature_dir)):
+        person_dir = os.path.join(feature_dir, folder)
+        if os.path.isdir(person_dir):
+            feature_db[folder], sources[folder] = [], []
+            for file in sorted(os.listdir(person_dir)):
+                if file.endswith('.feat'):
+                    with open(os.path.join(person_dir, file), 'rb') as f:
+                        feature_db[folder].append(pickle.load(f))
+                    sources[folder].append(f"{folder}/{file}")
+    return feature_db, sources
+
+
+def pack_feature_db(path, feature_db, sources=None, dtype='float32'):
+    """Write a {person_name: [feature_vectors]} dictionary as a packed gallery file."""
+    gallery = FeatureGallery.from_feature_db(feature_db)
+    row_sources = [source for name in gallery.names for source in sources[name]] if sources else None
+    write_packed_gallery(path, gallery.embeddings, gallery.labels, gallery.names, dtype, row_sources)
+    return gallery
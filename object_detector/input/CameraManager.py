@@ -0,0 +1,191 @@
+import threading
+import time
+
+
+class CameraManager:
+    """
+    Watches the interface's primary camera and keeps a standby camera open and warm,
+    so losing the primary (the drone dropping) costs a fraction of a second instead of a
+    5 s poll followed by a cold camera open.
+
+    Call check() from the main loop: the primary counts as lost when it reports
+    is_connected == False or when its newest frame is older than `stale_after` seconds
+    (`startup_grace` seconds while it has not delivered a first frame yet).
+    A stalled primary is not given up: while the standby is in use the primary is polled
+    every `recover_interval` seconds, and once it has delivered fresh frames for
+    `recover_after` seconds the interface switches back to it. Only a primary reporting
+    is_connected == False stays lost.
+    The standby is opened on a background thread at start (retried every `retry_interval`
+    seconds when that fails) and kept streaming by grabbing (not decoding) a frame every
+    `keep_warm_interval` seconds. On a switch its driver buffer is flushed and it starts
+    threaded capture, when it supports that; on the switch back it stops it again.
+    """
+
+    def __init__(self, primary, interface, standby_factory, stale_after=3.0, startup_grace=10.0,
+                 keep_warm_interval=0.5, on_switch=None, recover_interval=0.5, recover_after=1.0,
+                 retry_interval=5.0):
+        """
+        standby_factory() opens the standby camera; on_switch(camera) is called after the
+        interface was switched to it (the standby, or the primary again).
+        """
+        self.primary = primary
+        self.interface = interface
+        self.standby_factory = standby_factory
+        self.stale_after = stale_after
+        self.startup_grace = startup_grace
+        self.keep_warm_interval = keep_warm_interval
+        self.on_switch = on_switch
+        self.recover_interval = recover_interval
+        self.recover_after = recover_after
+        self.retry_interval = retry_interval
+
+        self.camera = primary
+        self.standby = None
+        self.switched_at = None
+        self.switches = 0
+        self.started_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._running = True
+        self._waiting_reported = False
+        self._next_poll = 0.0
+        self._fresh_since = None
+        self._thread = threading.Thread(target=self._keep_warm, daemon=True, name="camera-standby")
+        self._thread.start()
+
+    def _keep_warm(self):
+        """Open the standby (retrying until it opens), then keep it streaming while it is idle."""
+        while self._running:
+            if self.standby is None:
+                try:
+                    standby = self.standby_factory()
+                except Exception as e:
+                    print(f"[CameraManager] Could not open standby camera: {e}")
+                    self._sleep(self.retry_interval)
+                    continue
+                with self._lock:
+                    self.standby = standby
+                print(f"[CameraManager] Standby camera {type(standby).__name__} ready")
+
+            with self._lock:
+                if not self._running:
+                    return
+                if self.camera is not self.standby and hasattr(self.standby, 'grab'):
+                    try:
+                        self.standby.grab()
+                    except Exception as e:
+                        print(f"[CameraManager] Standby camera error: {e}")
+            self._sleep(self.keep_warm_interval)
+
+    def _sleep(self, seconds):
+        end = time.monotonic() + seconds
+        while self._running and time.monotonic() < end:
+            time.sleep(min(0.1, end - time.monotonic()))
+
+    @property
+    def primary_disconnected(self):
+        """The primary reports it is gone for good (not just stalled)."""
+        return getattr(self.primary, 'is_connected', True) is False
+
+    def primary_lost(self):
+        if self.primary_disconnected:
+            return True
+        timestamp = getattr(self.primary, 'timestamp', None)
+        if timestamp is None:
+            return time.monotonic() - self.started_at > self.startup_grace
+        return time.monotonic() - timestamp > self.stale_after
+
+    def check(self):
+        """Switch to the standby when the primary is lost, and back once it recovers. Returns the camera in use."""
+        if self.camera is self.primary:
+            if self.primary_lost():
+                self.switch()
+        elif self.primary_recovered():
+            self.switch_back()
+        return self.camera
+
+    def primary_recovered(self):
+        """Poll the idle primary; True once it has delivered fresh frames for recover_after seconds."""
+        now = time.monotonic()
+        if self.primary_disconnected or now < self._next_poll:
+            return False
+        self._next_poll = now + self.recover_interval
+        try:
+            self.primary.frame()  # cameras stamp timestamp when they see a new frame
+        except Exception:
+            self._fresh_since = None
+            return False
+
+        timestamp = getattr(self.primary, 'timestamp', None)
+        fresh = timestamp is not None and timestamp > self.switched_at and now - timestamp <= self.stale_after
+        if not fresh:
+            self._fresh_since = None
+            return False
+        if self._fresh_since is None:
+            self._fresh_since = now
+        return now - self._fresh_since >= self.recover_after
+
+    def switch(self):
+        """
+        Hand the standby to the interface. While it is still opening this does nothing:
+        the primary stays in place and the next check() tries again.
+        """
+        with self._lock:
+            if self.camera is not self.primary:
+                return self.camera
+            standby = self.standby
+            if standby is None:
+                if not self._waiting_reported:
+                    print("[CameraManager] Primary camera lost, waiting for the standby camera to open")
+                    self._waiting_reported = True
+                return self.camera
+
+            try:
+                if hasattr(standby, 'flush'):
+                    standby.flush()  # frames the driver buffered between keep-warm grabs are stale
+                if hasattr(standby, 'start_threaded'):
+                    standby.start_threaded()
+            except Exception as e:
+                print(f"[CameraManager] Could not switch to the standby camera: {e}")
+                return self.camera
+            self.camera = standby
+            self.switched_at = time.monotonic()
+            self.switches += 1
+            self._waiting_reported = False
+            self._fresh_since = None
+
+        self.interface.set_camera(standby)
+        reason = "disconnected" if self.primary_disconnected else "stalled"
+        print(f"[CameraManager] Primary camera {reason}, switched to {type(standby).__name__}")
+        if self.on_switch:
+            self.on_switch(standby)
+        return standby
+
+    def switch_back(self):
+        """Hand the recovered primary back to the interface; the standby stays open and warm."""
+        with self._lock:
+            if self.camera is self.primary:
+                return self.camera
+            standby = self.camera
+            self.camera = self.primary
+            self.switched_at = time.monotonic()
+            self.switches += 1
+
+        self.interface.set_camera(self.primary)
+        if hasattr(standby, 'stop_threaded'):
+            try:
+                standby.stop_threaded()  # back to grab() keep-alive instead of decoding every frame
+            except Exception as e:
+                print(f"[CameraManager] Could not stop the standby camera's capture thread: {e}")
+        print(f"[CameraManager] Primary camera recovered, switched back to {type(self.primary).__name__}")
+        if self.on_switch:
+            self.on_switch(self.primary)
+        return self.primary
+
+    def stop(self):
+        """Stop keeping the standby warm and close it unless it is the camera in use."""
+        self._running = False
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        with self._lock:
+            if self.standby is not None and self.standby is not self.camera and hasattr(self.standby, 'stop'):
+                self.standby.stop()
@@ -0,0 +1,242 @@
+import glob
+import queue
+import threading
+import time
+import cv2
+import sys, os; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from core.Camera import CameraInitializationError, FrameCaptureError
+from core.Frame import Frame
+from core.Metrics import metrics
+
+
+class FileCam:
+    """
+    Camera replaying a video file or an image sequence (a directory of images, a glob pattern,
+    or a printf pattern like frames/%04d.png), for reproducible runs without a drone or webcam.
+
+    pacing:
+      'realtime'     frames come out at their timestamps in the file, like a live camera:
+                     a reader that falls behind misses frames (counted in `dropped`)
+      'fixed'        the same at `fps` frames per second
+      'unthrottled'  every frame, in order, as fast as the reader takes them
+    Frames are decoded ahead on a background thread (up to `prefetch` of them), so decoding is
+    not part of what the reader measures. loop=True starts over at the end of the file instead
+    of raising FrameCaptureError.
+    """
+
+    SOURCE = 'file'
+    PACINGS = ('realtime', 'fixed', 'unthrottled')
+    IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff', '.webp')
+    DEFAULT_FPS = 30.0
+
+    threaded = True  # read(wait_new=True) blocks until the next frame is due
+
+    def __init__(self, source, pacing='realtime', fps=None, loop=False, prefetch=8, auto_start=True):
+        """fps: rate of 'fixed' pacing, and of image sequences (default: the video's rate, or 30)."""
+        if pacing not in self.PACINGS:
+            raise ValueError(f"Unknown pacing {pacing}, expected one of {', '.join(self.PACINGS)}.")
+        self.source = source
+        self.pacing = pacing
+        self.fps = fps
+        self.loop = loop
+        self.prefetch = prefetch
+
+        self.sequence = 0        # number of the last frame returned, counting dropped ones
+        self.timestamp = None    # time.monotonic() the frame was due (delivered, when unthrottled)
+        self.position = None     # its time in the file, in seconds
+        self.dropped = 0
+        self.skipped = 0         # unreadable images left out of an image sequence
+        self.is_opened = False
+
+        self._images = None
+        self._frames = queue.Queue(maxsize=max(1, prefetch))
+        self._thread = None
+        self._running = False
+        self._lock = threading.Lock()
+        self._next = None        # decoded frame waiting for its due time
+        self._current = None     # (image, index, position, due) of the newest due frame
+        self._delivered = False
+        self._clock = None       # monotonic time of position 0 / index 0
+
+        if auto_start:
+            self.start()
+
+    def start(self):
+        """Opens the source and starts decoding ahead."""
+        if self.is_opened:
+            return
+        self._images = self._image_files()
+        if self._images is None:
+            capture = cv2.VideoCapture(self.source)
+            opened = capture.isOpened()
+            file_fps = capture.get(cv2.CAP_PROP_FPS)
+            capture.release()
+            if not opened:
+                raise CameraInitializationError(f"Unable to open video file {self.source}")
+            self.rate = self.fps or (file_fps if file_fps and file_fps < 1000 else self.DEFAULT_FPS)
+        elif not self._images:
+            raise CameraInitializationError(f"No images found for {self.source}")
+        else:
+            self.rate = self.fps or self.DEFAULT_FPS
+
+        self.is_opened = True
+        self._running = True
+        self._thread = threading.Thread(target=self._decode_loop, daemon=True, name="filecam-decoder")
+        self._thread.start()
+
+    def _image_files(self):
+        """Sorted image paths for a directory or glob source, None for a video (or printf pattern)."""
+        if os.path.isdir(self.source):
+            return sorted(os.path.join(self.source, name) for name in os.listdir(self.source)
+                          if name.lower().endswith(self.IMAGE_EXTENSIONS))
+        if glob.has_magic(self.source):
+            return sorted(glob.glob(self.source))
+        return None
+
+    def _decode(self):
+        """Yields (image, position in seconds) for one pass over the source."""
+        if self._images is not None:
+            for index, path in enumerate(self._images):
+                image = cv2.imread(path, cv2.IMREAD_COLOR)
+                if image is None:
+                    self.skipped += 1
+                    metrics.count('filecam.skipped')
+                    continue
+                yield image, index / self.rate
+            return
+
+        capture = cv2.VideoCapture(self.source)
+        index, last = 0, -1.0
+        try:
+            while self._running:
+                ok, image = capture.read()
+                if not ok:
+                    return
+                position = capture.get(cv2.CAP_PROP_POS_MSEC) / 1000
+                if position <= last:  # container without usable timestamps
+                    position = index / self.rate
+                last = position
+                index += 1
+                yield image, position
+        finally:
+            capture.release()
+
+    def _decode_loop(self):
+        offset = 0.0
+        while self._running:
+            position = None
+            for image, position in self._decode():
+                if not self._put((image, offset + position)):
+                    return
+            if not self.loop or position is None:
+                self._put(None)  # end of file
+                return
+            offset += position + 1.0 / self.rate
+
+    def _put(self, item):
+        while self._running:
+            try:
+                self._frames.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _take(self, block=True):
+        """
+        The next decoded (image, position), waiting for the decoder unless block is False
+        (then None when it is behind); raises at the end of the file.
+        """
+        if not self.is_opened:
+            raise FrameCaptureError("Camera not initialized or is already closed.")
+        if self._next is None:
+            try:
+                item = self._frames.get(block=block)
+            except queue.Empty:
+                return None
+            if item is None:
+                if not self.is_opened:  # woken by stop()
+                    raise FrameCaptureError("Camera not initialized or is already closed.")
+                self._frames.put(None)  # keep reporting the end
+                raise FrameCaptureError(f"End of {self.source}")
+            self._next = item
+        return self._next
+
+    def _due(self, index, position):
+        if self.pacing == 'fixed':
+            return self._clock + index / self.rate
+        return self._clock + position
+
+    @metrics.timed('capture')
+    def read(self, wait_new=False, timeout=None):
+        """
+        Returns (frame, sequence, timestamp); frame is a core.Frame.
+        Paced: the newest frame that is due, waiting for the next one with wait_new (or when
+        there is none yet). With a timeout, wait_new waits at most that long and then returns
+        the last frame again. Unthrottled: the next frame in the file.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            if self.pacing == 'unthrottled':
+                image, position = self._take()
+                self._next = None
+                self._deliver(image, self.sequence + 1, position, time.monotonic())
+                return Frame(image, self.sequence, self.timestamp, self.SOURCE), self.sequence, self.timestamp
+
+            while True:
+                pending = self._current is not None and not self._delivered
+                try:
+                    item = self._take(block=not pending)
+                except FrameCaptureError:
+                    if not pending:
+                        raise
+                    break  # the last frame is due
+                if item is None:
+                    break  # the decoder is behind, the pending frame is the newest
+                image, position = item
+                index = self._current[1] + 1 if self._current else 0
+                if self._clock is None:
+                    self._clock = time.monotonic() - (0.0 if self.pacing == 'fixed' else position)
+                due = self._due(index, position)
+                now = time.monotonic()
+                if due <= now:
+                    if self._current is not None and not self._delivered:
+                        self.dropped += 1  # superseded before anyone read it
+                    self._current, self._delivered, self._next = (image, index, position, due), False, None
+                    continue
+                if pending or (self._current is not None and not wait_new):
+                    break
+                if deadline is not None and self._current is not None and due > deadline:
+                    time.sleep(max(0.0, deadline - now))
+                    break  # nothing new in time, the last frame again
+                time.sleep(due - now)
+
+            image, index, position, due = self._current
+            if self._delivered:
+                image = image.copy()  # the reader may have drawn on the first one
+            self._delivered = True
+            self._deliver(image, index + 1, position, due)
+            return Frame(image, self.sequence, self.timestamp, self.SOURCE), self.sequence, self.timestamp
+
+    def _deliver(self, image, sequence, position, timestamp):
+        self.sequence, self.position, self.timestamp = sequence, position, timestamp
+
+    def frame(self):
+        """The current frame (see read())."""
+        return self.read()[0]
+
+    def stop(self):
+        """Stops decoding and releases the file."""
+        self.is_opened = False
+        self._running = False
+        while True:
+            try:
+                self._frames.get_nowait()
+            except queue.Empty:
+                break
+        try:
+            self._frames.put_nowait(None)  # wakes a reader waiting for the decoder
+        except queue.Full:
+            pass
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
@@ -2,34 +2,93 @@ import asyncio
 import websockets
 import threading
 import json
+import struct
+import time
 import cv2
 import numpy as np
-from PIL import Image
-import io
+import sys, os; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from core.Frame import Frame
+from core.Metrics import metrics
+
+# Binary protocol: every message starts with HEADER.
+#   magic, version, message type, flags (unused), request id, simulator timestamp (ns)
+# HELLO   (sim -> cam) switches the connection to the binary protocol.
+# REQUEST (cam -> sim) asks for one frame; up to max_in_flight requests are outstanding.
+# FRAME   (sim -> cam) answers a request; the header is followed by the encoded (JPEG/PNG) image.
+# Simulators that send the text message '1' instead of HELLO get the legacy JSON protocol.
+HEADER = struct.Struct('<4sBBHIQ')
+MAGIC = b'EWSC'
+VERSION = 1
+HELLO, REQUEST, FRAME = 0, 1, 2
+
+
+def pack_header(message_type, request_id=0, timestamp_ns=0):
+    return HEADER.pack(MAGIC, VERSION, message_type, 0, request_id, timestamp_ns)
+
+
+def unpack_header(message):
+    """Returns (message_type, request_id, timestamp_ns), or None when `message` is not a binary protocol message."""
+    if not isinstance(message, (bytes, bytearray, memoryview)) or len(message) < HEADER.size:
+        return None
+    magic, version, message_type, _, request_id, timestamp_ns = HEADER.unpack_from(message)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return message_type, request_id, timestamp_ns
+
+
+def decode_image(data):
+    """Decode JPEG/PNG bytes straight to a BGR array; None when they are not an image."""
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
 
 class SimCam:
 
-    def __init__(self, run_on_start=True, host="127.0.0.1", port=8091):
+    SOURCE = 'sim'
+
+    def __init__(self, run_on_start=True, host="127.0.0.1", port=8091, max_in_flight=2, request_timeout=1.0):
+        """
+        Websocket server the simulator connects to.
+        max_in_flight: frame requests kept outstanding with the binary protocol, so the
+        simulator renders the next frame while the previous one is sent and decoded.
+        request_timeout: seconds after which an unanswered request is given up as lost
+        and requested again.
+        """
         self.connection = None
         self.loop = asyncio.new_event_loop()
+        self.thread = None
+        self.server_task = None
         self.lock = threading.Lock()
         self.host = host
         self.port = port
+        self.max_in_flight = max(1, max_in_flight)
+        self.request_timeout = request_timeout
+        self.lost_requests = 0
         self.latest_frame = None
         self.frame_in_process = False
 
+        self.sequence = 0          # frames received
+        self.timestamp = None      # time.monotonic() when the latest frame was decoded
+        self.decode_seconds = 0.0  # total time spent in cv2.imdecode
+        self.binary = False        # protocol of the current connection
+
         if run_on_start:
             self.start_server()
-            self.run_background_process()
 
     def start_server(self):
-        thread = threading.Thread(target=self.run_server)
-        thread.daemon = True
-        thread.start()
+        self.server_task = self.loop.create_task(self.run_websocket_server())
+        self.thread = threading.Thread(target=self.run_server)
+        self.thread.daemon = True
+        self.thread.start()
 
     def run_server(self):
         asyncio.set_event_loop(self.loop)
-        self.loop.run_until_complete(self.run_websocket_server())
+        try:
+            self.loop.run_until_complete(self.server_task)
+        except asyncio.CancelledError:
+            pass  # exit()
+        finally:
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
 
     async def run_websocket_server(self):
         async with websockets.serve(self.handle_connection, self.host, self.port):
@@ -38,20 +97,81 @@ class SimCam:
 
     async def connect(self, websocket):
         self.connection = websocket
+        self.binary = False
         print("SimCamera connected.")
-        await self.send_message({"status": "connected"})
+        await self.send_message({"status": "connected", "protocol": VERSION})
 
-    async def handle_connection(self, websocket, path):
+    async def handle_connection(self, websocket, path=None):
+        # `path` is only passed by websockets < 13.
         await self.connect(websocket)
         try:
             async for message in websocket:
+                header = unpack_header(message)
                 if message == '1':
                     await self.request_and_process_frame()
+                elif header is not None and header[0] == HELLO:
+                    await self.stream_frames(websocket)
+                    break
+        except websockets.ConnectionClosed:
+            pass
         except Exception as e:
             print(f"Error: {e}")
         finally:
             await self.end()
 
+    async def stream_frames(self, websocket):
+        """
+        Binary protocol: keep max_in_flight requests outstanding and decode frames as they arrive.
+        The simulator answers in order, so a reply also settles every older request as lost; a
+        request unanswered for request_timeout seconds is given up on its own.
+        """
+        self.binary = True
+        in_flight = {}  # request id -> time.monotonic() it was sent
+        next_id = 0
+
+        while True:
+            while len(in_flight) < self.max_in_flight:
+                next_id += 1
+                in_flight[next_id] = time.monotonic()
+                await websocket.send(pack_header(REQUEST, next_id))
+
+            oldest = min(in_flight.values())
+            try:
+                message = await asyncio.wait_for(websocket.recv(), max(0.0, oldest + self.request_timeout - time.monotonic()))
+            except asyncio.TimeoutError:
+                expired = [request for request, sent in in_flight.items()
+                           if time.monotonic() - sent >= self.request_timeout]
+                for request in expired:
+                    del in_flight[request]
+                self.lost_requests += len(expired)
+                print(f"SimCamera got no frame for {self.request_timeout}s, requesting again.")
+                continue
+            header = unpack_header(message)
+            if header is None or header[0] != FRAME:
+                print("SimCamera ignored a non-frame message.")
+                continue
+
+            answered = header[1]
+            skipped = [request for request in in_flight if request < answered]
+            for request in skipped:
+                del in_flight[request]
+            self.lost_requests += len(skipped)
+            in_flight.pop(answered, None)
+            self.store_frame(memoryview(message)[HEADER.size:])
+
+    def store_frame(self, data):
+        start = time.perf_counter()
+        frame = decode_image(data)
+        self.decode_seconds += time.perf_counter() - start
+
+        if frame is None:
+            print("SimCamera could not decode frame data.")
+            return
+        with self.lock:
+            self.latest_frame = frame
+            self.sequence += 1
+            self.timestamp = time.monotonic()
+
     async def request_and_process_frame(self):
         if self.frame_in_process:
             print("Frame request is already in process.")
@@ -64,12 +184,7 @@ class SimCam:
 
             frame_data = await self.receive_frame_data()
             if frame_data:
-                image = Image.open(io.BytesIO(frame_data))
-                processed_frame = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-
-                with self.lock:
-                    self.latest_frame = processed_frame
-
+                self.store_frame(frame_data)
             else:
                 print("No frame data received.")
 
@@ -96,26 +211,21 @@ class SimCam:
         if self.connection:
             await self.connection.send(json.dumps(message))
 
-    def run_background_process(self):
-        threading.Thread(target=self.background_process, daemon=True).start()
-
-    def background_process(self):
-        asyncio.set_event_loop(self.loop)
-        asyncio.create_task(self.send_and_receive_frames())
-
-    async def send_and_receive_frames(self):
-        while True:
-            await self.send_request_for_frame()  # Replace with your actual logic to send '1'
-            frame = await self.wait_for_frame()  # Replace with your actual logic for receiving the frame
-            self.latest_frame = self.process_frame(frame)  # Implement your frame processing logic here
-
-    def frame(self):
+    @metrics.timed('capture')
+    def read(self):
+        """Returns (frame, sequence, timestamp) for the latest frame; sequence is 0 before the first one."""
         with self.lock:
-            if self.latest_frame is not None:
-                return self.latest_frame
-            else:
-                return np.zeros((480, 640, 3), dtype=np.uint8)
+            if self.latest_frame is None:
+                return np.zeros((480, 640, 3), dtype=np.uint8), 0, None
+            # A copy, so listeners drawing on it do not draw on the next frame() of the same frame.
+            return Frame(self.latest_frame.copy(), self.sequence, self.timestamp, self.SOURCE), self.sequence, self.timestamp
 
-    def exit(self):
-        if self.loop:
-            self.loop.call_soon_threadsafe(self.loop.stop)
+    def frame(self):
+        return self.read()[0]
+
+    def exit(self, timeout=2.0):
+        """Close the connection and the server, and wait for the server thread to finish."""
+        if self.server_task is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.server_task.cancel)
+        if self.thread is not None:
+            self.thread.join(timeout)
@@ -2,14 +2,35 @@ from djitellopy import Tello
 import numpy as np
 import cv2
 import time
+import sys, os; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from core.Frame import Frame
+from core.Metrics import metrics
 
 class TelloCam:
-    def __init__(self, tello: Tello):
+    FRAME_SHAPE = (720, 960, 3)
+    SOURCE = 'tello'
+
+    def __init__(self, tello: Tello, output_buffers=3):
+        """
+        frame() converts into preallocated buffers: the RGB conversion is only redone when
+        djitellopy publishes a new frame, and every call copies it into the next of
+        `output_buffers` reused output arrays, so listeners drawing on a frame never touch
+        the cached conversion. A returned frame stays valid for output_buffers - 1 more calls.
+        sequence/timestamp identify the source frame: repeated calls on an unchanged
+        stream return the same sequence number, and real frames are returned as core.Frame.
+        """
         self.tello = tello
         self.frame_read = None
         self.is_connected = True
         self.last_frame_time = time.time()
         self.connection_timeout = 30.0  # Increased to 30 seconds timeout
+
+        self.sequence = 0       # bumped for every new frame djitellopy decodes
+        self.timestamp = None   # time.monotonic() when it was first seen
+        self._source = None     # last frame_read.frame converted
+        self._converted = np.zeros(self.FRAME_SHAPE, dtype=np.uint8)
+        self._outputs = [np.zeros(self.FRAME_SHAPE, dtype=np.uint8) for _ in range(max(1, output_buffers))]
+        self._next_output = 0
         
         try:
             self.frame_read = tello.get_frame_read()
@@ -26,27 +47,57 @@ class TelloCam:
             self.frame_read = None
             self.is_connected = False
 
+    def _output(self, source=None):
+        """Next reused output buffer, filled with `source` (black when None)."""
+        output = self._outputs[self._next_output]
+        self._next_output = (self._next_output + 1) % len(self._outputs)
+        if source is None:
+            output.fill(0)
+            return output
+        if output.shape != source.shape:
+            output = self._outputs[self._next_output - 1] = np.empty_like(source)
+        np.copyto(output, source)
+        return output
+
+    def _convert(self, source):
+        """Convert a new djitellopy frame into the cached RGB buffer."""
+        if self._converted.shape != source.shape:
+            self._converted = np.empty_like(source)
+        cv2.cvtColor(source, cv2.COLOR_BGR2RGB, dst=self._converted)
+        self._source = source
+        self.sequence += 1
+        self.timestamp = time.monotonic()
+
+    def read(self):
+        """Returns (frame, sequence, timestamp); sequence is 0 until the first real frame."""
+        frame = self.frame()
+        return frame, self.sequence, self.timestamp
+
+    def _tag(self, output):
+        return Frame(output, self.sequence, self.timestamp, self.SOURCE)
+
+    @metrics.timed('capture')
     def frame(self):
-        frame = np.zeros((720, 960, 3), dtype=np.uint8)
-        
         if not self.is_connected:
-            return frame
+            return self._output()
             
         try:
             current_time = time.time()
             if current_time - self.last_frame_time > self.connection_timeout:
                 print("[TelloCam] Connection timeout detected")
                 self.is_connected = False
-                return frame
+                return self._output()
             
             if self.frame_read is None:
-                return frame
+                return self._output()
                 
-            frame = self.frame_read.frame
+            source = self.frame_read.frame
             
-            if frame is not None:
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                self.last_frame_time = current_time  # Update last successful frame time
+            if source is not None:
+                if source is not self._source:  # djitellopy publishes a new array per decoded frame
+                    self._convert(source)
+                    self.last_frame_time = current_time  # Update last successful frame time
+                return self._tag(self._output(self._converted))
             else:
                 print("[TelloCam] Received None frame")
                 if current_time - self.last_frame_time > 10.0:  # 10 seconds without valid frame
@@ -57,7 +108,7 @@ class TelloCam:
             print(f"[TelloCam] Error getting frame: {e}")
             self.is_connected = False
 
-        return frame
+        return self._output()
 
     def stop(self):
         """Gracefully stop the TelloCam and release resources."""
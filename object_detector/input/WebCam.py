@@ -3,8 +3,9 @@ import sys, os; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__f
 from core.Camera import Camera
 
 class WebCam(Camera):
-    def __init__(self, source=0, auto_start=True):
+    def __init__(self, source=0, auto_start=True, threaded=True):
         """
         WebCam uses the default source 0 (webcam) unless otherwise specified.
+        Frames are captured on a background thread unless threaded=False.
         """
-        super().__init__(source, auto_start)
+        super().__init__(source, auto_start, threaded)
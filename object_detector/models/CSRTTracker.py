@@ -3,6 +3,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"
 
 import cv2
 from config.settings import debug
+from core.Frame import FrameGate
 
 
 
@@ -22,6 +23,7 @@ class CSRTTracker:
 
         self.is_tracking = False
         self.is_lost = False
+        self.frame_gate = FrameGate()
 
         self.initialize_tracker()
 
@@ -60,7 +62,8 @@ class CSRTTracker:
             self.interface.update_center(*self.center, color=self.point_color)
 
     def on_frame(self, frame):
-        self.get_object_boundary(frame)
+        if self.frame_gate.is_new(frame):
+            self.get_object_boundary(frame)
 
         if not self.is_lost:
             if self.draw_boundary: self.draw_object_boundary(frame)
@@ -3,6 +3,7 @@ import os, sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 
 from config.settings import debug
+from core.Frame import FrameGate
 from .DaSiamRPNTracker import DaSiamRPNTracker
 
 class DaSiamMultipleTracker:
@@ -20,6 +21,7 @@ class DaSiamMultipleTracker:
         self.is_tracking = False
         self.is_lost = False
         self.lost_count = 0
+        self.frame_gate = FrameGate()
 
         self.models = [DaSiamRPNTracker(interface, draw_point, draw_boundary, as_submodel=True)] * self.number_of_models
         self.center = False
@@ -117,7 +119,8 @@ class DaSiamMultipleTracker:
             self.interface.update_center(*self.center, color=self.point_color)
 
     def on_frame(self, frame):
-        self.get_object_boundary(frame)
+        if self.frame_gate.is_new(frame):
+            self.get_object_boundary(frame)
 
         if not self.is_lost:
             if self.draw_boundary: self.draw_object_boundary(frame)
@@ -9,6 +9,7 @@ from net import SiamRPNvot
 from run_SiamRPN import SiamRPN_init, SiamRPN_track
 
 from config.settings import debug
+from core.Frame import FrameGate
 
 class DaSiamRPNTracker:
 
@@ -27,6 +28,7 @@ class DaSiamRPNTracker:
 
         self.is_tracking = False
         self.is_lost = False
+        self.frame_gate = FrameGate()
 
         self.model = None
         self.target = None
@@ -90,7 +92,8 @@ class DaSiamRPNTracker:
             self.interface.update_center(*self.center, color=self.point_color)
 
     def on_frame(self, frame):
-        self.get_object_boundary(frame)
+        if self.frame_gate.is_new(frame):
+            self.get_object_boundary(frame)
 
         if not self.is_lost:
             if self.draw_boundary: self.draw_object_boundary(frame)
@@ -0,0 +1,46 @@
+import cv2
+import numpy as np
+import torch
+
+
+class FaceEmbedder:
+    """
+    Turns BGR face crops into LightCNN feature vectors.
+    All crops of a frame are preprocessed into one (N, 1, 128, 128) tensor and
+    embedded in forward passes of at most `batch_size` faces.
+    """
+
+    INPUT_SIZE = (128, 128)
+
+    def __init__(self, model, batch_size=16):
+        self.model = model
+        self.batch_size = batch_size
+
+    def preprocess(self, img):
+        """Grayscale and resize a face crop to the network input size."""
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(gray, self.INPUT_SIZE)
+
+    def to_tensor(self, imgs, preprocessed=False):
+        """
+        Stack face crops into a float (N, 1, 128, 128) tensor scaled to [0, 1], like transforms.ToTensor.
+        preprocessed: the crops already went through preprocess().
+        """
+        faces = np.stack(imgs if preprocessed else [self.preprocess(img) for img in imgs])
+        return torch.from_numpy(faces).unsqueeze(1).float().div(255)
+
+    def embed(self, imgs, preprocessed=False):
+        """Returns an (N, D) float32 array with one feature vector per face crop."""
+        if not len(imgs):
+            return np.zeros((0, 0), dtype=np.float32)
+
+        batch = self.to_tensor(imgs, preprocessed)
+        step = self.batch_size or len(batch)
+
+        features = []
+        with torch.no_grad():
+            for start in range(0, len(batch), step):
+                output = self.model(batch[start:start + step])
+                fc = output[1] if isinstance(output, tuple) else output  # full models also return logits
+                features.append(fc.cpu().numpy())
+        return np.concatenate(features)
@@ -7,8 +7,8 @@ import torchvision.transforms as transforms
 from light_cnn import LightCNN_29Layers
 from scipy.spatial.distance import cosine
 import pickle
-import time
 from navigation_plan.navigators.GridNavigator import GridNavigator
+from core.Metrics import metrics
 
 model = LightCNN_29Layers(num_classes=79077)
 checkpoint = torch.load('F:\EagleWingsSystem\EagleWings\modules\faceDetection\object_detector\LightCNN_29Layers_checkpoint.pth_2', map_location=torch.device('cpu'))
@@ -119,21 +119,18 @@ class FaceTracker:
 
 tracker = FaceTracker()
 cap = cv2.VideoCapture(0)
+metrics.start_reporting()
 
 while True:
     ret, frame = cap.read()
     if not ret:
         break
 
-    start_time = time.time()
-    frame = tracker.recognize_face(frame)
-    end_time = time.time()
+    with metrics.timer('recognize'):
+        frame = tracker.recognize_face(frame)
 
     cv2.imshow('Face Tracking', frame)
 
-    fps = 1 / (end_time - start_time)
-    print(f"FPS: {fps:.2f}")
-
     if cv2.waitKey(1) & 0xFF == ord('q'):
         break
 
@@ -1,13 +1,23 @@
+import collections
 import cv2
 import numpy as np
 import os
-import torch
-import torchvision.transforms as transforms
-from .light_cnn import LightCNN_29Layers
-from scipy.spatial.distance import cosine
-import pickle
+import threading
+from .model_loader import load_embedding_model, resolve_model_path
+from .FaceEmbedder import FaceEmbedder
+from .quantization import load_quantized, quantize_dynamic_model, QUANTIZED_EXTENSION
+from .tracker_options import GalleryOptions, DetectionOptions, TrackingOptions, RegionOptions, PipelineOptions
 from navigation_plan.navigators.GridNavigator import GridNavigator
-from PyQt6.QtCore import QObject, pyqtSignal
+from object_detector.gallery.FeatureGallery import FeatureGallery
+from object_detector.gallery.packed_gallery import load_packed_gallery, read_feature_dir, EXTENSION
+from object_detector.gallery.IVFIndex import IVFIndex
+from object_detector.tracking.DetectionScheduler import DetectionScheduler
+from object_detector.tracking.TrackManager import TrackManager
+from object_detector.tracking.MotionModel import MotionModel
+from core.Frame import FrameGate
+from core.Pipeline import Pipeline
+from core.Metrics import metrics
+from core.Signal import QObject, pyqtSignal
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../database')))
 class LightCNNTracker(QObject):
@@ -15,47 +25,110 @@ class LightCNNTracker(QObject):
     centerUpdated = pyqtSignal(tuple)    # Emits (x_center, y_center)
     trackingLost = pyqtSignal()          # Emits when tracking is lost
 
-    def __init__(self, interface=None, 
-                 model_path=os.path.join(os.path.dirname(__file__), '..', 'LightCNN_29Layers_checkpoint.pth_2'), 
-                 feature_dir=os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../database/extracted_features')),
-                 similarity_threshold=0.7):
+    def __init__(self, interface=None,
+                 model_path=os.path.join(os.path.dirname(__file__), '..', 'LightCNN_29Layers_checkpoint.pth_2'),
+                 arch='LightCNN-29',
+                 precision='float',
+                 quantized_model_path=None,
+                 batch_size=16,
+                 gallery_options=None,
+                 detection_options=None,
+                 tracking_options=None,
+                 roi_options=None,
+                 pipeline_options=None,
+                 navigate_on_prediction=False,
+                 draw=True):
         """
         Initialize the LightCNNTracker.
-        Loads the pre-trained LightCNN model, feature database,
-        sets up preprocessing, and initializes tracking state.
+        Loads the pre-trained LightCNN model (inference-only, without the fc2 classifier),
+        feature database, sets up preprocessing, and initializes tracking state.
+        model_path may be a training checkpoint or an inference artifact from
+        models/convert_checkpoint.py; an artifact next to the checkpoint is preferred.
+        precision is 'float', 'int8-dynamic' (int8 fc layers, no calibration) or 'int8'
+        (statically quantized model from models/quantize.py, default model_path + '.int8.pt').
+        batch_size caps how many faces go through one forward pass (None: whole frame at once).
+        The gallery, detection schedule, tracks, ROI search and pipeline are configured by the
+        option groups in models/tracker_options.py; None keeps a group's defaults.
+        navigate_on_prediction steers the GridNavigator by the center the motion model predicts.
+        When pipelined, on_frame only submits the frame and draws the newest results, and
+        pipeline.stats() reports the queue depths.
+        center_timestamp is the capture time of the frame the center was found on, which lags
+        the newest frame when pipelined.
+        draw=False leaves the frames untouched (headless runs). Without PyQt6, or with HEADLESS
+        set, the signals are plain core.Signal callbacks.
         """
         super().__init__()
-        self.interface = interface
-        self.similarity_threshold = similarity_threshold
-
-        self.model = LightCNN_29Layers(num_classes=79077)
-        checkpoint = torch.load(model_path, map_location=torch.device('cpu'))
-        state_dict = checkpoint['state_dict']
-        state_dict = {k.replace('module.', ''): v for k, v in state_dict.items()}
-        self.model.load_state_dict(state_dict)
-        self.model.eval()
-
-        self.feature_db = {}
-        for folder in os.listdir(feature_dir):
-            person_dir = os.path.join(feature_dir, folder)
-            if os.path.isdir(person_dir):
-                self.feature_db[folder] = []
-                for file in os.listdir(person_dir):
-                    if file.endswith('.feat'):
-                        with open(os.path.join(person_dir, file), 'rb') as f:
-                            feature = pickle.load(f)
-                            self.feature_db[folder].append(feature)
-
-        self.transform = transforms.Compose([transforms.ToTensor()])
+        gallery_options = gallery_options or GalleryOptions()
+        detection_options = detection_options or DetectionOptions()
+        pipeline_options = pipeline_options or PipelineOptions()
+
+        self._init_tracking_state(interface, tracking_options, roi_options, navigate_on_prediction, draw)
+        self.similarity_threshold = gallery_options.similarity_threshold
+
+        if precision == 'int8':
+            self.model = load_quantized(quantized_model_path or model_path + QUANTIZED_EXTENSION)
+        elif precision == 'int8-dynamic':
+            self.model = quantize_dynamic_model(load_embedding_model(resolve_model_path(model_path), arch))
+        elif precision == 'float':
+            self.model = load_embedding_model(resolve_model_path(model_path), arch)
+        else:
+            raise ValueError(f"Unknown precision {precision}, expected 'float', 'int8-dynamic' or 'int8'.")
+        self.embedder = FaceEmbedder(self.model, batch_size)
+
+        feature_dir = gallery_options.feature_dir
+        gallery_path = gallery_options.path or os.path.normpath(feature_dir) + EXTENSION
+        if os.path.isfile(gallery_path):
+            self.gallery = load_packed_gallery(gallery_path)
+        else:
+            print(f"[LightCNNTracker] No packed gallery at {gallery_path}, reading legacy .feat files from {feature_dir}. "
+                  "Convert them once with object_detector/gallery/convert_features.py")
+            feature_db, _ = read_feature_dir(feature_dir)
+            self.gallery = FeatureGallery.from_feature_db(feature_db)
+
+        ann_index_path = gallery_options.ann_index_path or gallery_path + IVFIndex.EXTENSION
+        if os.path.isfile(ann_index_path):
+            try:
+                self.gallery.attach_index(IVFIndex.load(ann_index_path, gallery_options.nprobe),
+                                          gallery_options.ann_min_size)
+            except ValueError as e:
+                print(f"[LightCNNTracker] Ignoring {ann_index_path}, using exact search: {e}")
+
         self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+        self.scheduler = DetectionScheduler(self.detect_faces, detection_options.interval, detection_options.budget,
+                                            detection_options.propagation, detection_options.min_tracking_confidence)
+        self.pipeline = Pipeline([
+            ('detect', self.locate_faces),
+            ('embed', self.identify_faces),
+            ('navigate', self.finish_frame),
+        ], pipeline_options.queue_size) if pipeline_options.enabled else None
+
+    def _init_tracking_state(self, interface, tracking_options=None, roi_options=None,
+                             navigate_on_prediction=False, draw=True):
+        """Tracks, selection, motion model and the state shared with the UI and navigation; every subclass calls this."""
+        tracking_options = tracking_options or TrackingOptions()
+        roi_options = roi_options or RegionOptions()
+        self.interface = interface
+        self.draw = draw
+        self.tracks = TrackManager(tracking_options.metric, reverify_interval=tracking_options.reverify_interval)
+        self.selected_track_id = None
+        self.motion = MotionModel(roi_options.padding)
+        self.roi_search = roi_options.enabled
+        self.full_scan_interval = roi_options.full_scan_interval
+        self.roi_detections = 0  # region-only detections since the last full-frame scan
 
         self.boundary = None  # (x, y, w, h)
         self.center = None    # (x_center, y_center)
+        self.center_timestamp = None  # capture time of the frame boundary and center come from
         self.is_tracking = False
 
         self.detections = []
+        self.frame_gate = FrameGate()
+        self.state_lock = threading.Lock()  # tracks, selection and motion are shared between pipeline stages
+        self.owner_thread = threading.current_thread()
+        self.pending_signals = collections.deque()  # emitted on pipeline threads, delivered by on_frame
 
-        self.navigator = GridNavigator(self) if self.interface else None 
+        self.pipeline = None
+        self.navigator = GridNavigator(self, use_prediction=navigate_on_prediction) if self.interface else None
 
     def set_object(self):
         """Start tracking using the current boundary and center."""
@@ -66,78 +139,181 @@ class LightCNNTracker(QObject):
         Preprocess the face image and extract features using the LightCNN model.
         Returns a feature vector.
         """
+        return self.extract_faces_features([img])[0]
+
+    def extract_faces_features(self, imgs):
+        """
+        Extract features for all face crops of a frame in batched forward passes.
+        Returns an (N, 256) feature array.
+        """
+        with metrics.timer('embed'):
+            return self.embedder.embed(imgs)
+
+    @property
+    def predicted_center(self):
+        """Where the tracked face's center is expected on the next frame, None when not tracking."""
+        return self.motion.predicted_center if self.is_tracking else None
+
+    def search_region(self, frame):
+        """Region around the tracked face's predicted box to detect in, or None to scan the whole frame."""
+        if not self.roi_search or not self.is_tracking:
+            return None
+        if self.full_scan_interval and self.roi_detections >= self.full_scan_interval:
+            return None
+        return self.motion.search_region(frame.shape)
+
+    def detect_faces(self, frame, region=None):
+        """
+        Detect faces in the frame using Haar cascades. Returns a list of (x, y, w, h) boxes.
+        Only `region` (see search_region) is scanned while it contains a face.
+        """
+        faces, in_region = self.detect_in(frame, region)
+        self.roi_detections = self.roi_detections + 1 if in_region else 0
+        return faces
+
+    def detect_in(self, frame, region=None):
+        """
+        Detect faces inside `region` (x, y, w, h), or the whole frame when that finds none.
+        Returns (boxes, found_in_region).
+        """
+        if region is not None:
+            x0, y0, w, h = region
+            faces = self._detect(frame[y0:y0+h, x0:x0+w])
+            if len(faces):
+                return [(x + x0, y + y0, fw, fh) for (x, y, fw, fh) in faces], True
+
+        return self._detect(frame), False
+
+    @metrics.timed('detect')
+    def _detect(self, img):
         gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        resized = cv2.resize(gray, (128, 128))
-        img_tensor = self.transform(resized).unsqueeze(0)  # Add batch dimension
-        with torch.no_grad():
-            features = self.model(img_tensor)
-        return features[1].data.cpu().numpy()[0]
+        return self.face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
 
+    @metrics.timed('recognize')
     def recognize_face(self, frame):
         """
-        Detect faces in the frame using Haar cascades, extract features,
-        compare against the feature database, and annotate the frame.
+        Detect faces in the frame using Haar cascades, associate them with persistent tracks,
+        extract features and compare against the feature database for tracks whose identity
+        needs (re)verification, and annotate the frame.
+        On frames the scheduler skips, the previous faces are propagated and keep their labels.
         Auto-select if only one face is detected.
         """
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = self.face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
-        self.detections = []  # Clear previous detections
+        work = self.identify_faces(self.locate_faces(frame))
+        self.detections = work["detections"]
+        self.draw_detections(frame)
+        return frame
+
+    def locate_faces(self, frame):
+        """
+        Detection stage: find the faces, update the tracks and follow the selected one.
+        Returns the work item for identify_faces.
+        The detector runs outside state_lock, so the embedding stage is not held up by it.
+        """
+        with self.state_lock:  # select_face() resets the motion model from the UI thread
+            if self.is_tracking:
+                self.motion.predict()
+            region = self.search_region(frame)
 
-        if len(faces) == 0:
+        faces, detected = self.scheduler.update(frame, region)
+
+        with self.state_lock:
+            tracks = self.tracks.update(faces)
+
+            if len(faces) == 0:
+                self.on_lost()
+                return {"frame": frame, "tracks": [], "pending": []}
+
+            pending = [track for track in tracks if self.tracks.needs_verification(track)] if detected else []
+
+            if len(tracks) == 1 and self.selected_track_id != tracks[0].id:
+                self.selected_track_id = tracks[0].id
+                self.motion.reset()
+
+            self.follow_selected_track(getattr(frame, 'timestamp', None))
+        return {"frame": frame, "tracks": tracks, "pending": pending}
+
+    def identify_faces(self, work):
+        """Embedding stage: (re)verify the tracks that need it and snapshot the detections."""
+        frame, pending = work["frame"], work["pending"]
+        if pending:
+            features = self.extract_faces_features([frame[y:y+h, x:x+w] for (x, y, w, h) in (t.box for t in pending)])
+            with metrics.timer('match'):
+                matches = self.gallery.match(features, self.similarity_threshold)
+            with self.state_lock:
+                for track, (best_match, best_similarity) in zip(pending, matches):
+                    self.tracks.verify(track, best_match, best_similarity)
+            metrics.count('faces.verified', len(pending))
+
+        with self.state_lock:
+            work["detections"] = [{
+                "box": track.box,
+                "center": track.center,
+                "label": track.label,
+                "similarity": track.similarity,
+                "track_id": track.id
+            } for track in work["tracks"]]
+        return work
+
+    def finish_frame(self, work):
+        """Last pipeline stage: publish the detections and navigate, in frame order."""
+        self.detections = work["detections"]
+        if self.navigator:
+            self.navigator.navigate(work["frame"])
+        return work["frame"]
+
+    def follow_selected_track(self, timestamp=None):
+        """
+        Move boundary and center with the selected track, whatever the other faces do.
+        timestamp: capture time of the frame the tracks were updated from.
+        """
+        if self.selected_track_id is None:
+            return
+
+        track = self.tracks.get(self.selected_track_id)
+        if track is None:
+            self.selected_track_id = None
             self.on_lost()
-            return frame
-
-        for (x, y, w, h) in faces:
-            face_img = frame[y:y+h, x:x+w]
-            features = self.extract_face_features(face_img)
-            
-            best_match = "Unknown"
-            best_similarity = float('inf')
-            for person_name, db_features in self.feature_db.items():
-                for db_feat in db_features:
-                    similarity = cosine(features, db_feat)
-                    if similarity < best_similarity:
-                        best_similarity = similarity
-                        best_match = person_name
-
-            if best_similarity >= self.similarity_threshold:
-                best_match = "Unknown"
-
-            print(f"Detected {best_match} with similarity {best_similarity:.3f}")
-
-            detection = {
-                "box": (x, y, w, h),
-                "center": (x + w // 2, y + h // 2),
-                "label": best_match,
-                "similarity": best_similarity
-            }
-            self.detections.append(detection)
-
-            cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
-            cv2.putText(frame, best_match, (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-        
-        if len(self.detections) == 1:
-            sel = self.detections[0]
-            self.boundary = sel["box"]
-            self.center = sel["center"]
-            self.is_tracking = True
-            if self.interface:
-                self.boundaryUpdated.emit(self.boundary)
-                self.centerUpdated.emit(self.center)
-        
-        return frame
+            return
+        if track.misses:
+            return  # not seen on this frame: keep its last position
+
+        self.boundary = track.box
+        self.center = track.center
+        self.center_timestamp = timestamp
+        self.is_tracking = True
+        self.motion.correct(track.box)
+        if self.interface:
+            self.emit_signal(self.boundaryUpdated, self.boundary)
+            self.emit_signal(self.centerUpdated, self.center)
+
+    def emit_signal(self, signal, *args):
+        """Emit now on the thread that owns the tracker, otherwise queue it for the next on_frame()."""
+        if threading.current_thread() is self.owner_thread:
+            signal.emit(*args)
+        else:
+            self.pending_signals.append((signal, args))
+
+    def deliver_signals(self):
+        """Emit the signals queued by pipeline threads, in order."""
+        while self.pending_signals:
+            signal, args = self.pending_signals.popleft()
+            signal.emit(*args)
 
     def select_face(self, click_x, click_y):
         """
         When a click is detected, check if the click falls within a detection's box.
-        If so, select that face for tracking and emit UI update signals.
+        If so, select that face's track for tracking and emit UI update signals.
         """
         for detection in self.detections:
             x, y, w, h = detection["box"]
             if x <= click_x <= x + w and y <= click_y <= y + h:
-                self.boundary = detection["box"]
-                self.center = detection["center"]
-                self.is_tracking = True
+                with self.state_lock:
+                    self.selected_track_id = detection["track_id"]
+                    self.motion.reset()
+                    self.motion.correct(detection["box"])
+                    self.boundary = detection["box"]
+                    self.center = detection["center"]
+                    self.is_tracking = True
                 self.boundaryUpdated.emit(self.boundary)
                 self.centerUpdated.emit(self.center)
                 print(f"Selected face: {detection['label']} with similarity {detection['similarity']:.3f}")
@@ -150,8 +326,20 @@ class LightCNNTracker(QObject):
         self.is_tracking = False
         self.boundary = None
         self.center = None
+        self.center_timestamp = None
+        self.motion.reset()
         if self.interface:
-            self.trackingLost.emit()
+            self.emit_signal(self.trackingLost)
+
+    def draw_detections(self, frame):
+        """Draw the current detections' boxes and labels onto the frame."""
+        if not self.draw:
+            return
+        with metrics.timer('draw'):
+            for detection in self.detections:
+                x, y, w, h = detection["box"]
+                cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+                cv2.putText(frame, detection["label"], (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
 
     def on_frame(self, frame):
         """
@@ -159,17 +347,29 @@ class LightCNNTracker(QObject):
           - Recognize and annotate faces.
           - Draw visual aids if tracking is active.
           - Call the navigator to adjust movement.
+        A camera frame that was already processed is only annotated with the cached detections.
+        When pipelined, new frames are handed to the pipeline and this frame is annotated with
+        the newest results the pipeline has produced.
         Returns the processed frame.
         """
-        frame = self.recognize_face(frame)
+        if self.pipeline:
+            if self.frame_gate.is_new(frame):
+                self.pipeline.submit(frame.copy())
+            self.deliver_signals()
+            self.draw_detections(frame)
+        elif self.frame_gate.is_new(frame):
+            frame = self.recognize_face(frame)
+        else:
+            self.draw_detections(frame)
         
-        if self.is_tracking and self.center is not None:
-            frame_h, frame_w = frame.shape[:2]
-            frame_center = (frame_w // 2, frame_h // 2)
-            cv2.line(frame, (frame_center[0], 0), (frame_center[0], frame_h), (0, 255, 0), 1)
-            cv2.line(frame, (0, frame_center[1]), (frame_w, frame_center[1]), (0, 255, 0), 1)
-            cv2.line(frame, frame_center, self.center, (255, 0, 0), 2)
+        if self.draw and self.is_tracking and self.center is not None:
+            with metrics.timer('draw.overlay'):
+                frame_h, frame_w = frame.shape[:2]
+                frame_center = (frame_w // 2, frame_h // 2)
+                cv2.line(frame, (frame_center[0], 0), (frame_center[0], frame_h), (0, 255, 0), 1)
+                cv2.line(frame, (0, frame_center[1]), (frame_w, frame_center[1]), (0, 255, 0), 1)
+                cv2.line(frame, frame_center, self.center, (255, 0, 0), 2)
         
-        if self.navigator:
+        if self.navigator and not self.pipeline:
             self.navigator.navigate(frame)
         return frame
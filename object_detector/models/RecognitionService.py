@@ -0,0 +1,176 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import cv2
+
+from .LightCNNTracker import LightCNNTracker
+from core.Frame import FrameGate
+
+
+class RecognitionService:
+    """
+    One LightCNN model and gallery shared by several camera streams.
+    submit() detects and preprocesses the faces of a frame on the calling stream's thread and
+    queues them; a batching thread gathers faces from all streams into one forward pass of up to
+    `max_batch` faces, waiting at most `max_wait` seconds after the oldest request was queued,
+    and resolves every request's Future with that frame's faces.
+    tracker_kwargs configure the model and gallery as for LightCNNTracker; the batch size is max_batch.
+    """
+
+    def __init__(self, max_batch=32, max_wait=0.01, **tracker_kwargs):
+        if 'batch_size' in tracker_kwargs:
+            raise ValueError("RecognitionService sets the batch size from max_batch, pass that instead of batch_size.")
+        self.engine = LightCNNTracker(interface=None, batch_size=max_batch, **tracker_kwargs)
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.requests = queue.Queue()
+        self._submit_lock = threading.Lock()
+        self._stopped = False
+        self._local = threading.local()  # a CascadeClassifier per submitting thread
+
+        self._stats_lock = threading.Lock()
+        self.frames = 0
+        self.faces = 0
+        self.batches = 0
+        self.stream_frames = {}
+
+        self._worker = threading.Thread(target=self._batch_loop, daemon=True, name="recognition-batcher")
+        self._worker.start()
+
+    def detect(self, frame):
+        """Haar face boxes of `frame`, as plain tuples."""
+        cascade = getattr(self._local, 'cascade', None)
+        if cascade is None:
+            cascade = self._local.cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        faces = cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))
+        return [tuple(int(v) for v in box) for box in faces]
+
+    def submit(self, stream_id, frame, boxes=None):
+        """
+        Queue a frame of `stream_id` for recognition; `boxes` skips detection (e.g. tracked boxes).
+        Returns a Future with a list of {"box", "label", "similarity"} dicts, one per face.
+        Raises RuntimeError once the service is stopped.
+        """
+        if self._stopped:
+            raise RuntimeError("RecognitionService is stopped.")
+        boxes = self.detect(frame) if boxes is None else [tuple(int(v) for v in box) for box in boxes]
+        future = Future()
+        with self._stats_lock:
+            self.stream_frames[stream_id] = self.stream_frames.get(stream_id, 0) + 1
+            if not boxes:
+                self.frames += 1
+        if not boxes:
+            future.set_result([])
+            return future
+        faces = [self.engine.embedder.preprocess(frame[y:y+h, x:x+w]) for (x, y, w, h) in boxes]
+        with self._submit_lock:
+            if self._stopped:
+                raise RuntimeError("RecognitionService is stopped.")
+            # Stamped when queued: max_wait is how long the batcher holds it, detection time is not counted.
+            self.requests.put((time.monotonic(), stream_id, boxes, faces, future))
+        return future
+
+    def _batch_loop(self):
+        while True:
+            request = self.requests.get()
+            if request is None:
+                return
+            batch, faces = [request], len(request[3])
+            deadline = request[0] + self.max_wait
+            stopping = False
+            while faces < self.max_batch:
+                try:
+                    request = self.requests.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+                faces += len(request[3])
+            self._run(batch)
+            if stopping:
+                return
+
+    def _run(self, batch):
+        faces = [face for request in batch for face in request[3]]
+        try:
+            features = self.engine.embedder.embed(faces, preprocessed=True)
+            matches = self.engine.gallery.match(features, self.engine.similarity_threshold)
+        except Exception as e:
+            print(f"[RecognitionService] Batch of {len(faces)} faces failed: {e}")
+            for request in batch:
+                request[4].set_exception(e)
+            return
+
+        with self._stats_lock:
+            self.batches += 1
+            self.faces += len(faces)
+            self.frames += len(batch)
+        start = 0
+        for _, _, boxes, _, future in batch:
+            future.set_result([{"box": box, "label": label, "similarity": float(similarity)}
+                               for box, (label, similarity) in zip(boxes, matches[start:start + len(boxes)])])
+            start += len(boxes)
+
+    def stats(self):
+        """Frames and faces recognized, forward passes run and frames submitted per stream."""
+        with self._stats_lock:
+            return {"frames": self.frames, "faces": self.faces, "batches": self.batches,
+                    "mean_batch": self.faces / self.batches if self.batches else 0.0,
+                    "streams": dict(self.stream_frames)}
+
+    def stream(self, stream_id):
+        """A frame listener that recognizes one camera's frames through this service."""
+        return RecognitionStream(self, stream_id)
+
+    def stop(self, timeout=1.0):
+        """Finish the queued requests and stop the batching thread; later submit() calls raise."""
+        with self._submit_lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            self.requests.put(None)
+        self._worker.join(timeout)
+
+
+class RecognitionStream:
+    """
+    Frame listener for one stream of a RecognitionService: new frames are submitted while
+    no request of this stream is in flight, and every frame is annotated with the newest results.
+    A failed request clears the detections (counted in `failed`), so stale boxes are not kept.
+    """
+
+    def __init__(self, service, stream_id):
+        self.service = service
+        self.stream_id = stream_id
+        self.frame_gate = FrameGate()
+        self.pending = None
+        self.detections = []
+        self.skipped = 0
+        self.failed = 0
+
+    def on_frame(self, frame):
+        if self.pending is not None and self.pending.done():
+            error = self.pending.exception()
+            if error is None:
+                self.detections = self.pending.result()
+            else:
+                self.detections = []
+                self.failed += 1  # the batcher logged the error
+            self.pending = None
+
+        if self.frame_gate.is_new(frame):
+            if self.pending is None:
+                self.pending = self.service.submit(self.stream_id, frame)
+            else:
+                self.skipped += 1
+
+        for detection in self.detections:
+            x, y, w, h = detection["box"]
+            cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+            cv2.putText(frame, detection["label"], (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+        return frame
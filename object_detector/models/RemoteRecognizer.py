@@ -0,0 +1,102 @@
+from .LightCNNTracker import LightCNNTracker
+from core.FrameBus import FrameBus
+from core.Signal import QObject
+from core.Metrics import metrics
+
+
+def recognition_worker(client, tracker_kwargs):
+    """
+    Worker process loop: detect and identify the faces of every frame on the bus.
+    Replies with plain python boxes and (label, similarity) matches, in the same order.
+    """
+    tracker = LightCNNTracker(interface=None, **tracker_kwargs)
+    for task, frame in client.tasks():
+        try:
+            faces, in_region = tracker.detect_in(frame, task['region'])
+            boxes = [tuple(int(v) for v in box) for box in faces]
+            matches = []
+            if boxes:
+                features = tracker.extract_faces_features([frame[y:y+h, x:x+w] for (x, y, w, h) in boxes])
+                matches = [(label, float(similarity)) for label, similarity
+                           in tracker.gallery.match(features, tracker.similarity_threshold)]
+            del frame  # the slot is reused once we reply
+            client.reply(task, {"boxes": boxes, "matches": matches, "in_region": in_region})
+        except Exception as e:
+            print(f"[RemoteRecognizer] Worker failed on frame {task.get('sequence')}: {e}")
+            client.reply(task, None)
+
+
+class RemoteRecognizer(LightCNNTracker):
+    """
+    LightCNNTracker with detection and embedding moved to `workers` processes fed through a
+    core.FrameBus, so they run beside the main loop instead of under its GIL.
+    The main process keeps the tracks, the selection and the motion model, applies the
+    workers' results as they arrive and draws them; GridNavigator and GridGuide read
+    boundary and center from it exactly as from a LightCNNTracker.
+    Workers embed every face they find; the tracks decide which results replace a cached identity.
+    Frames arriving while all slots are busy are skipped, and results are applied a frame or two
+    after the frame they came from. Call close() (run.py does on shutdown) to stop the workers.
+    """
+
+    def __init__(self, interface=None, workers=1, slots=None, frame_shape=(720, 960, 3),
+                 tracking_options=None, roi_options=None, navigate_on_prediction=False, draw=True, **tracker_kwargs):
+        """
+        tracker_kwargs go to the LightCNNTracker built in every worker (model, gallery_options, precision...).
+        frame_shape is the largest frame the bus takes.
+        """
+        QObject.__init__(self)  # no model or gallery in this process, only the tracking state
+        self._init_tracking_state(interface, tracking_options, roi_options, navigate_on_prediction, draw)
+        self.published = 0
+        self.applied = 0
+
+        self.bus = FrameBus(recognition_worker, (tracker_kwargs,), workers, slots, frame_shape)
+        print(f"[RemoteRecognizer] Started {workers} recognition worker(s)")
+
+    def recognize_face(self, frame):
+        """Hand the frame to the workers, apply the results that came back and annotate the frame."""
+        if self.bus.publish(frame, sequence=self.published + 1, timestamp=getattr(frame, 'timestamp', None),
+                            region=self.search_region(frame)):
+            self.published += 1
+        for task, result in sorted(self.bus.results(), key=lambda item: item[0]['sequence']):
+            if task['sequence'] > self.applied:  # with several workers results can overtake each other
+                self.applied = task['sequence']
+                self.apply_result(result, task['timestamp'])
+        self.draw_detections(frame)
+        return frame
+
+    def apply_result(self, result, timestamp=None):
+        """Update the tracks, identities and the followed face from one worker result (frame captured at `timestamp`)."""
+        boxes = result["boxes"]
+        self.roi_detections = self.roi_detections + 1 if result["in_region"] else 0
+        if self.is_tracking:
+            self.motion.predict()
+
+        with self.state_lock:
+            tracks = self.tracks.update(boxes)
+            if not boxes:
+                self.detections = []
+                self.on_lost()
+                return
+
+            for track, (best_match, best_similarity) in zip(tracks, result["matches"]):
+                if self.tracks.needs_verification(track):
+                    self.tracks.verify(track, best_match, best_similarity)
+                    metrics.count('faces.verified')
+
+            self.detections = [{
+                "box": track.box,
+                "center": track.center,
+                "label": track.label,
+                "similarity": track.similarity,
+                "track_id": track.id
+            } for track in tracks]
+
+            if len(tracks) == 1 and self.selected_track_id != tracks[0].id:
+                self.selected_track_id = tracks[0].id
+                self.motion.reset()
+
+            self.follow_selected_track(timestamp)
+
+    def close(self):
+        """Stop the workers and free the shared memory."""
+        self.bus.close()
@@ -0,0 +1,30 @@
+import argparse
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+import time
+
+import torch
+
+from object_detector.models.model_loader import ARCHITECTURES, ARTIFACT_EXTENSION, save_artifact, load_embedding_model
+
+parser = argparse.ArgumentParser(description='Convert a LightCNN training checkpoint into a slim inference artifact')
+parser.add_argument('--resume', required=True, type=str, metavar='PATH', help='Training checkpoint with a state_dict.')
+parser.add_argument('--model', default='LightCNN-29', choices=list(ARCHITECTURES), help='Architecture of the checkpoint.')
+parser.add_argument('--output', default='', type=str, metavar='PATH', help=f'Artifact to write (default: <resume>{ARTIFACT_EXTENSION}).')
+
+
+def main():
+    args = parser.parse_args()
+    output = args.output or args.resume + ARTIFACT_EXTENSION
+
+    checkpoint = torch.load(args.resume, map_location=torch.device('cpu'))
+    save_artifact(output, checkpoint['state_dict'], args.model)
+    print(f"Saved {args.model} inference artifact to {output} "
+          f"({os.path.getsize(args.resume) / 2**20:.1f} MB -> {os.path.getsize(output) / 2**20:.1f} MB)")
+
+    start_time = time.time()
+    load_embedding_model(output)
+    print(f"Artifact loads in {(time.time() - start_time) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
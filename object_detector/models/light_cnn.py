@@ -56,13 +56,15 @@ class network_9layers(nn.Module):
             nn.MaxPool2d(kernel_size=2, stride=2, ceil_mode=True),
             )
         self.fc1 = mfm(8*8*128, 256, type=0)
-        self.fc2 = nn.Linear(256, num_classes)
+        self.fc2 = nn.Linear(256, num_classes) if num_classes else None
 
     def forward(self, x):
         x = self.features(x)
-        x = x.view(x.size(0), -1)
+        x = torch.flatten(x, 1)
         x = self.fc1(x)
         x = F.dropout(x, training=self.training)
+        if self.fc2 is None:
+            return x
         out = self.fc2(x)
         return out, x
 
@@ -83,7 +85,7 @@ class network_29layers(nn.Module):
         self.group4 = group(128, 128, 3, 1, 1)
         self.pool4  = nn.MaxPool2d(kernel_size=2, stride=2, ceil_mode=True)
         self.fc     = mfm(8*8*128, 256, type=0)
-        self.fc2    = nn.Linear(256, num_classes)
+        self.fc2    = nn.Linear(256, num_classes) if num_classes else None
             
     def _make_layer(self, block, num_blocks, in_channels, out_channels):
         layers = []
@@ -109,9 +111,11 @@ class network_29layers(nn.Module):
         x = self.group4(x)
         x = self.pool4(x)
 
-        x = x.view(x.size(0), -1)
+        x = torch.flatten(x, 1)
         fc = self.fc(x)
         fc = F.dropout(fc, training=self.training)
+        if self.fc2 is None:
+            return fc
         out = self.fc2(fc)
         return out, fc
 
@@ -129,7 +133,7 @@ class network_29layers_v2(nn.Module):
         self.block4   = self._make_layer(block, layers[3], 128, 128)
         self.group4   = group(128, 128, 3, 1, 1)
         self.fc       = nn.Linear(8*8*128, 256)
-        self.fc2 = nn.Linear(256, num_classes, bias=False)
+        self.fc2 = nn.Linear(256, num_classes, bias=False) if num_classes else None
             
     def _make_layer(self, block, num_blocks, in_channels, out_channels):
         layers = []
@@ -155,12 +159,17 @@ class network_29layers_v2(nn.Module):
         x = self.group4(x)
         x = F.max_pool2d(x, 2) + F.avg_pool2d(x, 2)
 
-        x = x.view(x.size(0), -1)
+        x = torch.flatten(x, 1)
         fc = self.fc(x)
+        if self.fc2 is None:
+            return fc
         x = F.dropout(fc, training=self.training)
         out = self.fc2(x)
         return out, fc
 
+# num_classes=None builds an inference-only network without the fc2 classifier;
+# its forward() returns just the 256-d embedding instead of (logits, embedding).
+
 def LightCNN_9Layers(**kwargs):
     model = network_9layers(**kwargs)
     return model
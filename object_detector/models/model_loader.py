@@ -0,0 +1,89 @@
+import os
+
+import torch
+
+from .light_cnn import LightCNN_9Layers, LightCNN_29Layers, LightCNN_29Layers_v2
+
+ARCHITECTURES = {
+    'LightCNN-9': LightCNN_9Layers,
+    'LightCNN-29': LightCNN_29Layers,
+    'LightCNN-29v2': LightCNN_29Layers_v2,
+}
+
+CLASSIFIER_PREFIX = 'fc2.'
+
+# Inference artifact written by convert_checkpoint.py: embedding weights only, prefixes
+# already stripped, in torch's zip format so it can be memory-mapped.
+ARTIFACT_FORMAT = 'lightcnn-embedding'
+ARTIFACT_VERSION = 1
+ARTIFACT_EXTENSION = '.embedding.pt'
+
+
+def build_model(arch='LightCNN-29', num_classes=None):
+    """Instantiate a LightCNN architecture; num_classes=None leaves out the fc2 classifier."""
+    if arch not in ARCHITECTURES:
+        raise ValueError(f"Invalid model type: {arch}")
+    return ARCHITECTURES[arch](num_classes=num_classes)
+
+
+def load_checkpoint(path):
+    """
+    torch.load a checkpoint onto the CPU, memory-mapped when the file format allows it.
+    Tensors that are never copied out of a mapped checkpoint (such as fc2) are never paged in.
+    """
+    try:
+        return torch.load(path, map_location=torch.device('cpu'), mmap=True)
+    except (RuntimeError, TypeError):
+        # Legacy (non-zip) checkpoints and torch < 2.1 cannot be memory-mapped.
+        return torch.load(path, map_location=torch.device('cpu'))
+
+
+def embedding_state_dict(state_dict):
+    """Strip DataParallel 'module.' prefixes and drop the classifier weights."""
+    state_dict = {k.replace('module.', ''): v for k, v in state_dict.items()}
+    return {k: v for k, v in state_dict.items() if not k.startswith(CLASSIFIER_PREFIX)}
+
+
+def is_artifact(checkpoint):
+    return isinstance(checkpoint, dict) and checkpoint.get('format') == ARTIFACT_FORMAT
+
+
+def save_artifact(path, state_dict, arch):
+    """Write an inference artifact from a training checkpoint's state_dict."""
+    state_dict = {k: v.detach().contiguous().clone() for k, v in embedding_state_dict(state_dict).items()}
+    torch.save({'format': ARTIFACT_FORMAT, 'version': ARTIFACT_VERSION, 'arch': arch, 'state_dict': state_dict}, path)
+
+
+def resolve_model_path(path):
+    """Prefer a converted artifact (path + ARTIFACT_EXTENSION) sitting next to a training checkpoint."""
+    artifact_path = path + ARTIFACT_EXTENSION
+    return artifact_path if os.path.isfile(artifact_path) else path
+
+
+def load_embedding_model(path, arch='LightCNN-29'):
+    """
+    Build an inference-only LightCNN, skipping fc2 entirely.
+    `path` is a training checkpoint or an inference artifact; an artifact brings its own
+    architecture; the network is built on the meta device and takes over the
+    memory-mapped weights in place (assign=True), so nothing is initialised or copied
+    and processes loading the same artifact share its pages.
+    """
+    checkpoint = load_checkpoint(path)
+
+    if is_artifact(checkpoint):
+        if checkpoint['version'] != ARTIFACT_VERSION:
+            raise ValueError(f"{path} is artifact version {checkpoint['version']}, expected {ARTIFACT_VERSION}.")
+        try:
+            with torch.device('meta'):
+                model = build_model(checkpoint['arch'])
+            model.load_state_dict(checkpoint['state_dict'], assign=True)
+        except (AttributeError, TypeError):
+            # torch < 2.1 has neither device contexts nor assign: weights are copied out of the mapping.
+            model = build_model(checkpoint['arch'])
+            model.load_state_dict(checkpoint['state_dict'])
+    else:
+        model = build_model(arch)
+        model.load_state_dict(embedding_state_dict(checkpoint['state_dict']))
+
+    model.eval()
+    return model
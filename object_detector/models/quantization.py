@@ -0,0 +1,73 @@
+"""
+INT8 LightCNN inference.
+
+dynamic: nn.Linear weights are stored as int8, activations are quantized on the fly.
+         Needs no calibration but only covers the fc layers.
+static:  FX graph mode quantization of every mfm convolution and linear layer,
+         with activation ranges calibrated on enrollment faces. The max() inside
+         mfm stays in float between a dequantize and a quantize.
+
+Static models are saved as TorchScript (<checkpoint>.int8.pt) together with the
+quantized engine they were built for; models/quantize.py builds them.
+The quantized engine is a torch-wide setting: it is only changed when quantizing
+or loading a model, and only when the active one cannot run it.
+"""
+
+import copy
+
+import torch
+
+QUANTIZED_EXTENSION = '.int8.pt'
+
+
+def select_engine(engine=''):
+    """
+    Activate `engine`, or without one keep the active engine when it is usable and otherwise
+    pick one supported by this torch build. Returns the active engine.
+    """
+    supported = torch.backends.quantized.supported_engines
+    if not engine and torch.backends.quantized.engine in supported and torch.backends.quantized.engine != 'none':
+        return torch.backends.quantized.engine
+    for candidate in ([engine] if engine else ['x86', 'fbgemm', 'qnnpack']):
+        if candidate in supported:
+            torch.backends.quantized.engine = candidate
+            return candidate
+    raise RuntimeError(f"No quantized engine available (supported: {supported}).")
+
+
+def quantize_dynamic_model(model):
+    """Return a copy of `model` with int8 dynamically quantized nn.Linear layers."""
+    select_engine()
+    return torch.ao.quantization.quantize_dynamic(copy.deepcopy(model), {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def quantize_static_model(model, calibration_batches, engine=''):
+    """
+    Return a statically quantized copy of an embedding-only `model`.
+    calibration_batches: iterable of (N, 1, 128, 128) float tensors of real faces.
+    """
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+    engine = select_engine(engine)
+    calibration_batches = list(calibration_batches)
+    prepared = prepare_fx(copy.deepcopy(model).eval(), get_default_qconfig_mapping(engine), (calibration_batches[0],))
+    with torch.no_grad():
+        for batch in calibration_batches:
+            prepared(batch)
+    return convert_fx(prepared)
+
+
+def save_quantized(model, path, example):
+    """Trace a quantized model to TorchScript and save it with the engine it needs."""
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example)
+    torch.jit.save(traced, path, _extra_files={'engine': torch.backends.quantized.engine})
+
+
+def load_quantized(path):
+    """Load a model written by save_quantized, activating its quantized engine."""
+    extra_files = {'engine': ''}
+    model = torch.jit.load(path, map_location=torch.device('cpu'), _extra_files=extra_files)
+    select_engine(extra_files['engine'].decode() if isinstance(extra_files['engine'], bytes) else extra_files['engine'])
+    return model.eval()
@@ -0,0 +1,96 @@
+"""
+Calibrate a static INT8 LightCNN on enrollment faces, save it next to the checkpoint
+and report how close its embeddings stay to the float model's.
+The quantization itself lives in models/quantization.py.
+"""
+
+import argparse
+import os, sys; sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+import time
+
+import cv2
+import numpy as np
+import torch
+
+from object_detector.models.FaceEmbedder import FaceEmbedder
+from object_detector.models.model_loader import ARCHITECTURES, load_embedding_model, resolve_model_path
+from object_detector.models.quantization import (QUANTIZED_EXTENSION, load_quantized, quantize_dynamic_model,
+                                                 quantize_static_model, save_quantized)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+parser = argparse.ArgumentParser(description='Calibrate and save an INT8 LightCNN, and report its accuracy against the float model')
+parser.add_argument('--resume', required=True, type=str, metavar='PATH', help='Training checkpoint or inference artifact.')
+parser.add_argument('--model', default='LightCNN-29', choices=list(ARCHITECTURES), help='Architecture of a training checkpoint.')
+parser.add_argument('--root_path', required=True, type=str, metavar='PATH', help='Enrollment dataset: one folder of face images per person.')
+parser.add_argument('--output', default='', type=str, metavar='PATH', help=f'Quantized model to write (default: <resume>{QUANTIZED_EXTENSION}).')
+parser.add_argument('--calibration_faces', default=256, type=int, help='Faces used to calibrate activation ranges.')
+parser.add_argument('--evaluation_faces', default=256, type=int, help='Held-out faces used for the accuracy report.')
+parser.add_argument('--engine', default='', type=str, help='Quantized engine (default: x86/fbgemm on x86, qnnpack on ARM).')
+
+
+def load_enrollment_faces(root_path, limit):
+    """Read up to `limit` BGR face crops from a <person>/<image> dataset, spread over all people."""
+    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+    per_person = []
+    for person_name in sorted(os.listdir(root_path)):
+        person_path = os.path.join(root_path, person_name)
+        if os.path.isdir(person_path):
+            per_person.append([os.path.join(person_path, f) for f in sorted(os.listdir(person_path)) if f.lower().endswith(IMAGE_EXTENSIONS)])
+
+    faces = []
+    # Round-robin over people so a small limit still covers the whole gallery.
+    for img_path in _round_robin(per_person):
+        img = cv2.imread(img_path)
+        if img is None:
+            continue
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        for (x, y, w, h) in face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30)):
+            faces.append(img[y:y+h, x:x+w])
+        if len(faces) >= limit:
+            break
+    return faces[:limit]
+
+
+def _round_robin(lists):
+    for i in range(max((len(l) for l in lists), default=0)):
+        for l in lists:
+            if i < len(l):
+                yield l[i]
+
+
+def main():
+    args = parser.parse_args()
+    output = args.output or args.resume + QUANTIZED_EXTENSION
+
+    float_model = load_embedding_model(resolve_model_path(args.resume), args.model)
+    embedder = FaceEmbedder(float_model)
+
+    faces = load_enrollment_faces(args.root_path, args.calibration_faces + args.evaluation_faces)
+    if len(faces) < 2:
+        raise ValueError(f"Found only {len(faces)} faces in {args.root_path}, need at least 2.")
+    calibration, evaluation = faces[0::2][:args.calibration_faces], faces[1::2][:args.evaluation_faces]
+    print(f"Calibrating on {len(calibration)} faces, evaluating on {len(evaluation)} held-out faces")
+
+    batches = [embedder.to_tensor(calibration[i:i + 16]) for i in range(0, len(calibration), 16)]
+    start_time = time.time()
+    quantized = quantize_static_model(float_model, batches, args.engine)
+    save_quantized(quantized, output, batches[0])
+    print(f"Saved static INT8 model ({torch.backends.quantized.engine}) to {output} in {time.time() - start_time:.1f} seconds")
+
+    report(float_model, {'int8-dynamic': quantize_dynamic_model(float_model), 'int8': load_quantized(output)}, evaluation)
+
+
+def report(float_model, quantized_models, faces):
+    """Print cosine similarity between float and quantized embeddings of the same faces."""
+    reference = FaceEmbedder(float_model).embed(faces)
+    reference /= np.linalg.norm(reference, axis=1, keepdims=True)
+    print(f"{'model':>13} {'mean cos':>9} {'min cos':>8} {'p1 cos':>8}")
+    for name, model in quantized_models.items():
+        features = FaceEmbedder(model).embed(faces)
+        cosines = np.sum(reference * features / np.linalg.norm(features, axis=1, keepdims=True), axis=1)
+        print(f"{name:>13} {cosines.mean():>9.4f} {cosines.min():>8.4f} {np.percentile(cosines, 1):>8.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Option groups of LightCNNTracker (and the trackers built on it), so a caller only spells
+out the group it changes:
+
+    LightCNNTracker(interface, detection_options=DetectionOptions(interval=5))
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from object_detector.gallery.FeatureGallery import FeatureGallery
+
+DEFAULT_FEATURE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../database/extracted_features'))
+
+
+@dataclass
+class GalleryOptions:
+    """
+    path is the packed gallery file (default: feature_dir + '.gallery'); the legacy .feat tree
+    in feature_dir is only read when that file does not exist.
+    ann_index_path is an optional IVF index (default: path + '.ivf.npz') used for galleries of
+    at least ann_min_size templates; nprobe trades recall for speed.
+    """
+    feature_dir: str = DEFAULT_FEATURE_DIR
+    path: Optional[str] = None
+    similarity_threshold: float = 0.7
+    ann_index_path: Optional[str] = None
+    nprobe: int = 8
+    ann_min_size: int = FeatureGallery.ANN_MIN_SIZE
+
+
+@dataclass
+class DetectionOptions:
+    """
+    Run the Haar detector and embedding only every `interval` frames / every `budget` seconds;
+    in between boxes are propagated with 'flow' or 'csrt' and keep their labels, and a detection
+    is forced when the propagation confidence drops below min_tracking_confidence.
+    """
+    interval: int = 1
+    budget: Optional[float] = None
+    propagation: str = 'flow'
+    min_tracking_confidence: float = 0.5
+
+
+@dataclass
+class TrackingOptions:
+    """
+    Faces are associated into persistent tracks (metric 'iou' or 'centroid') that cache their
+    identity; a track is only re-embedded every reverify_interval frames or when its box has
+    moved away from where it was last verified.
+    """
+    metric: str = 'iou'
+    reverify_interval: int = 30
+
+
+@dataclass
+class RegionOptions:
+    """
+    While locked on a face, a constant-velocity Kalman filter predicts its next box; when enabled,
+    detection only scans that box padded by `padding` on every side. The whole frame is scanned
+    when the region comes up empty and every full_scan_interval detections, so other faces only
+    show up in the detections on those scans. Off by default.
+    """
+    enabled: bool = False
+    padding: float = 1.0
+    full_scan_interval: int = 30
+
+
+@dataclass
+class PipelineOptions:
+    """
+    When enabled, detection, embedding and navigation run as a core.Pipeline of worker threads
+    with bounded drop-oldest queues of queue_size.
+    """
+    enabled: bool = False
+    queue_size: int = 2
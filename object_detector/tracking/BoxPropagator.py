@@ -0,0 +1,104 @@
+import cv2
+import numpy as np
+
+
+class BoxPropagator:
+    """
+    Carries face boxes from one frame to the next without running a detector.
+    method 'flow' follows Shi-Tomasi corners with pyramidal Lucas-Kanade optical flow
+    (forward-backward checked), 'csrt' runs one CSRT tracker per box.
+    Every update reports a confidence in [0, 1]: the worst box decides.
+    """
+
+    METHODS = ('flow', 'csrt')
+    MAX_CORNERS = 30
+    FB_ERROR = 1.0  # max forward-backward error (px) of a flow point that is kept
+
+    def __init__(self, method='flow'):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown propagation method {method}, expected one of {self.METHODS}.")
+        self.method = method
+        self.boxes = []
+        self.trackers = []
+        self.prev_gray = None
+        self.points = []
+
+    def start(self, frame, boxes):
+        """Start following `boxes` ((x, y, w, h) tuples) from `frame`."""
+        self.boxes = [tuple(int(v) for v in box) for box in boxes]
+
+        if self.method == 'csrt':
+            self.trackers = []
+            for box in self.boxes:
+                tracker = cv2.TrackerCSRT_create()
+                tracker.init(frame, box)
+                self.trackers.append(tracker)
+            return
+
+        self.prev_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        self.points = [self._corners(self.prev_gray, box) for box in self.boxes]
+
+    def update(self, frame):
+        """Returns (boxes, confidence) for `frame`, boxes in the order given to start()."""
+        if not self.boxes:
+            return [], 0.0
+        if self.method == 'csrt':
+            return self._update_csrt(frame)
+        return self._update_flow(frame)
+
+    def _update_csrt(self, frame):
+        confidence = 1.0
+        for i, tracker in enumerate(self.trackers):
+            success, box = tracker.update(frame)
+            if success:
+                self.boxes[i] = tuple(int(v) for v in box)
+            else:
+                confidence = 0.0
+        return list(self.boxes), confidence
+
+    def _corners(self, gray, box):
+        x, y, w, h = box
+        mask = np.zeros_like(gray)
+        mask[max(0, y):y + h, max(0, x):x + w] = 255
+        corners = cv2.goodFeaturesToTrack(gray, self.MAX_CORNERS, 0.01, 3, mask=mask)
+        return corners if corners is not None else np.zeros((0, 1, 2), dtype=np.float32)
+
+    def _update_flow(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        confidence = 1.0
+
+        for i, (box, points) in enumerate(zip(self.boxes, self.points)):
+            if len(points) < 3:
+                confidence = 0.0
+                continue
+
+            forward, status, _ = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, points, None)
+            backward, back_status, _ = cv2.calcOpticalFlowPyrLK(gray, self.prev_gray, forward, None)
+            error = np.linalg.norm((points - backward).reshape(-1, 2), axis=1)
+            good = (status.ravel() == 1) & (back_status.ravel() == 1) & (error < self.FB_ERROR)
+
+            confidence = min(confidence, good.sum() / len(points))
+            if good.sum() < 3:
+                confidence = 0.0
+                continue
+
+            old, new = points[good].reshape(-1, 2), forward[good].reshape(-1, 2)
+            dx, dy = np.median(new - old, axis=0)
+            scale = self._scale(old, new)
+
+            x, y, w, h = box
+            cx, cy = x + w / 2 + dx, y + h / 2 + dy
+            w, h = w * scale, h * scale
+            self.boxes[i] = (int(round(cx - w / 2)), int(round(cy - h / 2)), int(round(w)), int(round(h)))
+            self.points[i] = new.reshape(-1, 1, 2)
+
+        self.prev_gray = gray
+        return list(self.boxes), confidence
+
+    @staticmethod
+    def _scale(old, new):
+        """Median ratio of pairwise point distances between the two frames."""
+        old_d = np.linalg.norm(old[:, None] - old[None], axis=2)
+        new_d = np.linalg.norm(new[:, None] - new[None], axis=2)
+        valid = old_d > 1e-3
+        return float(np.median(new_d[valid] / old_d[valid])) if valid.any() else 1.0
@@ -0,0 +1,62 @@
+import time
+
+from .BoxPropagator import BoxPropagator
+
+
+class DetectionScheduler:
+    """
+    Runs the (expensive) face detector only every `interval` frames, or once `budget`
+    seconds have passed, and propagates the last detected boxes in between.
+    A detection is forced as soon as the propagation confidence drops below
+    `min_confidence` or there is nothing to propagate.
+    interval=1 and budget=None detect on every frame.
+    """
+
+    def __init__(self, detect, interval=1, budget=None, propagation='flow', min_confidence=0.5):
+        """detect(frame, *detect_args) must return a list of (x, y, w, h) boxes."""
+        self.detect = detect
+        self.interval = max(1, interval)
+        self.budget = budget
+        self.min_confidence = min_confidence
+        self.propagator = BoxPropagator(propagation)
+
+        self.frames_since_detection = 0
+        self.last_detection_time = 0.0
+        self.confidence = 0.0
+        self.force = True
+
+    @property
+    def enabled(self):
+        return self.interval > 1 or self.budget is not None
+
+    def due(self):
+        """Is a fresh detection due on the next frame?"""
+        if self.force or not self.enabled:
+            return True
+        if self.budget is not None:
+            return time.monotonic() - self.last_detection_time >= self.budget
+        return self.frames_since_detection >= self.interval
+
+    def request_detection(self):
+        """Force a detection on the next frame."""
+        self.force = True
+
+    def update(self, frame, *detect_args):
+        """
+        Returns (boxes, detected) for `frame`; detected is False when the boxes
+        were propagated from an earlier detection. detect_args go on to detect().
+        """
+        if not self.due():
+            boxes, self.confidence = self.propagator.update(frame)
+            self.frames_since_detection += 1
+            if self.confidence >= self.min_confidence:
+                return boxes, False
+
+        boxes = [tuple(int(v) for v in box) for box in self.detect(frame, *detect_args)]
+        self.frames_since_detection = 1
+        self.last_detection_time = time.monotonic()
+        self.force = not boxes
+        self.confidence = 1.0 if boxes else 0.0
+        if boxes and self.enabled:
+            self.propagator.start(frame, boxes)
+        return boxes, True
@@ -0,0 +1,87 @@
+import cv2
+import numpy as np
+
+
+class MotionModel:
+    """
+    Constant-velocity Kalman filter on a face box (centre x, centre y, width, height),
+    stepped once per frame. Predicts where the tracked face will be on the next frame
+    and the padded region of the frame the detector has to search to find it again.
+    """
+
+    def __init__(self, padding=1.0, process_noise=1e-2, measurement_noise=1e-1):
+        """padding: margin added on every side of the predicted box, as a fraction of its size."""
+        self.padding = padding
+        self.kalman = cv2.KalmanFilter(8, 4)
+        self.kalman.transitionMatrix = np.eye(8, dtype=np.float32)
+        self.kalman.transitionMatrix[:4, 4:] = np.eye(4, dtype=np.float32)
+        self.kalman.measurementMatrix = np.eye(4, 8, dtype=np.float32)
+        self.kalman.processNoiseCov = np.eye(8, dtype=np.float32) * process_noise
+        self.kalman.measurementNoiseCov = np.eye(4, dtype=np.float32) * measurement_noise
+        self.reset()
+
+    @property
+    def initialized(self):
+        return self.state is not None
+
+    def reset(self):
+        self.state = None        # (8,) [cx, cy, w, h, vx, vy, vw, vh] after the last step
+        self.frames_since_correction = 0
+
+    def correct(self, box):
+        """Feed the (x, y, w, h) box the face was actually found at on this frame."""
+        x, y, w, h = box
+        measurement = np.array([[x + w / 2], [y + h / 2], [w], [h]], dtype=np.float32)
+        if self.state is None:
+            self.kalman.statePost = np.vstack([measurement, np.zeros((4, 1), dtype=np.float32)])
+            self.kalman.errorCovPost = np.eye(8, dtype=np.float32)
+        else:
+            self.kalman.correct(measurement)
+        self.state = self.kalman.statePost.ravel().copy()
+        self.frames_since_correction = 0
+
+    def predict(self):
+        """Advance one frame. Returns the predicted (x, y, w, h) box, or None before the first correction."""
+        if self.state is None:
+            return None
+        self.state = self.kalman.predict().ravel().copy()
+        # predict() leaves statePost alone; carry it forward so frames without a measurement chain up.
+        self.kalman.statePost = self.kalman.statePre.copy()
+        self.kalman.errorCovPost = self.kalman.errorCovPre.copy()
+        self.frames_since_correction += 1
+        return self.box
+
+    @property
+    def box(self):
+        if self.state is None:
+            return None
+        cx, cy, w, h = self.state[:4]
+        return (int(round(cx - w / 2)), int(round(cy - h / 2)), int(round(w)), int(round(h)))
+
+    @property
+    def predicted_center(self):
+        """Centre the face is expected at on the next frame, without advancing the filter."""
+        if self.state is None:
+            return None
+        ahead = self.kalman.transitionMatrix @ self.state
+        return (int(round(ahead[0])), int(round(ahead[1])))
+
+    def search_region(self, frame_shape):
+        """
+        (x, y, w, h) region of a frame of `frame_shape` around the predicted box, clipped to
+        the frame. The margin grows with every frame since the last correction, i.e. while
+        other faces are found but the tracked one is not (a frame without any face ends the
+        track and resets the model).
+        Returns None when there is no prediction.
+        """
+        if self.state is None:
+            return None
+        cx, cy, w, h = self.state[:4]
+        margin = self.padding * max(1, self.frames_since_correction)
+        half_w, half_h = w * (0.5 + margin), h * (0.5 + margin)
+        frame_h, frame_w = frame_shape[:2]
+        x0, y0 = max(0, int(cx - half_w)), max(0, int(cy - half_h))
+        x1, y1 = min(frame_w, int(np.ceil(cx + half_w))), min(frame_h, int(np.ceil(cy + half_h)))
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return (x0, y0, x1 - x0, y1 - y0)
@@ -0,0 +1,123 @@
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+
+def iou_matrix(boxes_a, boxes_b):
+    """Pairwise IoU of two lists of (x, y, w, h) boxes."""
+    a = np.asarray(boxes_a, dtype=np.float64).reshape(-1, 4)
+    b = np.asarray(boxes_b, dtype=np.float64).reshape(-1, 4)
+    ax2, ay2 = a[:, 0] + a[:, 2], a[:, 1] + a[:, 3]
+    bx2, by2 = b[:, 0] + b[:, 2], b[:, 1] + b[:, 3]
+    iw = np.clip(np.minimum(ax2[:, None], bx2[None]) - np.maximum(a[:, 0, None], b[None, :, 0]), 0, None)
+    ih = np.clip(np.minimum(ay2[:, None], by2[None]) - np.maximum(a[:, 1, None], b[None, :, 1]), 0, None)
+    inter = iw * ih
+    union = (a[:, 2] * a[:, 3])[:, None] + (b[:, 2] * b[:, 3])[None] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-12), 0.0)
+
+
+class Track:
+    """One face followed across frames, with the identity it was last verified as."""
+
+    def __init__(self, track_id, box):
+        self.id = track_id
+        self.box = box
+        self.label = "Unknown"
+        self.similarity = float('inf')
+        self.verified_box = None
+        self.frames_since_verification = 0
+        self.misses = 0
+
+    @property
+    def center(self):
+        x, y, w, h = self.box
+        return (x + w // 2, y + h // 2)
+
+
+class TrackManager:
+    """
+    Associates each frame's face boxes with persistent tracks by optimal (Hungarian)
+    assignment on IoU or centre distance. Tracks cache their label and similarity;
+    needs_verification() says when a track should be re-embedded.
+    """
+
+    METRICS = ('iou', 'centroid')
+
+    def __init__(self, metric='iou', min_iou=0.3, max_distance=80, max_misses=5, reverify_interval=30, reverify_iou=0.5):
+        """
+        min_iou / max_distance: gate for matching a box to a track ('iou' / 'centroid' metric).
+        max_misses: frames a track survives without a matching box.
+        reverify_interval: frames after which a track's identity is checked again.
+        reverify_iou: re-check earlier when the box overlaps its last verified box less than this.
+        """
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown association metric {metric}, expected one of {self.METRICS}.")
+        self.metric = metric
+        self.min_iou = min_iou
+        self.max_distance = max_distance
+        self.max_misses = max_misses
+        self.reverify_interval = reverify_interval
+        self.reverify_iou = reverify_iou
+
+        self.tracks = {}
+        self.next_id = 1
+
+    def get(self, track_id):
+        return self.tracks.get(track_id)
+
+    def _cost(self, tracks, boxes):
+        """Returns (cost matrix, allowed mask) between tracks (rows) and boxes (columns)."""
+        if self.metric == 'iou':
+            overlap = iou_matrix([t.box for t in tracks], boxes)
+            return 1.0 - overlap, overlap >= self.min_iou
+
+        track_centers = np.array([t.center for t in tracks], dtype=np.float64).reshape(-1, 2)
+        box_centers = np.array([(x + w / 2, y + h / 2) for (x, y, w, h) in boxes], dtype=np.float64).reshape(-1, 2)
+        distance = np.linalg.norm(track_centers[:, None] - box_centers[None], axis=2)
+        return distance, distance <= self.max_distance
+
+    def update(self, boxes):
+        """Match `boxes` to tracks. Returns the matched or new track of every box, in box order."""
+        boxes = [tuple(int(v) for v in box) for box in boxes]
+        tracks = list(self.tracks.values())
+        assigned = [None] * len(boxes)
+
+        if tracks and boxes:
+            cost, allowed = self._cost(tracks, boxes)
+            rows, cols = linear_sum_assignment(np.where(allowed, cost, 1e6))
+            for r, c in zip(rows, cols):
+                if allowed[r, c]:
+                    assigned[c] = tracks[r]
+
+        matched = set()
+        for i, box in enumerate(boxes):
+            track = assigned[i]
+            if track is None:
+                track = Track(self.next_id, box)
+                self.tracks[track.id] = track
+                self.next_id += 1
+            track.box = box
+            track.misses = 0
+            track.frames_since_verification += 1
+            matched.add(track.id)
+            assigned[i] = track
+
+        for track in tracks:
+            if track.id not in matched:
+                track.misses += 1
+                if track.misses > self.max_misses:
+                    del self.tracks[track.id]
+
+        return assigned
+
+    def needs_verification(self, track):
+        """Should this track be embedded and matched against the gallery on this frame?"""
+        if track.verified_box is None or track.frames_since_verification >= self.reverify_interval:
+            return True
+        return iou_matrix([track.box], [track.verified_box])[0, 0] < self.reverify_iou
+
+    def verify(self, track, label, similarity):
+        """Store the identity a track was just matched to."""
+        track.label = label
+        track.similarity = similarity
+        track.verified_box = track.box
+        track.frames_since_verification = 0
@@ -27,13 +27,21 @@ camera_type    = sys.argv[1] if len(sys.argv) > 1 else os.getenv("CAMERA",    DE
 interface_type = sys.argv[2] if len(sys.argv) > 2 else os.getenv("INTERFACE", DEFAULT_INTERFACE)
 model_type     = sys.argv[3] if len(sys.argv) > 3 else os.getenv("MODEL",     DEFAULT_MODEL    )
 
+headless = interface_type == "HeadlessInterface"
+if headless:
+    os.environ.setdefault("HEADLESS", "1")  # keeps PyQt6 out of the model imports
+
 
 tello = None
 app = None
 camera = None
 controller = None
+drone_controller = None  # the Tello controller while the standby camera is in use
 interface = None
+camera_manager = None
 model = None
+model_load_seconds = None
+metrics_server = None
 navigator = None
 guide = None
 
@@ -108,6 +116,13 @@ def setup_camera():
         camera = WebCam()
         return
 
+    if camera_type == "FileCam":
+        from object_detector.input.FileCam import FileCam
+        fps = os.getenv("CAMERA_FPS")
+        camera = FileCam(os.getenv("CAMERA_FILE", "video.mp4"), pacing=os.getenv("CAMERA_PACING", "realtime"),
+                         fps=float(fps) if fps else None, loop=os.getenv("CAMERA_LOOP", "0") == "1")
+        return
+
     raise ImportError(f"Camera {camera_type} is not implemented.")
 
 def setup_controller():
@@ -123,7 +138,7 @@ def setup_controller():
         controller = SimController()
         return
 
-    if camera_type == "WebCam":
+    if camera_type in ("WebCam", "FileCam"):
         from core.controllers.DummyController import DummyController
         controller = DummyController()
         return
@@ -143,15 +158,27 @@ def setup_interface():
         from interfaces.CV2Interface import CV2Interface
         interface = CV2Interface()
         return
+
+    if interface_type == "HeadlessInterface":
+        from core.HeadlessInterface import HeadlessInterface
+        interface = HeadlessInterface()
+        return
     
     raise ImportError(f"Interface {interface_type} is not implemented.")
 
 def setup_model():
-    global model
+    global model, model_load_seconds
+    start = time.perf_counter()
     try:
-        from object_detector.models.LightCNNTracker import LightCNNTracker
-        model = LightCNNTracker()
-        print("LightCNNTracker loaded successfully.")
+        workers = int(os.getenv("RECOGNITION_WORKERS", "0"))
+        if workers > 0:
+            from object_detector.models.RemoteRecognizer import RemoteRecognizer
+            model = RemoteRecognizer(workers=workers, draw=not headless)
+            print(f"RemoteRecognizer loaded successfully ({workers} worker processes).")
+        else:
+            from object_detector.models.LightCNNTracker import LightCNNTracker
+            model = LightCNNTracker(draw=not headless)
+            print("LightCNNTracker loaded successfully.")
     except Exception as e:
         print("Error loading LightCNNTracker:", e)
         if model_type == "DaSiamMultipleTracker":
@@ -167,6 +194,12 @@ def setup_model():
             from object_detector.models.DaSiamMultipleTracker import DaSiamMultipleTracker
             model = DaSiamMultipleTracker(interface)
         print("Fallback model loaded successfully (YoloV8Tracker is not used).")
+    model_load_seconds = time.perf_counter() - start
+
+def model_shutdown():
+    if hasattr(model, 'close'):
+        print("[run.py] Stopping recognition workers...")
+        model.close()
 
 def setup_navigator():
     global navigator
@@ -178,18 +211,117 @@ def setup_guide():
     global guide
 
     from flight_guide.guide.GridGuide import GridGuide
-    guide = GridGuide(navigator, controller)
+    guide = GridGuide(navigator, controller, show=not headless)
     
 
 
+def on_camera_switch(active):
+    global camera, camera_type, controller, drone_controller
+
+    camera = active
+    if active is camera_manager.primary:
+        camera_type = "TelloCam"
+        if drone_controller is not None and not camera_manager.primary_disconnected:
+            controller = drone_controller
+            drone_controller = None
+            guide.controller = controller
+            print("[run.py] Drone video is back, switched to TelloCam and resumed control")
+        else:
+            print("[run.py] Drone video is back, switched to TelloCam")
+        return
+
+    camera_type = "WebCam"
+    if camera_manager.primary_disconnected:
+        print("[run.py] Drone disconnected during operation! Switched to WebCam")
+    else:
+        print("[run.py] Drone video stalled! Hovering and showing the WebCam until it resumes")
+
+    # Faces in the webcam image must not steer the drone: hover, and keep the controller for the switch back.
+    from core.controllers.DummyController import DummyController
+    if not isinstance(controller, DummyController):
+        try:
+            controller.stop(True)
+        except Exception as e:
+            print(f"[run.py] Could not stop the drone: {e}")
+        drone_controller = controller
+    controller = DummyController()
+    guide.controller = controller
+
+def camera_manager_shutdown():
+    if camera_manager is not None:
+        camera_manager.stop()
+
+def setup_camera_manager():
+    global camera_manager
+
+    if camera_type != "TelloCam" or camera is None:
+        return
+
+    from object_detector.input.CameraManager import CameraManager
+    from object_detector.input.WebCam import WebCam
+    # Opened synchronously so it can be kept warm by grabbing; CameraManager starts threaded capture on a switch.
+    camera_manager = CameraManager(camera, interface, lambda: WebCam(threaded=False), on_switch=on_camera_switch)
+
 def setup():
     interface.set_camera(camera)
+    setup_camera_manager()
 
     interface.add_on_boundary(model.set_object)
     interface.add_frame_listener(model.on_frame)
     interface.add_frame_listener(navigator.navigate)
     interface.add_frame_listener(guide.update_grid)
 
+    report_interval = float(os.getenv("METRICS_REPORT_INTERVAL", "10"))
+    if report_interval > 0:
+        from core.Metrics import metrics
+        metrics.start_reporting(report_interval)
+
+    setup_metrics_server()
+
+def status():
+    """Live state for the metrics endpoint."""
+    state = {
+        "camera_type": camera_type,
+        "interface_type": interface_type,
+        "model": type(model).__name__,
+        "model_load_s": model_load_seconds,
+        "tracking": bool(getattr(model, 'is_tracking', False)),
+    }
+    gallery = getattr(model, 'gallery', None)
+    if gallery is not None:
+        state["gallery_size"] = len(gallery)
+
+    current = camera_manager.camera if camera_manager else camera
+    if getattr(current, 'timestamp', None) is not None:
+        state["camera_frame_age_s"] = time.monotonic() - current.timestamp
+    for name in ('sequence', 'dropped'):
+        if isinstance(getattr(current, name, None), int):
+            state[f"camera_{name}"] = getattr(current, name)
+
+    pipeline = getattr(model, 'pipeline', None)
+    if pipeline is not None:
+        state["queue"] = {stage: {"depth": stats["depth"], "dropped": stats["dropped"]}
+                          for stage, stats in pipeline.stats().items()}
+    bus = getattr(model, 'bus', None)
+    if bus is not None:
+        state["frame_bus"] = {"busy_slots": bus.slots - len(bus.free), "dropped": bus.dropped}
+    if guide is not None and guide.last_command_age is not None:
+        state["last_command_age_s"] = guide.last_command_age
+    return state
+
+def setup_metrics_server():
+    global metrics_server
+
+    port = os.getenv("METRICS_PORT")
+    if not port:
+        return
+
+    from core.MetricsServer import MetricsServer
+    try:
+        metrics_server = MetricsServer(int(port), status, host=os.getenv("METRICS_HOST", "127.0.0.1"))
+    except OSError as e:
+        print(f"[run.py] Could not start the metrics endpoint on port {port}: {e}")
+
 def loop():
     global camera_type, camera, controller
     
@@ -198,6 +330,7 @@ def loop():
         from config.settings import MAIN_LOOP_RATE
 
         def _loop():
+            if camera_manager: camera_manager.check()
             guide.loop()
             controller.loop()
         
@@ -206,42 +339,21 @@ def loop():
         guide_timer.start(MAIN_LOOP_RATE)
 
         app.exec()
+        model_shutdown()
+        camera_manager_shutdown()
         tello_shutdown()
 
         return
     
-    if interface_type == "CV2Interface":
+    if interface_type in ("CV2Interface", "HeadlessInterface"):
         try:
             while not interface.is_closed:
-                if camera_type == "TelloCam" and camera is not None:
-                    if hasattr(camera, 'last_check_time'):
-                        if time.time() - camera.last_check_time < 5.0:
-                            pass  # Skip check if less than 5 seconds since last check
-                        else:
-                            camera.last_check_time = time.time()
-                            if hasattr(camera, 'is_connected') and not camera.is_connected:
-                                print("[run.py] Drone disconnected during operation! Switching to WebCam...")
-                                try:
-                                    from object_detector.input.WebCam import WebCam
-                                    old_camera = camera
-                                    camera = WebCam()
-                                    interface.set_camera(camera)
-                                    camera_type = "WebCam"
-                                    print("[run.py] Successfully switched to WebCam")
-                                    
-                                    from core.controllers.DummyController import DummyController
-                                    controller = DummyController()
-                                    
-                                except Exception as e:
-                                    print(f"[run.py] Error switching to WebCam: {e}")
-                                    break
-                    else:
-                        camera.last_check_time = time.time()
+                if camera_manager: camera_manager.check()
                 
-                interface.loop()
+                interface.loop()  # headless: waits for the camera's next frame
                 guide.loop()
                 controller.loop()
-                time.sleep(0.01)
+                if not headless: time.sleep(0.01)
 
         except KeyboardInterrupt:
             print("Kill Call")
@@ -250,6 +362,8 @@ def loop():
             if debug: 
                 raise e
         finally:
+            model_shutdown()
+            camera_manager_shutdown()
             tello_shutdown()
         return
 
@@ -279,6 +393,8 @@ def start_face_detection_shared_tello(shared_tello=None):
             except Exception as e:
                 print(f"[INFO] Real tello instance exists but connection failed: {e}. Switching to WebCam.")
                 camera_type = "WebCam"
+    elif camera_type in ("SimCam", "FileCam"):
+        print(f"[INFO] No shared tello instance. Using {camera_type}.")
     else:
         print("[INFO] No shared tello instance. Switching to WebCam.")
         camera_type = "WebCam"